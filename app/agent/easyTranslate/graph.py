@@ -1,11 +1,17 @@
+from langgraph.config import get_stream_writer
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.state import CompiledStateGraph
+from langgraph.types import Send
 from typing_extensions import Self
 
-from app.agent.easyTranslate.state import TranslateState
+from app.agent.easyTranslate.state import TranslateState, LongTranslateState, ChunkState, PackedTranslateState
 from app.agent.easyTranslate.node import EasyTranslateNode
+from app.agent.easyTranslate.llm import ScheduledLLM
+from app.agent.easyTranslate.splitter import split_document
 from langchain_openai import ChatOpenAI
+from langchain_core.runnables import RunnableConfig, RunnableLambda
 from app.config import Global
+from app.utils.llm_scheduler import LLMScheduler, Priority, llm_lane
 from app.utils.logger import logger
 
 
@@ -15,31 +21,59 @@ class EasyTranslateGraph:
         Global.validate_env()
         logger.info("EasyTranslateGraph 초기화 시작")
 
+        # 두 llm 이 동시 실행 수/속도 제한을 함께 나눠 쓰도록 스케줄러 공유
+        self.scheduler = LLMScheduler.from_env()
+
         # streaming 용과 non-streaming 용 llm을 분리 생성
-        self.llm = ChatOpenAI(
+        self.llm = ScheduledLLM(ChatOpenAI(
             model="o4-mini",
             api_key=Global.env.OPENAI_API_KEY,
             streaming=False
-        )
-        self.llm_stream = ChatOpenAI(
+        ), self.scheduler)
+        self.llm_stream = ScheduledLLM(ChatOpenAI(
             model="gpt-4o-mini",
             api_key=Global.env.OPENAI_API_KEY,
-            streaming=True
-        )
+            streaming=True,
+            # 마지막 chunk 로 토큰 사용량(캐시 적중 포함)을 받음
+            stream_usage=True
+        ), self.scheduler)
+
+        # 노드는 요청마다 만들지 않고 한 번만 생성해 재사용
+        self.node = EasyTranslateNode(self.llm)
+        self.stream_node = EasyTranslateNode(self.llm_stream)
 
         # 상태 기반 Graph 빌더
         self._builder = StateGraph(TranslateState)
         self.build()
         self.graph: CompiledStateGraph = self._builder.compile()
-        
+
+        # 긴 문서용 map/reduce Graph 빌더
+        self._long_builder = StateGraph(LongTranslateState)
+        self.build_long()
+        self.long_graph: CompiledStateGraph = self._long_builder.compile()
+
+        # 일괄 번역용 Graph 빌더 (여러 단문을 한 프롬프트로 묶어 번역)
+        self._packed_builder = StateGraph(PackedTranslateState)
+        self.build_packed()
+        self.packed_graph: CompiledStateGraph = self._packed_builder.compile()
+
+        # 스트리밍용 Graph 빌더
+        self._stream_builder = StateGraph(TranslateState)
+        self.build_stream()
+        self.stream_graph: CompiledStateGraph = self._stream_builder.compile()
+
         logger.info("EasyTranslateGraph 초기화 완료")
 
     def build(self) -> Self:
         logger.debug("그래프 빌드 시작")
-        
+
         # 'translate' 노드에 EasyTranslateNode 주입 (non-streaming)
-        node = EasyTranslateNode(self.llm)
-        self._builder.add_node("translate", node.invoke)
+        # graph.invoke 는 동기 invoke, graph.ainvoke 는 ainvoke_full 을 사용
+        node = self.node
+        self._builder.add_node(
+            "translate",
+            RunnableLambda(node.invoke, afunc=node.ainvoke_full, name="translate")
+        )
 
         # START → translate → END
         self._builder.add_edge(START, "translate")
@@ -48,21 +82,158 @@ class EasyTranslateGraph:
         logger.debug("그래프 빌드 완료")
         return self
 
+    def build_long(self) -> Self:
+        logger.debug("긴 문서 그래프 빌드 시작")
+
+        node = self.node
+        stream_node = self.stream_node
+
+        def split(state: LongTranslateState) -> dict:
+            # 문단/문장 경계 기준으로 토큰 예산 이하의 청크로 분할
+            chunks = split_document(state["original"], Global.env.LONG_DOC_CHUNK_TOKENS)
+            logger.debug(f"긴 문서 분할 완료 - 청크 수: {len(chunks)}개")
+            return {"chunks": chunks}
+
+        def fan_out(state: LongTranslateState) -> list[Send]:
+            # 청크마다 translate_chunk 노드를 병렬 실행 (map)
+            return [
+                Send("translate_chunk", {"index": index, "original": chunk})
+                for index, chunk in enumerate(state["chunks"])
+            ]
+
+        def translate_chunk(state: ChunkState) -> dict:
+            result = node.invoke({"original": state["original"], "translated": []})
+            return {"chunk_results": [(state["index"], "".join(result["translated"]))]}
+
+        async def atranslate_chunk(state: ChunkState, config: RunnableConfig) -> dict:
+            if not config.get("configurable", {}).get("stream"):
+                result = await node.ainvoke_full({"original": state["original"], "translated": []})
+                return {"chunk_results": [(state["index"], "".join(result["translated"]))]}
+
+            # 스트리밍 실행: 조각을 청크 순번과 함께 custom stream 으로 내보냄 (순서 맞추기는 받는 쪽에서)
+            write = get_stream_writer()
+            translated = []
+            # 긴 문서 청크는 짧은 대화형 요청보다 뒤에 실행
+            with llm_lane(Priority.BULK):
+                async for delta in stream_node.ainvoke({"original": state["original"], "translated": []}):
+                    translated.append(delta)
+                    write({"index": state["index"], "delta": delta})
+            write({"index": state["index"], "done": True})
+            return {"chunk_results": [(state["index"], "".join(translated))]}
+
+        def merge(state: LongTranslateState) -> dict:
+            # 완료 순서와 관계없이 원문 순서대로 이어 붙임 (reduce)
+            ordered = [text for _, text in sorted(state["chunk_results"])]
+            return {"translated": ["\n\n".join(ordered)]}
+
+        self._long_builder.add_node("split", split)
+        self._long_builder.add_node(
+            "translate_chunk",
+            RunnableLambda(translate_chunk, afunc=atranslate_chunk, name="translate_chunk")
+        )
+        self._long_builder.add_node("merge", merge)
+
+        # START → split → (translate_chunk × N) → merge → END
+        self._long_builder.add_edge(START, "split")
+        self._long_builder.add_conditional_edges("split", fan_out, ["translate_chunk"])
+        self._long_builder.add_edge("translate_chunk", "merge")
+        self._long_builder.add_edge("merge", END)
+
+        logger.debug("긴 문서 그래프 빌드 완료")
+        return self
+
+    def build_packed(self) -> Self:
+        logger.debug("묶음 번역 그래프 빌드 시작")
+
+        # START → translate → END (non-streaming llm 노드 재사용)
+        self._packed_builder.add_node("translate", self.node.ainvoke_packed)
+        self._packed_builder.add_edge(START, "translate")
+        self._packed_builder.add_edge("translate", END)
+
+        logger.debug("묶음 번역 그래프 빌드 완료")
+        return self
+
+    def build_stream(self) -> Self:
+        logger.debug("스트리밍 그래프 빌드 시작")
+
+        node = self.stream_node
+
+        async def translate_stream(state: TranslateState) -> dict:
+            # 새 토큰 조각은 custom stream 으로 바로 내보내고, 최종 상태에는 전체 번역문 저장
+            write = get_stream_writer()
+            translated = []
+            async for delta in node.ainvoke(state):
+                translated.append(delta)
+                write(delta)
+            return {"translated": ["".join(translated)]}
+
+        self._stream_builder.add_node("translate", translate_stream)
+
+        # START → translate → END
+        self._stream_builder.add_edge(START, "translate")
+        self._stream_builder.add_edge("translate", END)
+
+        logger.debug("스트리밍 그래프 빌드 완료")
+        return self
+
+    @staticmethod
+    def is_long(text: str) -> bool:
+        return len(text) > Global.env.LONG_DOC_THRESHOLD_CHARS
+
+    def _long_init_state(self, text: str) -> LongTranslateState:
+        return {"original": text, "chunks": [], "chunk_results": [], "translated": []}
+
+    def _long_config(self, stream: bool = False) -> dict:
+        # map 단계 동시 실행 수 제한 (stream 이면 청크를 스트리밍 llm 으로 번역)
+        return {"max_concurrency": Global.env.LONG_DOC_MAX_CONCURRENCY, "configurable": {"stream": stream}}
+
     def run(self, text: str) -> TranslateState:
         logger.debug(f"그래프 실행 시작 - 텍스트 길이: {len(text)}자")
-        
-        # Graph.invoke: non-streaming 한 번에 최종 상태 반환
-        init_state: TranslateState = {"original": text, "translated": []}
-        result = self.graph.invoke(init_state)
-        
+
+        if self.is_long(text):
+            result = self.long_graph.invoke(self._long_init_state(text), config=self._long_config())
+        else:
+            # Graph.invoke: non-streaming 한 번에 최종 상태 반환
+            init_state: TranslateState = {"original": text, "translated": []}
+            result = self.graph.invoke(init_state)
+
         logger.debug(f"그래프 실행 완료 - 번역 길이: {len(''.join(result['translated']))}자")
         return result
 
+    async def arun(self, text: str) -> TranslateState:
+        logger.debug(f"그래프 비동기 실행 시작 - 텍스트 길이: {len(text)}자")
+
+        if self.is_long(text):
+            # 긴 문서 청크는 짧은 대화형 요청보다 뒤에 실행
+            with llm_lane(Priority.BULK):
+                result = await self.long_graph.ainvoke(self._long_init_state(text), config=self._long_config())
+        else:
+            # Graph.ainvoke: 이벤트 루프를 막지 않고 최종 상태 반환
+            init_state: TranslateState = {"original": text, "translated": []}
+            result = await self.graph.ainvoke(init_state)
+
+        logger.debug(f"그래프 비동기 실행 완료 - 번역 길이: {len(''.join(result['translated']))}자")
+        return result
+
+    async def arun_packed(self, texts: list[str]) -> list[str]:
+        """여러 단문을 한 번의 LLM 호출로 번역해 같은 순서의 번역문 목록 반환"""
+        logger.debug(f"묶음 번역 실행 시작 - 항목: {len(texts)}개")
+        result = await self.packed_graph.ainvoke({"originals": texts, "translated": []})
+        return result["translated"]
+
     def stream(self, text: str):
+        """짧은 문서 번역문을 새로 생성된 조각(delta) 문자열 단위로 내보내는 async iterator"""
         logger.debug(f"그래프 스트리밍 시작 - 텍스트 길이: {len(text)}자")
-        
-        # 직접 Node.ainvoke 를 사용해 스트리밍
-        init_state: TranslateState = {"original": text, "translated": []}
-        node = EasyTranslateNode(self.llm_stream)
-        # START 로직 없이 바로 Node로
-        return node.ainvoke(init_state)
+        return self.stream_graph.astream({"original": text, "translated": []}, stream_mode="custom")
+
+    def stream_long(self, text: str):
+        """긴 문서를 long_graph 로 스트리밍 번역
+
+        청크들은 병렬로 번역되므로 {"index", "delta"} / {"index", "done"} 이벤트가
+        완료 순서대로 섞여서 나온다. 원문 순서로 맞추는 것은 받는 쪽(서비스)에서 한다.
+        스트림을 닫으면(aclose) 그래프가 실행 중인 청크 번역을 취소하고 정리까지 기다린다.
+        """
+        logger.debug(f"긴 문서 그래프 스트리밍 시작 - 텍스트 길이: {len(text)}자")
+        return self.long_graph.astream(
+            self._long_init_state(text), config=self._long_config(stream=True), stream_mode="custom"
+        )
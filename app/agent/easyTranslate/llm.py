@@ -0,0 +1,48 @@
+from langchain_core.messages import BaseMessage
+
+from app.agent.easyTranslate.splitter import estimate_tokens
+from app.utils.llm_scheduler import LLMScheduler
+
+
+def estimate_request_tokens(messages: list[BaseMessage]) -> int:
+    """TPM 예산용 요청 토큰 추정 (프롬프트 전체 + 원문과 비슷한 길이의 응답)"""
+    prompt_tokens = sum(estimate_tokens(str(message.content)) for message in messages)
+    return prompt_tokens + estimate_content_tokens(messages)
+
+
+def estimate_content_tokens(messages: list[BaseMessage]) -> int:
+    """우선순위 분류용 사용자 입력 토큰 추정 (모든 요청에 붙는 시스템 프롬프트 제외)"""
+    return estimate_tokens(str(messages[-1].content)) if messages else 0
+
+
+class ScheduledLLM:
+    """LLM 호출을 스케줄러의 실행 자리 안에서 수행하는 래퍼
+
+    ainvoke/astream 만 있으면 어떤 LLM 이든 감쌀 수 있어 (지연을 넣은 가짜 LLM 등)
+    스케줄러 동작을 실제 API 없이 확인할 수 있다. 그 외 속성은 원래 LLM 으로 넘긴다.
+    """
+
+    def __init__(self, llm, scheduler: LLMScheduler):
+        self.llm = llm
+        self.scheduler = scheduler
+
+    def __getattr__(self, name):
+        return getattr(self.llm, name)
+
+    def invoke(self, messages, **kwargs):
+        # 동기 경로는 이벤트 루프 밖에서 실행되므로 스케줄러를 거치지 않음
+        return self.llm.invoke(messages, **kwargs)
+
+    def _slot(self, messages):
+        priority = self.scheduler.priority_for(estimate_content_tokens(messages))
+        return self.scheduler.slot(estimate_request_tokens(messages), priority)
+
+    async def ainvoke(self, messages, **kwargs):
+        async with self._slot(messages):
+            return await self.llm.ainvoke(messages, **kwargs)
+
+    async def astream(self, messages, **kwargs):
+        # 스트림이 끝날 때까지 실행 자리를 유지
+        async with self._slot(messages):
+            async for token in self.llm.astream(messages, **kwargs):
+                yield token
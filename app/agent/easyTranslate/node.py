@@ -1,18 +1,72 @@
+import asyncio
+import json
+from typing import Optional
 from langchain_openai import ChatOpenAI
-from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
 from app.agent.easyTranslate.prompt import EasyTranslatePrompt
-from app.agent.easyTranslate.state import TranslateState
+from app.agent.easyTranslate.splitter import estimate_tokens
+from app.agent.easyTranslate.state import PackedTranslateState, TranslateState
+import time
 from app.config import Global
 from app.utils.logger import logger
+from app.utils.metrics import (
+    LLM_CALL_DURATION,
+    LLM_INPUT_TOKENS,
+    LLM_OUTPUT_TOKENS,
+    LLM_STREAM_CANCELLED,
+    LLM_TIME_TO_FIRST_TOKEN,
+    LLM_TOKENS_PER_SECOND,
+    LLM_TOKENS_SAVED,
+)
+
+
+# 시스템 프롬프트 메시지는 한 번만 만들어 모든 요청에서 재사용
+# 요청마다 바뀌는 원문은 항상 뒤에 두어, 앞부분(시스템 프롬프트)이 바이트 단위로 같게 유지되도록 함
+# (OpenAI 프롬프트 캐시는 1024 토큰 이상 동일한 prefix 에 적용됨)
+SYSTEM_MESSAGE = SystemMessage(content=EasyTranslatePrompt.system_prompt)
+
+
+BATCH_MESSAGE = SystemMessage(content=EasyTranslatePrompt.batch_prompt)
+
+
+def build_messages(original: str) -> list[BaseMessage]:
+    return [SYSTEM_MESSAGE, HumanMessage(content=original)]
+
+
+def build_packed_messages(originals: list[str]) -> list[BaseMessage]:
+    """여러 단문을 JSON 배열 하나로 묶은 프롬프트 (시스템 프롬프트는 묶음당 한 번만 전송)"""
+    return [SYSTEM_MESSAGE, BATCH_MESSAGE, HumanMessage(content=json.dumps(originals, ensure_ascii=False))]
+
+
+def parse_packed(content: str, count: int) -> list[str]:
+    """묶음 응답을 항목별 번역문으로 분리 (개수가 다르거나 형식이 틀리면 ValueError)"""
+    text = content.strip()
+    # 코드 블록으로 감싸 온 경우
+    if text.startswith("```"):
+        text = text.strip("`").removeprefix("json").strip()
+    items = json.loads(text)
+    if not isinstance(items, list) or len(items) != count or not all(isinstance(item, str) for item in items):
+        raise ValueError(f"묶음 응답 형식 오류 - 기대 항목 수: {count}개")
+    return items
+
+
+def record_usage(model: str, usage: Optional[dict]) -> None:
+    """요청별 토큰 사용량 기록 (입력 토큰은 프롬프트 캐시 적중/미적중으로 나눔)"""
+    if not usage:
+        return
+    input_tokens = usage.get("input_tokens", 0)
+    cached = (usage.get("input_token_details") or {}).get("cache_read", 0) or 0
+    output_tokens = usage.get("output_tokens", 0)
+
+    LLM_INPUT_TOKENS.labels(model, "cached").inc(cached)
+    LLM_INPUT_TOKENS.labels(model, "uncached").inc(max(0, input_tokens - cached))
+    LLM_OUTPUT_TOKENS.labels(model).inc(output_tokens)
+    logger.info(f"LLM 토큰 사용 - 모델: {model}, 입력: {input_tokens}개 (캐시: {cached}개), 출력: {output_tokens}개")
 
 
 class EasyTranslateNode:
     def __init__(self, llm: ChatOpenAI):
         self.llm = llm
-        self.prompt_template = ChatPromptTemplate.from_messages([
-            ("system", EasyTranslatePrompt.system_prompt),
-            ("user", "{original}")
-        ])
         logger.debug(f"EasyTranslateNode 초기화 - 스트리밍 모드: {llm.streaming}")
 
     def invoke(self, state: TranslateState) -> TranslateState:
@@ -21,12 +75,11 @@ class EasyTranslateNode:
         
         try:
             # 프롬프트 준비
-            prompt = self.prompt_template.format_prompt(
-                original=state["original"]
-            ).to_messages()
+            prompt = build_messages(state["original"])
             
             # LLM에 prompt 전달하여 번역 결과 얻기
             response = self.llm.invoke(prompt)
+            record_usage(self.llm.model_name, response.usage_metadata)
             state["translated"].append(response.content)
             
             logger.debug(f"번역 노드 완료 - 결과: {response.content[:50]}...")
@@ -37,32 +90,99 @@ class EasyTranslateNode:
             logger.error(f"번역 노드 에러: {str(e)}")
             raise
 
+    async def ainvoke_full(self, state: TranslateState) -> TranslateState:
+        """한 번에 전체 번역 (non-streaming async 모드, 이벤트 루프를 막지 않음)"""
+        logger.debug(f"비동기 번역 노드 실행 - 원문: {state['original'][:50]}...")
+
+        try:
+            # 프롬프트 준비
+            prompt = build_messages(state["original"])
+
+            # LLM 응답을 await 하여 다른 요청이 처리될 수 있도록 함
+            with LLM_CALL_DURATION.labels("invoke").time():
+                response = await self.llm.ainvoke(prompt)
+            record_usage(self.llm.model_name, response.usage_metadata)
+            state["translated"].append(response.content)
+
+            logger.debug(f"비동기 번역 노드 완료 - 결과: {response.content[:50]}...")
+
+            return state
+
+        except Exception as e:
+            logger.error(f"비동기 번역 노드 에러: {str(e)}")
+            raise
+
+    async def ainvoke_packed(self, state: PackedTranslateState) -> PackedTranslateState:
+        """여러 단문을 한 번의 LLM 호출로 번역 (non-streaming async 모드)"""
+        logger.debug(f"묶음 번역 노드 실행 - 항목: {len(state['originals'])}개")
+
+        try:
+            prompt = build_packed_messages(state["originals"])
+
+            with LLM_CALL_DURATION.labels("invoke").time():
+                response = await self.llm.ainvoke(prompt)
+            record_usage(self.llm.model_name, response.usage_metadata)
+            state["translated"] = parse_packed(response.content, len(state["originals"]))
+
+            logger.debug(f"묶음 번역 노드 완료 - 항목: {len(state['translated'])}개")
+
+            return state
+
+        except Exception as e:
+            logger.error(f"묶음 번역 노드 에러: {str(e)}")
+            raise
+
     async def ainvoke(self, state: TranslateState):
-        """스트리밍 모드로 토큰 단위 chunk 생성"""
+        """스트리밍 모드로 토큰 단위 chunk 생성 (전체 state 대신 새 토큰 문자열만 yield)"""
         logger.debug(f"스트리밍 번역 노드 실행 - 원문: {state['original'][:50]}...")
         
         try:
             # 프롬프트 준비
-            prompt = self.prompt_template.format_prompt(
-                original=state["original"]
-            ).to_messages()
+            prompt = build_messages(state["original"])
 
             # astream() 으로 async iterator 얻기
             token_count = 0
+            started = time.perf_counter()
+            first_token_at = None
             async for token in self.llm.astream(prompt):
                 token_count += 1
                 
+                # 마지막 chunk 에 사용량이 실려 옴 (stream_usage=True)
+                usage = getattr(token, "usage_metadata", None)
+                if usage:
+                    record_usage(self.llm.model_name, usage)
+
                 # token이 str인 경우가 많지만 만약 객체라면 token.content 사용
                 chunk = token if isinstance(token, str) else token.content
-                state["translated"].append(chunk)
+                if not chunk:
+                    continue
+
+                # 내용이 있는 첫 토큰까지의 시간
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                    LLM_TIME_TO_FIRST_TOKEN.observe(first_token_at - started)
                 
                 # 주기적으로 로그 (매 50개 토큰마다)
                 if token_count % 50 == 0:
                     logger.debug(f"스트리밍 진행 - 토큰 수: {token_count}개")
                 
-                yield state
+                yield chunk
                 
+            finished = time.perf_counter()
+            LLM_CALL_DURATION.labels("stream").observe(finished - started)
+            if first_token_at is not None and finished > first_token_at:
+                LLM_TOKENS_PER_SECOND.observe(token_count / (finished - first_token_at))
+
             logger.debug(f"스트리밍 번역 노드 완료 - 총 토큰: {token_count}개")
+
+        except asyncio.CancelledError:
+            # 구독자가 모두 떠나 취소됨 → astream 이 닫히면서 업스트림 HTTP 스트림도 종료
+            # 응답 길이는 원문과 비슷하다고 보고 남은 토큰 수를 추정
+            saved = max(0, estimate_tokens(state["original"]) - token_count)
+            LLM_STREAM_CANCELLED.inc()
+            LLM_TOKENS_SAVED.inc(saved)
+            logger.info(f"스트리밍 번역 취소 - 생성된 토큰: {token_count}개, 절약된 토큰(추정): {saved}개")
+            raise
             
         except Exception as e:
             logger.error(f"스트리밍 번역 노드 에러: {str(e)}")
@@ -84,4 +84,14 @@ class EasyTranslatePrompt:
         "▣ **형태 유지**: 입력이 한 문장이라면 한 문장으로, 목록이면 목록으로, 질문이면 질문으로 같은 형태로 돌려주세요.",
         "▣ **새로운 정보 추가 절대 금지**: 입력에 없는 장소·숫자·사실·고유명사를 한 글자도 덧붙이지 마세요. '추천·조언·설명·답변' 행위 모두 금지입니다.",
         "▣ **형식 유지**: 입력이 한 문장이라면 한 문장으로, 목록이면 목록 그대로 돌려주세요.",
+        "▣ **개인정보 표시 유지**: [[PII_1]] 처럼 생긴 표시는 개인정보를 가린 것입니다. 바꾸거나 풀어 쓰지 말고 글자 그대로 두세요.",
+    ])
+
+    # 여러 단문을 한 요청으로 묶어 번역할 때 system_prompt 뒤에 덧붙이는 지시
+    # (system_prompt 는 그대로 앞에 두어 프롬프트 캐시 prefix 가 단건 요청과 같게 유지됨)
+    batch_prompt = "\n".join([
+        "# 여러 항목 번역",
+        "입력은 JSON 문자열 배열입니다. 배열의 각 항목은 서로 관계없는 별개의 글입니다.",
+        "각 항목을 위 원칙에 따라 따로따로 쉬운말로 바꾸세요.",
+        "출력은 입력과 같은 개수, 같은 순서의 JSON 문자열 배열 하나만 작성하세요. 그 밖의 글은 쓰지 마세요.",
     ])
@@ -0,0 +1,68 @@
+import re
+from typing import List
+
+# 문장 경계: 마침표/물음표/느낌표(전각 포함) 뒤의 공백
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?。？！])\s+")
+_PARAGRAPH_BOUNDARY = re.compile(r"\n\s*\n")
+_HANGUL = re.compile(r"[가-힣]")
+
+
+def estimate_tokens(text: str) -> int:
+    """토크나이저 없이 토큰 수 추정 (한글 글자당 1토큰, 그 외 4글자당 1토큰)"""
+    hangul = len(_HANGUL.findall(text))
+    return hangul + (len(text) - hangul + 3) // 4
+
+
+def _split_oversized(text: str, max_tokens: int) -> List[str]:
+    """문단이 예산을 넘으면 문장 단위로, 문장도 넘으면 글자 수로 자름"""
+    pieces: List[str] = []
+    for sentence in _SENTENCE_BOUNDARY.split(text):
+        if estimate_tokens(sentence) <= max_tokens:
+            pieces.append(sentence)
+            continue
+        # 한 문장이 예산보다 긴 경우: 보수적으로 글자 수 기준 분할
+        for start in range(0, len(sentence), max_tokens):
+            pieces.append(sentence[start:start + max_tokens])
+    return pieces
+
+
+def split_document(text: str, max_tokens: int) -> List[str]:
+    """문단/문장 경계를 지키며 토큰 예산 이하의 청크로 분할
+
+    이어 붙일 때 넣는 구분자("\n\n" 또는 " ")도 1토큰으로 셈한다.
+    """
+    chunks: List[str] = []
+    current: List[str] = []
+    current_tokens = 0
+
+    def flush(separator: str):
+        nonlocal current, current_tokens
+        if current:
+            chunks.append(separator.join(current))
+        current, current_tokens = [], 0
+
+    for paragraph in _PARAGRAPH_BOUNDARY.split(text.strip()):
+        paragraph = paragraph.strip()
+        if not paragraph:
+            continue
+
+        tokens = estimate_tokens(paragraph)
+        if tokens > max_tokens:
+            # 큰 문단은 단독으로 문장 단위 청크를 구성
+            flush("\n\n")
+            for piece in _split_oversized(paragraph, max_tokens):
+                piece_tokens = estimate_tokens(piece)
+                if current and current_tokens + 1 + piece_tokens > max_tokens:
+                    flush(" ")
+                current_tokens += piece_tokens + (1 if current else 0)
+                current.append(piece)
+            flush(" ")
+            continue
+
+        if current and current_tokens + 1 + tokens > max_tokens:
+            flush("\n\n")
+        current_tokens += tokens + (1 if current else 0)
+        current.append(paragraph)
+
+    flush("\n\n")
+    return chunks
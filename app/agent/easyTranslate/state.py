@@ -1,4 +1,5 @@
-from typing import TypedDict, List
+import operator
+from typing import Annotated, TypedDict, List, Tuple
 
 
 
@@ -6,4 +7,26 @@ class TranslateState(TypedDict):
     original: str
 
     # 청크 단위로 채워갈 예정이여서 List로 변경
-    translated: List[str]
\ No newline at end of file
+    translated: List[str]
+
+
+class LongTranslateState(TypedDict):
+    """긴 문서 map/reduce 번역 상태"""
+    original: str
+    chunks: List[str]
+
+    # 병렬 번역 결과 (청크 순번, 번역문) - 순서와 무관하게 누적
+    chunk_results: Annotated[List[Tuple[int, str]], operator.add]
+    translated: List[str]
+
+
+class ChunkState(TypedDict):
+    """map 단계에서 각 청크 번역 노드로 전달되는 상태"""
+    index: int
+    original: str
+
+
+class PackedTranslateState(TypedDict):
+    """여러 단문을 한 프롬프트로 묶어 번역하는 상태 (translated 는 originals 와 같은 순서)"""
+    originals: List[str]
+    translated: List[str]
@@ -8,6 +8,106 @@ class Global:
     class env:
         OPENAI_API_KEY: str = os.getenv("OPENAI_API_KEY")
 
+        # 로그를 백그라운드 스레드에서 기록 (큐가 가득 차면 버리고 개수만 셈)
+        LOG_ASYNC: bool = os.getenv("LOG_ASYNC", "true").lower() == "true"
+        LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+        # 로그 파일 회전 (크기/날짜), 회전된 조각 압축 방식 "gzip" | "zstd" | "none", 보관 정책
+        LOG_MAX_BYTES: int = int(os.getenv("LOG_MAX_BYTES", str(100 * 1024 * 1024)))
+        LOG_ROTATE_DAILY: bool = os.getenv("LOG_ROTATE_DAILY", "true").lower() == "true"
+        LOG_COMPRESSION: str = os.getenv("LOG_COMPRESSION", "gzip")
+        LOG_RETENTION_DAYS: int = int(os.getenv("LOG_RETENTION_DAYS", "14"))
+        LOG_MAX_SEGMENTS: int = int(os.getenv("LOG_MAX_SEGMENTS", "50"))
+
+        # /metrics 멀티프로세스 모드 (워커 여러 개일 때 값 공유 디렉터리, 비우면 단일 프로세스)
+        METRICS_MULTIPROC_DIR: str = os.getenv("METRICS_MULTIPROC_DIR", "")
+        METRICS_FLUSH_SECONDS: float = float(os.getenv("METRICS_FLUSH_SECONDS", "5"))
+
+        # 번역 캐시 설정
+        TRANSLATION_CACHE_MAX_ENTRIES: int = int(os.getenv("TRANSLATION_CACHE_MAX_ENTRIES", "1024"))
+        TRANSLATION_CACHE_MAX_BYTES: int = int(os.getenv("TRANSLATION_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+        TRANSLATION_CACHE_TTL_SECONDS: int = int(os.getenv("TRANSLATION_CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+        # 공유 캐시 계층: "none" | "sqlite"
+        TRANSLATION_CACHE_BACKEND: str = os.getenv("TRANSLATION_CACHE_BACKEND", "none")
+        TRANSLATION_CACHE_SQLITE_PATH: str = os.getenv("TRANSLATION_CACHE_SQLITE_PATH", "cache/translation_cache.sqlite3")
+
+        # LLM 전송 전 개인정보 가림 여부
+        PII_REDACTION_ENABLED: bool = os.getenv("PII_REDACTION_ENABLED", "true").lower() == "true"
+
+        # 긴 문서 분할 번역 설정
+        LONG_DOC_THRESHOLD_CHARS: int = int(os.getenv("LONG_DOC_THRESHOLD_CHARS", "3000"))
+        LONG_DOC_CHUNK_TOKENS: int = int(os.getenv("LONG_DOC_CHUNK_TOKENS", "1500"))
+        LONG_DOC_MAX_CONCURRENCY: int = int(os.getenv("LONG_DOC_MAX_CONCURRENCY", "4"))
+
+        # LLM 호출 스케줄러 설정 (RPM/TPM 이 0 이면 제한 없음)
+        LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+        LLM_MAX_QUEUE: int = int(os.getenv("LLM_MAX_QUEUE", "64"))
+        LLM_REQUESTS_PER_MINUTE: int = int(os.getenv("LLM_REQUESTS_PER_MINUTE", "500"))
+        LLM_TOKENS_PER_MINUTE: int = int(os.getenv("LLM_TOKENS_PER_MINUTE", "200000"))
+        # 사용자 입력(시스템 프롬프트 제외)이 이 토큰 수 이하인 요청은 대화형 우선 레인으로 처리
+        LLM_INTERACTIVE_MAX_TOKENS: int = int(os.getenv("LLM_INTERACTIVE_MAX_TOKENS", "3000"))
+
+        # 외부 연동 공유 HTTP 클라이언트 설정
+        HTTP_CLIENT_HTTP2: bool = os.getenv("HTTP_CLIENT_HTTP2", "true").lower() == "true"
+        HTTP_CLIENT_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_CLIENT_TIMEOUT_SECONDS", "5"))
+        HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS", "2"))
+        HTTP_CLIENT_MAX_CONNECTIONS: int = int(os.getenv("HTTP_CLIENT_MAX_CONNECTIONS", "100"))
+        HTTP_CLIENT_MAX_KEEPALIVE: int = int(os.getenv("HTTP_CLIENT_MAX_KEEPALIVE", "20"))
+        HTTP_CLIENT_KEEPALIVE_SECONDS: float = float(os.getenv("HTTP_CLIENT_KEEPALIVE_SECONDS", "60"))
+        HTTP_CLIENT_RETRIES: int = int(os.getenv("HTTP_CLIENT_RETRIES", "2"))
+        HTTP_CLIENT_BACKOFF_SECONDS: float = float(os.getenv("HTTP_CLIENT_BACKOFF_SECONDS", "0.2"))
+
+        # SSE 스트리밍: 첫 토큰 이후 조각을 묶어 보내는 시간 창(ms) / 최대 바이트
+        SSE_COALESCE_MS: int = int(os.getenv("SSE_COALESCE_MS", "50"))
+        SSE_COALESCE_MAX_BYTES: int = int(os.getenv("SSE_COALESCE_MAX_BYTES", "1024"))
+        # SSE 이어받기(Last-Event-ID): 보관할 스트림 수 / 스트림당 이벤트 수 / 완료 후 보관 시간(초)
+        SSE_RESUME_MAX_STREAMS: int = int(os.getenv("SSE_RESUME_MAX_STREAMS", "1000"))
+        SSE_RESUME_MAX_EVENTS: int = int(os.getenv("SSE_RESUME_MAX_EVENTS", "2000"))
+        SSE_RESUME_TTL_SECONDS: float = float(os.getenv("SSE_RESUME_TTL_SECONDS", "300"))
+        # 연결이 모두 끊긴 뒤 재연결을 기다리는 시간(초), 지나면 LLM 생성 취소
+        # (이벤트 id 를 하나도 받지 못한 연결은 이어받을 수 없으므로 끊기면 바로 취소)
+        SSE_RESUME_GRACE_SECONDS: float = float(os.getenv("SSE_RESUME_GRACE_SECONDS", "5"))
+
+        # JWT 검증 결과 캐시 크기 / 폐기 토큰 공유 저장소(SQLite 경로, 비우면 프로세스 내부만) / 동기화 주기(초)
+        AUTH_TOKEN_CACHE_SIZE: int = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+        AUTH_REVOCATION_DB: str = os.getenv("AUTH_REVOCATION_DB", "")
+        AUTH_REVOCATION_SYNC_SECONDS: float = float(os.getenv("AUTH_REVOCATION_SYNC_SECONDS", "5"))
+
+        # Firebase 서비스 계정 키 경로 (lifespan 시작 시 읽음)
+        FIREBASE_KEY_PATH: str = os.getenv("FIREBASE_KEY_PATH", "firebase_key.json")
+
+        # Firestore 동기 호출 전용 스레드 풀 크기
+        FIRESTORE_MAX_WORKERS: int = int(os.getenv("FIRESTORE_MAX_WORKERS", "16"))
+
+        # 존재가 확인된 사용자 uuid 캐시 크기 / 유지 시간(초) (재로그인 시 Firestore 쓰기 생략)
+        KNOWN_USER_CACHE_SIZE: int = int(os.getenv("KNOWN_USER_CACHE_SIZE", "100000"))
+        KNOWN_USER_CACHE_TTL_SECONDS: float = float(os.getenv("KNOWN_USER_CACHE_TTL_SECONDS", "3600"))
+
+        # 아카이브 단건 저장 모아 쓰기 (시간 창, 최대 묶음 수) / 일괄 API 최대 항목 수
+        ARCHIVE_WRITE_WINDOW_MS: int = int(os.getenv("ARCHIVE_WRITE_WINDOW_MS", "20"))
+        ARCHIVE_WRITE_MAX_BATCH: int = int(os.getenv("ARCHIVE_WRITE_MAX_BATCH", "50"))
+        ARCHIVE_BATCH_MAX_ITEMS: int = int(os.getenv("ARCHIVE_BATCH_MAX_ITEMS", "500"))
+
+        # 아카이브 검색: 문서당 검색 토큰 수 상한 / 요청당 확인할 후보 문서 수 / 페이지 크기 상한
+        ARCHIVE_SEARCH_MAX_TOKENS: int = int(os.getenv("ARCHIVE_SEARCH_MAX_TOKENS", "1000"))
+        ARCHIVE_SEARCH_SCAN_LIMIT: int = int(os.getenv("ARCHIVE_SEARCH_SCAN_LIMIT", "1000"))
+        ARCHIVE_SEARCH_MAX_LIMIT: int = int(os.getenv("ARCHIVE_SEARCH_MAX_LIMIT", "50"))
+        # 검색어 토큰(글자 2-gram)을 이 비율 이상 가진 문서만 결과에 포함 (1.0 이면 모두 포함한 문서만)
+        ARCHIVE_SEARCH_MIN_COVERAGE: float = float(os.getenv("ARCHIVE_SEARCH_MIN_COVERAGE", "0.6"))
+
+        # 일괄 번역 API 최대 항목 수 / 동시 LLM 호출 수
+        BATCH_TRANSLATE_MAX_ITEMS: int = int(os.getenv("BATCH_TRANSLATE_MAX_ITEMS", "500"))
+        BATCH_TRANSLATE_CONCURRENCY: int = int(os.getenv("BATCH_TRANSLATE_CONCURRENCY", "8"))
+        # 한 프롬프트로 묶어 번역할 최대 항목 수 / 묶음당 원문 토큰 수(추정) 상한
+        BATCH_TRANSLATE_PACK_SIZE: int = int(os.getenv("BATCH_TRANSLATE_PACK_SIZE", "20"))
+        BATCH_TRANSLATE_PACK_TOKENS: int = int(os.getenv("BATCH_TRANSLATE_PACK_TOKENS", "1500"))
+
+        # PDF 페이지 추출/번역 파이프라인 설정
+        PDF_MAX_WORKERS: int = int(os.getenv("PDF_MAX_WORKERS", str(min(4, os.cpu_count() or 1))))
+        PDF_PAGES_PER_TASK: int = int(os.getenv("PDF_PAGES_PER_TASK", "4"))
+        PDF_TRANSLATE_CONCURRENCY: int = int(os.getenv("PDF_TRANSLATE_CONCURRENCY", "4"))
+        # 페이지 경계에 걸친 개인정보를 찾기 위해 앞뒤 페이지에서 이어 붙여 검사할 글자 수
+        PDF_PAGE_CARRY_CHARS: int = int(os.getenv("PDF_PAGE_CARRY_CHARS", "100"))
+
     @classmethod
     def validate_env(cls):
         from pydantic import BaseModel, Field
@@ -1,18 +1,71 @@
+import asyncio
+import base64
+import json
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Optional
-import firebase_admin
-from firebase_admin import credentials, firestore
+from typing import Callable, Optional, TypeVar
+from app.config import Global
+from app.services import archiveIndex
+from app.utils.lazy import Lazy
 from app.utils.logger import logger
+from app.utils.metrics import FIRESTORE_CALL_DURATION
+from app.utils.write_buffer import WriteBehindBuffer
 import pytz
 
-cred = credentials.Certificate("firebase_key.json")
-firebase_admin.initialize_app(cred)
+T = TypeVar("T")
 
-db = firestore.client()
+# firestore.Query.DESCENDING 과 같은 값 (Firestore SDK import 를 첫 사용 시점으로 미루기 위해 문자열 사용)
+DESCENDING = "DESCENDING"
+
+
+def _create_client():
+    """Firebase 앱 초기화 후 Firestore 클라이언트 생성 (키 파일을 읽고 gRPC 모듈을 불러오므로 무거움)"""
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+
+    try:
+        firebase_admin.get_app()
+    except ValueError:
+        firebase_admin.initialize_app(credentials.Certificate(Global.env.FIREBASE_KEY_PATH))
+    return firestore.client()
+
+
+# import 시점이 아니라 lifespan 시작 시(또는 첫 호출 시) 생성
+firestore_client = Lazy("firestore", _create_client)
+
+
+def get_db():
+    return firestore_client.get()
+
+# Firestore 동기 SDK 호출 전용 스레드 풀 (이벤트 루프와 기본 스레드 풀을 막지 않도록 분리)
+_executor = ThreadPoolExecutor(
+    max_workers=Global.env.FIRESTORE_MAX_WORKERS,
+    thread_name_prefix="firestore"
+)
+
+
+async def run_firestore(fn: Callable[..., T], *args, **kwargs) -> T:
+    """동기 Firestore 함수를 전용 스레드 풀에서 실행하고 결과를 await"""
+    loop = asyncio.get_running_loop()
+    histogram = FIRESTORE_CALL_DURATION.labels(fn.__name__)
+
+    def call():
+        # 스레드 풀 대기 시간을 빼고 실제 호출 시간만 기록
+        with histogram.time():
+            return fn(*args, **kwargs)
+
+    return await loop.run_in_executor(_executor, call)
+
+
+def shutdown_firestore_executor():
+    _executor.shutdown(wait=False, cancel_futures=True)
 
 
 
 def save_feedback(rating: str, comment: Optional[str], user_id: Optional[str] = None):
+    db = get_db()
     doc_ref = db.collection("feedbacks").document()
     doc_ref.set({
         "rating": rating,
@@ -21,15 +74,92 @@ def save_feedback(rating: str, comment: Optional[str], user_id: Optional[str] =
         "user_id": user_id
     })
 
-def save_archive(user_id: str, translated_text: str, timestamp : str):
+async def asave_feedback(rating: str, comment: Optional[str], user_id: Optional[str] = None):
+    await run_firestore(save_feedback, rating, comment, user_id)
+
+def _archive_doc(db, user_id: str, translated_text: str, timestamp: str) -> tuple:
+    """새 아카이브 문서 참조와 저장할 필드 (잘못된 timestamp 는 ValueError)
+
+    검색 토큰을 같은 문서에 넣으므로 아카이브와 검색 색인은 쓰기 한 번으로 함께 저장된다.
+    """
     dt_timestamp = datetime.strptime(timestamp, "%Y-%m-%d")
 
     doc_ref = db.collection("archives").document()
-    doc_ref.set({
+    archive = {
+        "user_id": user_id,
+        "translated_text": translated_text,
+        "timestamp": dt_timestamp,
+        archiveIndex.PREVIEW_FIELD: archiveIndex.preview(translated_text),
+        archiveIndex.TOKEN_FIELD: archiveIndex.search_tokens(translated_text, Global.env.ARCHIVE_SEARCH_MAX_TOKENS)
+    }
+    return doc_ref, archive
+
+def save_archive(user_id: str, translated_text: str, timestamp : str):
+    db = get_db()
+    doc_ref, archive = _archive_doc(db, user_id, translated_text, timestamp)
+    doc_ref.set(archive)
+
+def save_archives_batch(items: list[dict]) -> list[dict]:
+    """여러 아카이브를 WriteBatch 로 저장하고 항목별 결과를 반환
+
+    items: {"user_id", "translated_text", "timestamp"} 목록
+    사용자별로 따로 커밋하므로 한 배치의 커밋 실패는 그 배치에 든 항목만 실패로 돌려준다.
+    (아카이브와 검색 토큰은 같은 문서라 배치가 나뉘어도 항상 함께 저장된다)
+    """
+    db = get_db()
+    results = []
+    groups: dict[str, list[tuple[int, tuple]]] = {}
+    for index, item in enumerate(items):
+        try:
+            doc_ref, archive = _archive_doc(db, item["user_id"], item["translated_text"], item["timestamp"])
+        except ValueError as e:
+            results.append({"index": index, "archive_id": None, "status": "error", "error": str(e)})
+            continue
+        groups.setdefault(item["user_id"], []).append((index, (doc_ref, archive)))
+        results.append({"index": index, "archive_id": doc_ref.id, "status": "saved", "error": None})
+
+    commits = 0
+    for user_id, group in groups.items():
+        for start in range(0, len(group), archiveIndex.BATCH_LIMIT):
+            chunk = group[start:start + archiveIndex.BATCH_LIMIT]
+            try:
+                commits += archiveIndex.commit_writes(db, [write for _, write in chunk])
+            except Exception as e:
+                logger.error(f"아카이브 일괄 저장 커밋 실패 - {len(chunk)}건: {str(e)}", user_id=user_id)
+                for index, _ in chunk:
+                    results[index] = {"index": index, "archive_id": None, "status": "error", "error": str(e)}
+
+    logger.info(f"아카이브 일괄 저장 - {len(items)}건, 커밋 {commits}회")
+    return results
+
+async def _flush_archive_saves(items: list[dict]) -> list[dict]:
+    return await run_firestore(save_archives_batch, items)
+
+# 짧은 시간 안에 들어온 단건 저장을 모아 사용자별 배치로 커밋
+_archive_buffer: WriteBehindBuffer[dict, dict] = WriteBehindBuffer(
+    _flush_archive_saves,
+    window_seconds=Global.env.ARCHIVE_WRITE_WINDOW_MS / 1000,
+    max_items=Global.env.ARCHIVE_WRITE_MAX_BATCH
+)
+
+async def asave_archive(user_id: str, translated_text: str, timestamp: str):
+    result = await _archive_buffer.submit({
         "user_id": user_id,
         "translated_text": translated_text,
-        "timestamp": dt_timestamp
+        "timestamp": timestamp
     })
+    if result["status"] != "saved":
+        raise ValueError(result["error"])
+    return result["archive_id"]
+
+async def asave_archives_batch(user_id: str, items: list[dict]) -> list[dict]:
+    return await run_firestore(
+        save_archives_batch,
+        [{**item, "user_id": user_id} for item in items]
+    )
+
+async def flush_archive_writes():
+    await _archive_buffer.drain()
 
 # def get_archives_by_user_id(user_id: str):
 #     docs = db.collection("archives").where("user_id", "==", user_id).order_by("timestamp", direction=firestore.Query.DESCENDING).stream()
@@ -42,34 +172,69 @@ def save_archive(user_id: str, translated_text: str, timestamp : str):
 #         for doc in docs
 #     ]
 
-def get_archives_by_user_id(user_id: str, cursor: Optional[str] = None, limit: int = 10):
-    db = firestore.client()
+def _encode_list_cursor(timestamp: datetime, archive_id: str) -> str:
+    """(timestamp, 문서 id) 를 불투명 cursor 토큰으로 인코딩"""
+    raw = json.dumps([timestamp.isoformat(), archive_id])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+def _decode_list_cursor(cursor: str):
+    try:
+        timestamp, archive_id = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        return datetime.fromisoformat(timestamp), archive_id
+    except Exception:
+        return None
+
+def get_archives_by_user_id(user_id: str, cursor: Optional[str] = None, limit: int = 10, summary: bool = False):
+    db = get_db()
+    archives_ref = db.collection("archives")
 
-    query = db.collection("archives") \
+    # 목록에 필요한 필드만 받아오고 (summary 모드는 본문 대신 미리보기만), 같은 timestamp 는 문서 id 로 순서를 고정
+    text_field = archiveIndex.PREVIEW_FIELD if summary else "translated_text"
+    query = archives_ref \
               .where("user_id", "==", user_id) \
-              .order_by("timestamp", direction=firestore.Query.DESCENDING)
+              .order_by("timestamp", direction=DESCENDING) \
+              .order_by("__name__", direction=DESCENDING) \
+              .select([text_field, "timestamp"])
 
     if cursor:
-        cursor_doc = db.collection("archives").document(cursor).get()
-        if cursor_doc.exists:
-            query = query.start_after(cursor_doc)
+        position = _decode_list_cursor(cursor)
+        if position is not None:
+            # cursor 값만으로 이어서 조회 (cursor 문서를 따로 읽지 않음)
+            timestamp, archive_id = position
+            query = query.start_after({
+                "timestamp": timestamp,
+                "__name__": archives_ref.document(archive_id)
+            })
         else:
-            raise ValueError("유효하지 않은 cursor ID입니다.")
+            # 이전 형식 cursor (문서 id) 호환
+            cursor_doc = archives_ref.document(cursor).get()
+            if cursor_doc.exists:
+                query = query.start_after(cursor_doc)
+            else:
+                raise ValueError("유효하지 않은 cursor ID입니다.")
 
     docs = list(query.limit(limit + 1).stream())
+    has_more = len(docs) > limit
+    docs = docs[:limit]
 
     archives = []
     for doc in docs:
         data = doc.to_dict()
-        archives.append({
-            "archive_id": doc.id,
-            "translated_text": data.get("translated_text"),
-            "timestamp": data.get("timestamp")
-        })
+        archives.append({"archive_id": doc.id, "timestamp": data.get("timestamp"), text_field: data.get(text_field)})
 
-    has_more = len(archives) > limit
-    archives = archives[:limit]
-    next_cursor = archives[-1]["archive_id"] if has_more else None
+    if summary:
+        # 미리보기 필드가 없는 예전 문서만 본문을 받아 미리보기 생성 (재구축 명령으로 채울 수 있음)
+        missing = [archives_ref.document(item["archive_id"]) for item in archives if item["preview"] is None]
+        if missing:
+            texts = {doc.id: doc.get("translated_text") for doc in db.get_all(missing, field_paths=["translated_text"])}
+            for item in archives:
+                if item["preview"] is None:
+                    item["preview"] = archiveIndex.preview(texts.get(item["archive_id"]))
+
+    next_cursor = None
+    if has_more:
+        last = archives[-1]
+        next_cursor = _encode_list_cursor(last["timestamp"], last["archive_id"])
 
     return {
         "archives": archives,
@@ -77,9 +242,14 @@ def get_archives_by_user_id(user_id: str, cursor: Optional[str] = None, limit: i
         "has_more": has_more
     }
 
+async def aget_archives_by_user_id(user_id: str, cursor: Optional[str] = None, limit: int = 10, summary: bool = False):
+    return await run_firestore(get_archives_by_user_id, user_id, cursor, limit, summary)
+
 def get_archive_by_id(archive_id: str):
+    db = get_db()
     doc_ref = db.collection("archives").document(archive_id)
-    doc = doc_ref.get()
+    # 검색 토큰 필드는 받지 않음
+    doc = doc_ref.get(field_paths=["translated_text", "timestamp", "user_id"])
     if doc.exists:
         data = doc.to_dict()
         return {
@@ -91,44 +261,220 @@ def get_archive_by_id(archive_id: str):
     else:
         return None
 
+async def aget_archive_by_id(archive_id: str):
+    return await run_firestore(get_archive_by_id, archive_id)
+
 def delete_archive(user_id: str, archive_id: str):
+    db = get_db()
     doc_ref = db.collection("archives").document(archive_id)
-    doc = doc_ref.get()
+    doc = doc_ref.get(field_paths=["user_id"])
 
     if not doc.exists:
         raise ValueError("해당 archive가 존재하지 않습니다.")
 
-    if doc.to_dict().get("user_id") != user_id:
+    data = doc.to_dict()
+    if data.get("user_id") != user_id:
         raise PermissionError("해당 archive를 삭제할 권한이 없습니다.")
 
+    # 검색 토큰은 문서 안에 있으므로 문서 삭제만으로 색인에서도 빠짐
     doc_ref.delete()
 
-def search_archives_query(user_id: str, query: str):
-    """사용자 아카이브에서 검색"""
+async def adelete_archive(user_id: str, archive_id: str):
+    await run_firestore(delete_archive, user_id, archive_id)
+
+def delete_archives_batch(user_id: str, archive_ids: list[str]) -> list[dict]:
+    """여러 아카이브를 한 번에 삭제하고 항목별 결과를 반환 (not_found | forbidden | deleted)"""
+    db = get_db()
+    archive_ids = list(dict.fromkeys(archive_ids))
+    refs = [db.collection("archives").document(archive_id) for archive_id in archive_ids]
+
+    # 소유자 확인용 조회를 get_all 한 번으로 처리 (get_all 은 순서를 보장하지 않음)
+    found = {doc.id: doc.to_dict() for doc in db.get_all(refs, field_paths=["user_id"]) if doc.exists}
+
+    results = []
+    writes = []
+    for ref, archive_id in zip(refs, archive_ids):
+        data = found.get(archive_id)
+        if data is None:
+            results.append({"archive_id": archive_id, "status": "not_found"})
+        elif data.get("user_id") != user_id:
+            results.append({"archive_id": archive_id, "status": "forbidden"})
+        else:
+            writes.append((ref, None))
+            results.append({"archive_id": archive_id, "status": "deleted"})
+
+    commits = archiveIndex.commit_writes(db, writes)
+    logger.info(f"아카이브 일괄 삭제 - {len(archive_ids)}건, 커밋 {commits}회", user_id=user_id)
+    return results
+
+async def adelete_archives_batch(user_id: str, archive_ids: list[str]) -> list[dict]:
+    return await run_firestore(delete_archives_batch, user_id, archive_ids)
+
+# 검색 후보를 한 번에 읽는 최소 문서 수
+SEARCH_SCAN_CHUNK = 100
+
+def _encode_search_cursor(position: Optional[tuple], offset: int) -> str:
+    """(후보 구간 시작 위치, 구간 안에서 이미 반환한 순위 수) 를 cursor 토큰으로 인코딩"""
+    timestamp, archive_id = position if position is not None else (None, None)
+    raw = json.dumps([timestamp.isoformat() if timestamp is not None else None, archive_id, offset])
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+def _decode_search_cursor(cursor: str):
     try:
-        docs = db.collection("archives") \
-                  .where("user_id", "==", user_id) \
-                  .order_by("timestamp", direction=firestore.Query.DESCENDING) \
-                  .stream()
-        
-        results = []
-        query_lower = query.lower()
-        
-        for doc in docs:
-            doc_data = doc.to_dict()
-            translated_text = doc_data.get("translated_text", "")
-            
-            # 문자열이든 배열이든 처리
-            if isinstance(translated_text, str):
-                if query_lower in translated_text.lower():
-                    results.append(doc_data)
-            elif isinstance(translated_text, list):
-                if any(query_lower in text.lower() for text in translated_text):
-                    results.append(doc_data)
-
-        logger.info(f"검색 결과: {len(results)}개 문서", user_id=user_id, query=query)
-        return results
-    
-    except Exception as e:
-        print(f"검색 중 오류 발생: {e}")
-        return []
+        value = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+        # 이전 형식 (마지막으로 확인한 문서 위치만 있음)
+        timestamp, archive_id, offset = value if len(value) == 3 else (*value, 0)
+        position = (datetime.fromisoformat(timestamp), archive_id) if archive_id is not None else None
+        return position, int(offset)
+    except Exception:
+        return None
+
+def search_archives_query(user_id: str, query: str, cursor: Optional[str] = None, limit: int = 10):
+    """사용자 아카이브 검색 (문서의 검색 토큰으로 후보를 찾아 일치도순으로 페이지 반환)
+
+    검색어 토큰 중 하나라도 가진 문서를 array-contains-any 로 최신순으로 읽어, 검색어 토큰을
+    ARCHIVE_SEARCH_MIN_COVERAGE 비율 이상 가진 문서만 남긴다. 후보는 ARCHIVE_SEARCH_SCAN_LIMIT 개
+    구간 단위로 확인하고, 구간 안에서는 일치한 토큰 비율이 높은 순(같으면 최신순)으로 정렬한다.
+    cursor 는 (구간 시작 위치, 구간 안에서 반환한 개수) 이며, 구간을 다 쓰면 다음 구간으로 이어서
+    페이지를 채운다. 결과가 하나도 없는 동안에는 한도를 넘어서도 계속 확인하므로, 빈 페이지와
+    has_more 를 함께 돌려주지 않는다.
+    """
+    db = get_db()
+    archives_ref = db.collection("archives")
+
+    start, offset = None, 0
+    if cursor:
+        decoded = _decode_search_cursor(cursor)
+        if decoded is None:
+            raise ValueError("유효하지 않은 cursor입니다.")
+        start, offset = decoded
+
+    grams = archiveIndex.query_grams(query)
+    candidates = archives_ref.where("user_id", "==", user_id)
+    if grams:
+        # 후보 확인에는 토큰만 받음 (본문은 결과 페이지만 따로 조회)
+        candidates = candidates \
+            .where(archiveIndex.TOKEN_FIELD, "array_contains_any", grams[:archiveIndex.QUERY_TOKEN_LIMIT]) \
+            .select([archiveIndex.TOKEN_FIELD, "timestamp"])
+        score = lambda doc: archiveIndex.coverage(doc.get(archiveIndex.TOKEN_FIELD), grams)
+    else:
+        # 한 글자 검색어는 토큰으로 거를 수 없으므로 본문을 받아 확인
+        candidates = candidates.select(["translated_text", "timestamp"])
+        score = lambda doc: float(archiveIndex.contains_text(doc.get("translated_text"), query))
+    candidates = candidates \
+        .order_by("timestamp", direction=DESCENDING) \
+        .order_by("__name__", direction=DESCENDING)
+
+    scan_limit = max(1, Global.env.ARCHIVE_SEARCH_SCAN_LIMIT)
+    min_coverage = Global.env.ARCHIVE_SEARCH_MIN_COVERAGE
+    scanned = 0
+
+    def scan_window(position):
+        """position 다음부터 후보 scan_limit 개를 확인해 (일치도순 결과, 마지막 위치, 끝까지 읽었는지) 반환"""
+        nonlocal scanned
+        ranked = []
+        count = 0
+        exhausted = False
+        while count < scan_limit:
+            size = min(scan_limit - count, max(limit + 1, SEARCH_SCAN_CHUNK))
+            page_query = candidates
+            if position is not None:
+                timestamp, archive_id = position
+                page_query = page_query.start_after({
+                    "timestamp": timestamp,
+                    "__name__": archives_ref.document(archive_id)
+                })
+            # 구간의 마지막 묶음은 한 개 더 읽어 뒤에 후보가 남았는지 확인
+            # (구간이 마지막 후보에서 끝났는데 has_more 를 돌려주지 않도록)
+            peek = 1 if count + size == scan_limit else 0
+            docs = list(page_query.limit(size + peek).stream())
+            for doc in docs[:size]:
+                position = (doc.get("timestamp"), doc.id)
+                value = score(doc)
+                if value > 0 and value >= min_coverage:
+                    ranked.append((value, count, position))
+                count += 1
+            if len(docs) < size + peek:
+                exhausted = True
+                break
+        scanned += count
+        # 일치도가 같으면 최신순 (확인한 순서)
+        ranked.sort(key=lambda item: (-item[0], item[1]))
+        return [position for _, _, position in ranked], position, exhausted
+
+    page = []
+    next_cursor = None
+    while True:
+        ranked, end, exhausted = scan_window(start)
+        taken = ranked[offset:offset + limit - len(page)]
+        page.extend(taken)
+        offset += len(taken)
+        if offset < len(ranked):
+            # 이 구간에 남은 결과가 있음 - 다음 요청은 같은 구간을 다시 확인해 이어서 반환
+            next_cursor = _encode_search_cursor(start, offset)
+            break
+        if exhausted:
+            break
+        start, offset = end, 0
+        # 페이지가 찼거나, 확인 한도를 넘었고 결과가 하나라도 있으면 다음 구간부터 이어서 찾도록 멈춤
+        # (결과가 없는 동안에는 계속 확인해 빈 페이지에 has_more 를 돌려주지 않음)
+        if len(page) == limit or (page and scanned >= scan_limit):
+            next_cursor = _encode_search_cursor(start, 0)
+            break
+
+    # 현재 페이지 문서의 본문만 한 번에 조회 (get_all 은 순서를 보장하지 않음)
+    found = {}
+    if page:
+        refs = [archives_ref.document(archive_id) for _, archive_id in page]
+        for doc in db.get_all(refs, field_paths=["translated_text", "timestamp"]):
+            if doc.exists:
+                found[doc.id] = doc.to_dict()
+
+    archives = [
+        {
+            "archive_id": archive_id,
+            "translated_text": found[archive_id].get("translated_text"),
+            "timestamp": found[archive_id].get("timestamp")
+        }
+        for _, archive_id in page if archive_id in found
+    ]
+
+    logger.info(f"검색 결과: {len(archives)}개 문서 (후보 {scanned}개 확인)", user_id=user_id, query=query)
+    return {
+        "archives": archives,
+        "next_cursor": next_cursor,
+        "has_more": next_cursor is not None
+    }
+
+async def asearch_archives_query(user_id: str, query: str, cursor: Optional[str] = None, limit: int = 10):
+    return await run_firestore(search_archives_query, user_id, query, cursor, limit)
+
+# 이미 Firestore 에 있는 것으로 확인된 사용자 → 확인 시각 (재로그인 시 쓰기 생략)
+# 다른 곳에서 사용자 문서가 지워져도 KNOWN_USER_CACHE_TTL_SECONDS 뒤에는 다시 확인한다.
+_known_users: OrderedDict[str, float] = OrderedDict()
+
+def ensure_user(user_uuid: str, nickname: Optional[str], email: Optional[str]):
+    """사용자 문서가 없으면 생성 (조회 없이 create 한 번으로 처리)"""
+    from google.api_core.exceptions import AlreadyExists
+
+    db = get_db()
+    try:
+        db.collection("users").document(user_uuid).create({
+            "nickname": nickname,
+            "email": email,
+            "created_at": datetime.utcnow().isoformat()
+        })
+    except AlreadyExists:
+        pass
+
+async def aensure_user(user_uuid: str, nickname: Optional[str], email: Optional[str]):
+    checked_at = _known_users.get(user_uuid)
+    if checked_at is not None and time.monotonic() - checked_at < Global.env.KNOWN_USER_CACHE_TTL_SECONDS:
+        return
+
+    await run_firestore(ensure_user, user_uuid, nickname, email)
+
+    _known_users[user_uuid] = time.monotonic()
+    _known_users.move_to_end(user_uuid)
+    while len(_known_users) > Global.env.KNOWN_USER_CACHE_SIZE:
+        _known_users.popitem(last=False)
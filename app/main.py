@@ -1,21 +1,63 @@
 from fastapi import FastAPI, UploadFile, File, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
+from contextlib import asynccontextmanager
 from pydantic import BaseModel
-import fitz
 from app.routes.feedback_router import router as feedback_router
 from app.routes.kakao_auth_router import router as kakao_auth_router
 from app.routes.archive_router import router as archive_router
-from app.routes.easy_translate import router as easy_translate_router
+from app.routes.easy_translate import router as easy_translate_router, streams as easy_translate_streams, translate_service
+from app.routes.pdf_router import router as pdf_router
+from app.services.pdfPipeline import shutdown_pdf_executor
+from app.firebase_config import firestore_client, flush_archive_writes, shutdown_firestore_executor
+from app.utils.auth_utils import revocations
+from app.utils.http_client import close_http_clients
 from fastapi.middleware.cors import CORSMiddleware
 from app.middleware.request_id import RequestIDMiddleware
-from app.utils.rulebook import validate_rulebook
+from app.utils.rulebook import validate_rulebook, validate_response, scan_rulebook
 from app.utils.logger import logger
+from app.utils.metrics import render_metrics, start_multiprocess_flusher
+import asyncio
 import base64
 import httpx
 import time
 import uuid
 import json
 
-app = FastAPI(title="쉬운말 번역 API", version="1.0.0")
+# import 시점에 만들지 않고 시작 시 미리 만들어 두는 무거운 구성 요소 (readiness 대상)
+COMPONENTS = (firestore_client, translate_service)
+
+async def warm_up():
+    """무거운 구성 요소를 동시에 생성 (실패해도 서버는 뜨고 readiness 로 보고, 첫 사용 시 재시도)"""
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(asyncio.to_thread(component.get) for component in COMPONENTS),
+        return_exceptions=True
+    )
+    for component, result in zip(COMPONENTS, results):
+        if isinstance(result, Exception):
+            logger.error(f"{component.name} 초기화 실패: {str(result)}")
+    logger.info(f"시작 준비 완료 - {time.perf_counter() - started:.2f}초")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 멀티프로세스 모드면 워커별 지표를 주기적으로 파일에 기록
+    start_multiprocess_flusher()
+    # 다른 워커에서 폐기한 토큰을 첫 요청 전에 반영
+    await revocations.sync()
+    await warm_up()
+    yield
+    # 종료 시 정리
+    await easy_translate_streams.aclose()
+    shutdown_pdf_executor()
+    # 모아 둔 아카이브 저장을 먼저 커밋한 뒤 스레드 풀 종료
+    await flush_archive_writes()
+    shutdown_firestore_executor()
+    await close_http_clients()
+    logger.info("쉬운말 번역 API 서버 종료")
+    # 큐에 남은 로그 기록
+    logger.shutdown()
+
+app = FastAPI(title="쉬운말 번역 API", version="1.0.0", lifespan=lifespan)
 
 # 미들웨어 설정 (순서 중요!)
 # 1. Request ID 미들웨어 먼저 추가
@@ -38,30 +80,14 @@ app.include_router(kakao_auth_router)
 app.include_router(archive_router)
 app.include_router(feedback_router)
 app.include_router(easy_translate_router)
+app.include_router(pdf_router)
 
 class TextIn(BaseModel):
     text: str
 
-def validate_response(results):
-    """
-    validate_rulebook 결과를 받아서
-    {"isTrue": bool, "details" : ... } 구조로 반환한다.
-    """
-    if not results:
-        return {"isTrue": False, "details": None}
-    return {"isTrue": True, "details":results}
-
-def extract_text_from_pdf(data: bytes) -> str:
-    try:
-        with fitz.open(stream=data, filetype="pdf") as doc:
-            return "\n".join(page.get_text() or "" for page in doc)
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"PDF 처리 실패: {e}")
-    
-    
 @app.get('/health')
 async def health_check():
-    """서버 상태 확인"""
+    """서버 상태 확인 (liveness: 프로세스 응답 여부만 확인, 준비 상태는 /health/ready)"""
     logger.info("헬스 체크 요청")
     return {
         "status": "healthy",
@@ -69,6 +95,21 @@ async def health_check():
         "service": "쉬운말 번역 API"
     }
 
+@app.get('/health/ready')
+async def readiness_check():
+    """요청을 처리할 준비 상태 (Firestore, 번역 서비스 초기화 여부)"""
+    components = {component.name: component.status() for component in COMPONENTS}
+    ready = all(status["ready"] for status in components.values())
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "not_ready", "components": components}
+    )
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus 형식 지표"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
 @app.get("/")
 async def root():
     """API 루트 엔드포인트"""
@@ -81,18 +122,11 @@ async def root():
 
 @app.post("/validate")
 def rulebook_endpoint(payload: TextIn):
-    results = validate_rulebook(payload.text)
-    return validate_response(results)
-
-
-# @app.post("/validate-pdf")
-# async def validate_pdf(file: UploadFile = File(...)):
-#     data = await file.read()
-
-#     text = extract_text_from_pdf(data)
-
-#     results = validate_rulebook(text)
-#     return validate_response(results)
+    # 카테고리와 매치 위치(span)를 한 번의 스캔으로 함께 계산
+    results, matches = scan_rulebook(payload.text)
+    response = validate_response(results)
+    response["spans"] = [match._asdict() for match in matches]
+    return response
 
 
 # @app.post("/validate-image")
@@ -120,8 +154,8 @@ def rulebook_endpoint(payload: TextIn):
 #         "Content-Type": "application/json",
 #         "X-OCR-SECRET": OCR_SECRET
 #     }
-#     async with httpx.AsyncClient() as client:
-#         resp = await client.post(OCR_ENDPOINT, json=body, headers=headers)
+#     client = get_http_client("ocr")
+#     resp = await request_with_retry(client, "POST", OCR_ENDPOINT, json=body, headers=headers)
 #     if resp.status_code != 200:
 #         raise HTTPException(status_code=resp.status_code,
 #                             detail=f"OCR API 호출 실패: {resp.text}")
@@ -1,33 +1,73 @@
+import re
 import uuid
 from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 import time
 
+from app.utils.logger import current_request_id
+from app.utils.metrics import HTTP_REQUEST_DURATION
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
-    """각 요청에 고유 ID를 부여하는 미들웨어"""
-    
-    async def dispatch(self, request: Request, call_next):
-        # 요청 ID 생성
-        request_id = str(uuid.uuid4())
-        request.state.request_id = request_id
-        
-        # 요청 시작 시간 기록
+# 분산 추적용으로 받아들일 외부 요청 ID 형식 (헤더 주입/로그 오염 방지)
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+class RequestIDMiddleware:
+    """각 요청에 고유 ID를 부여하는 미들웨어 (순수 ASGI)
+
+    BaseHTTPMiddleware 와 달리 응답을 별도 task/메모리 스트림으로 감싸지 않고
+    send 만 감싸서 헤더를 추가하므로 StreamingResponse 의 backpressure 가 그대로 유지된다.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # 요청 ID: 들어온 X-Request-ID 가 있으면 이어서 사용, 없으면 생성
+        incoming = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                incoming = value.decode("latin-1")
+                break
+        request_id = incoming if incoming and _VALID_REQUEST_ID.match(incoming) else str(uuid.uuid4())
+
+        # 요청 시작 시간 기록 (request.state 로 조회 가능하도록 scope["state"] 에 저장)
         start_time = time.time()
-        request.state.start_time = start_time
-        
-        # 헤더에 요청 ID 추가
-        response = await call_next(request)
-        
-        # 응답 시간 계산
-        process_time = time.time() - start_time
-        
-        # 응답 헤더에 요청 ID와 처리 시간 추가
-        response.headers["X-Request-ID"] = request_id
-        response.headers["X-Process-Time"] = str(process_time)
-        
-        return response
+        state = scope.setdefault("state", {})
+        state["request_id"] = request_id
+        state["start_time"] = start_time
+
+        status_code = 500
+
+        async def send_wrapper(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                # 응답 헤더에 요청 ID와 처리 시간 추가 (헤더를 보내는 시점 기준)
+                headers = MutableHeaders(scope=message)
+                headers["X-Request-ID"] = request_id
+                headers["X-Process-Time"] = str(time.time() - start_time)
+            await send(message)
+
+        # 이 요청에서 남기는 로그에 request_id 가 자동으로 붙도록 설정
+        token = current_request_id.set(request_id)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            current_request_id.reset(token)
+
+            # 경로 템플릿 기준으로 기록 (경로 파라미터별로 라벨이 늘어나지 않도록)
+            # 스트리밍 응답은 마지막 청크를 보낼 때까지의 시간
+            route = scope.get("route")
+            HTTP_REQUEST_DURATION.labels(
+                scope["method"],
+                getattr(route, "path", "unmatched"),
+                status_code
+            ).observe(time.time() - start_time)
 
 
 def get_request_id(request: Request) -> str:
@@ -1,13 +1,21 @@
-from typing import Optional
+from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
-from app.firebase_config import delete_archive, get_archives_by_user_id, save_archive, get_archive_by_id, search_archives_query
+from app.config import Global
+from app.firebase_config import adelete_archive, aget_archives_by_user_id, asave_archive, aget_archive_by_id, asearch_archives_query
+from app.firebase_config import adelete_archives_batch, asave_archives_batch
 from app.utils.auth_utils import get_current_user  # 카카오 인증을 사용하는 함수
 
 class ArchiveSaveRequest(BaseModel):
     translated_text: str
     timestamp: str
 
+class ArchiveSaveBatchRequest(BaseModel):
+    items: List[ArchiveSaveRequest]
+
+class ArchiveDeleteBatchRequest(BaseModel):
+    archive_ids: List[str]
+
 router = APIRouter(prefix="/archive", tags=["아카이브"])
 
 # /save: 사용자의 번역된 텍스트를 Firestore에 저장하는 엔드포인트
@@ -17,7 +25,7 @@ async def save_archive_route(
     user = Depends(get_current_user)
 ):
     try:
-        save_archive(user_id=user, translated_text=request_data.translated_text, timestamp=request_data.timestamp)
+        await asave_archive(user_id=user, translated_text=request_data.translated_text, timestamp=request_data.timestamp)
         return {
             "code": status.HTTP_200_OK,
             "message": "아카이브에 성공적으로 저장함."
@@ -26,6 +34,49 @@ async def save_archive_route(
         print(e)
         raise HTTPException(status_code=500, detail="저장 중 오류 발생")
 
+def _check_batch_size(count: int):
+    if not count:
+        raise HTTPException(status_code=400, detail="항목이 필요합니다")
+    if count > Global.env.ARCHIVE_BATCH_MAX_ITEMS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {Global.env.ARCHIVE_BATCH_MAX_ITEMS}개까지 처리할 수 있습니다"
+        )
+
+# /save-batch: 여러 번역을 한 번에 저장 (항목별 결과 반환)
+@router.post("/save-batch")
+async def save_archive_batch_route(
+    request_data: ArchiveSaveBatchRequest,
+    user = Depends(get_current_user)
+):
+    _check_batch_size(len(request_data.items))
+    try:
+        results = await asave_archives_batch(user, [item.model_dump() for item in request_data.items])
+        return {
+            "code": status.HTTP_200_OK,
+            "results": results
+        }
+    except Exception as e:
+        print(f"[ERROR] 일괄 저장 실패: {e}")
+        raise HTTPException(status_code=500, detail="일괄 저장 중 오류 발생")
+
+# /delete-batch: 여러 번역을 한 번에 삭제 (항목별 결과 반환)
+@router.post("/delete-batch")
+async def delete_archive_batch_route(
+    request_data: ArchiveDeleteBatchRequest,
+    user = Depends(get_current_user)
+):
+    _check_batch_size(len(request_data.archive_ids))
+    try:
+        results = await adelete_archives_batch(user, request_data.archive_ids)
+        return {
+            "code": status.HTTP_200_OK,
+            "results": results
+        }
+    except Exception as e:
+        print(f"[ERROR] 일괄 삭제 실패: {e}")
+        raise HTTPException(status_code=500, detail="일괄 삭제 중 오류 발생")
+
 # # /list: 사용자가 저장한 모든 번역 기록을 가져오는 엔드포인트
 # @router.get("/list")
 # async def get_archives(user=Depends(get_current_user)):
@@ -43,10 +94,11 @@ async def save_archive_route(
 async def get_archives(
     cursor: Optional[str] = None,
     limit: int = 10,
+    summary: bool = False,  # True 면 본문 대신 미리보기만 반환
     user=Depends(get_current_user)
 ):
     try:
-        result = get_archives_by_user_id(user, cursor=cursor, limit=limit)
+        result = await aget_archives_by_user_id(user, cursor=cursor, limit=limit, summary=summary)
         return {
             "code": status.HTTP_200_OK,
             "archives": result["archives"],
@@ -67,7 +119,7 @@ async def delete_archive_route(
     user = Depends(get_current_user)
 ):
     try:
-        delete_archive(user_id=user, archive_id=archive_id)
+        await adelete_archive(user_id=user, archive_id=archive_id)
         return {
             "code": 200,
             "message": "번역이 성공적으로 삭제되었습니다."
@@ -87,7 +139,7 @@ async def get_archive_detail(
     user = Depends(get_current_user)
 ):
     try:
-        archive = get_archive_by_id(archive_id)
+        archive = await aget_archive_by_id(archive_id)
 
         if not archive:
             raise HTTPException(status_code=404, detail="해당 번역을 찾을 수 없습니다.")
@@ -111,14 +163,25 @@ async def get_archive_detail(
 @router.get("/search/{query}")
 async def search_archives(
     query: str,
-    # user = Depends(get_current_user)
+    cursor: Optional[str] = None,
+    limit: int = 10,
+    user = Depends(get_current_user)
 ):
+    if not 1 <= limit <= Global.env.ARCHIVE_SEARCH_MAX_LIMIT:
+        raise HTTPException(
+            status_code=400,
+            detail=f"limit 은 1 이상 {Global.env.ARCHIVE_SEARCH_MAX_LIMIT} 이하여야 합니다"
+        )
     try:
-        archives = search_archives_query("973bca4f-f641-0c2f-ca91-4854652f6c34", query)
+        result = await asearch_archives_query(user, query, cursor=cursor, limit=limit)
         return {
             "code": status.HTTP_200_OK,
-            "archives": archives
+            "archives": result["archives"],
+            "next_cursor": result["next_cursor"],
+            "has_more": result["has_more"]
         }
+    except ValueError as ve:
+        raise HTTPException(status_code=400, detail=str(ve))
     except Exception as e:
         print(f"[ERROR] 검색 실패: {e}")
         raise HTTPException(status_code=500, detail="검색 중 오류 발생")
@@ -1,18 +1,38 @@
-import json
 from datetime import datetime
 from fastapi import APIRouter, Depends, Body, HTTPException, status, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional
 
-from app.services.easyTranslate import EasyTranslateService
+from app.config import Global
 from app.utils.auth_utils import get_current_user
+from app.utils.lazy import Lazy
 from app.utils.logger import logger
+from app.utils.metrics import SSE_STREAMS_IN_FLIGHT
+from app.utils.sse import StreamGap, StreamRegistry, coalesce, encoder
 from app.middleware.request_id import get_request_id
 
+if TYPE_CHECKING:
+    from app.services.easyTranslate import EasyTranslateService
+
 
 router = APIRouter(prefix="/easy-translate", tags=["쉬운말 번역"])
-service = EasyTranslateService()
+
+
+def _create_service() -> "EasyTranslateService":
+    # langchain/langgraph import 와 LLM 클라이언트 생성이 무거우므로 lifespan 시작 시(또는 첫 요청 시) 실행
+    from app.services.easyTranslate import EasyTranslateService
+    return EasyTranslateService()
+
+
+translate_service = Lazy("translate_service", _create_service)
+
+
+def get_service() -> "EasyTranslateService":
+    return translate_service.get()
+
+
+streams = StreamRegistry.from_env()
 
 # 요청/응답 스키마 정의
 class TranslateRequest(BaseModel):
@@ -23,6 +43,20 @@ class TranslateResponse(BaseModel):
     translated_text: str
     timestamp: str
 
+class BatchTranslateRequest(BaseModel):
+    contents: List[str]
+
+class BatchTranslateItem(BaseModel):
+    index: int
+    original_text: str
+    status: str  # ok | error
+    translated_text: Optional[str] = None
+    error: Optional[str] = None
+
+class BatchTranslateResponse(BaseModel):
+    results: List[BatchTranslateItem]
+    timestamp: str
+
 @router.post("", response_model=TranslateResponse)
 async def easy_translate(
     req: TranslateRequest,
@@ -43,8 +77,8 @@ async def easy_translate(
             detail="content가 필요합니다"
         )
     
-    # 번역 실행
-    translated = service.translate(text, user_id, request_id)
+    # 번역 실행 (async 경로로 이벤트 루프를 막지 않음)
+    translated = await get_service().atranslate(text, user_id, request_id)
     
     # 응답 생성
     response = TranslateResponse(
@@ -57,6 +91,50 @@ async def easy_translate(
     
     return response
 
+@router.post("/batch", response_model=BatchTranslateResponse)
+async def easy_translate_batch(
+    req: BatchTranslateRequest,
+    request: Request,
+    # user_id: str = Depends(get_current_user),
+):
+    """여러 단문(양식 항목명, 짧은 안내문 등)을 한 요청으로 번역 (입력 순서대로 항목별 결과)"""
+    request_id = get_request_id(request)
+    user_id = None  # 현재 주석 처리됨
+
+    logger.info(f"일괄 번역 API 호출 - 항목: {len(req.contents)}개", request_id=request_id)
+
+    if not req.contents:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="contents가 필요합니다")
+    if len(req.contents) > Global.env.BATCH_TRANSLATE_MAX_ITEMS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"한 번에 최대 {Global.env.BATCH_TRANSLATE_MAX_ITEMS}개까지 처리할 수 있습니다"
+        )
+
+    # 대기열이 이미 가득 차 있으면 항목마다 실패시키지 않고 요청 전체를 429 로 거절
+    service = get_service()
+    service.ensure_capacity()
+
+    results = await service.atranslate_batch(req.contents, user_id, request_id)
+    failed = sum(1 for item in results if item["status"] != "ok")
+    logger.info(f"일괄 번역 API 완료 - 성공: {len(results) - failed}개, 실패: {failed}개", request_id=request_id)
+
+    return BatchTranslateResponse(
+        results=results,
+        timestamp=datetime.utcnow().isoformat()
+    )
+
+@router.get("/stats")
+async def easy_translate_stats():
+    """번역 캐시 적중/미스 및 LLM 대기열 통계"""
+    service = get_service()
+    return {
+        "code": status.HTTP_200_OK,
+        "cache": service.cache.stats(),
+        "scheduler": service.graph.scheduler.stats(),
+        "streams": streams.stats()
+    }
+
 @router.post(
     "/streaming",
     response_class=StreamingResponse,
@@ -80,39 +158,71 @@ async def easy_translate_streaming(
             detail="content가 필요합니다"
         )
 
+    # 끊긴 스트림 이어받기: Last-Event-ID 가 보관 중인 스트림이면 다음 이벤트부터 재전송
+    resumed = streams.resume(request.headers.get("last-event-id"))
+    if resumed is not None:
+        stream, after = resumed
+        logger.info(f"스트리밍 번역 이어받기 - stream_id: {stream.id}, 마지막 이벤트: {after}", request_id=request_id)
+    else:
+        # 스트림을 시작한 뒤에는 상태 코드를 바꿀 수 없으므로 대기열을 미리 확인
+        get_service().ensure_capacity()
+        stream, after = streams.start(generate_events(text, user_id, request_id)), 0
+
     async def event_generator():
-        state = None
-        chunk_count = 0
-        
+        in_flight = SSE_STREAMS_IN_FLIGHT.labels("/easy-translate/streaming")
+        in_flight.inc()
+        frames = stream.subscribe(after)
         try:
-            # 스트리밍 번역 실행
-            async for s in service.stream_translate(text, user_id, request_id):
-                state = s
-                chunk_count += 1
-                chunk = state["translated"][-1]
-                data = json.dumps({"translated_text_chunk": chunk}, ensure_ascii=False)
-                yield f"event: translate\ndata: {data}\n\n"
-
-            # done 이벤트
-            full = "".join(state["translated"]) if state else ""
-            done_payload = {
-                "original_text": text,  
-                "translated_text": full,
+            async for frame in frames:
+                yield frame
+        except StreamGap as e:
+            # 클라이언트가 버퍼 크기보다 뒤처진 경우
+            logger.warning(f"스트리밍 번역 이벤트 유실 - {e}", request_id=request_id)
+            yield encoder.encode("error", {
+                "error": "스트림 버퍼를 넘어 이어받을 수 없습니다. 다시 요청해 주세요.",
                 "timestamp": datetime.utcnow().isoformat()
-            }
-            yield f"event: done\ndata: {json.dumps(done_payload, ensure_ascii=False)}\n\n"
-            
-            logger.info(f"스트리밍 번역 API 완료 - 총 청크: {chunk_count}개", request_id=request_id)
-            
-        except Exception as e:
-            logger.error(f"스트리밍 번역 API 에러: {str(e)}", request_id=request_id)
-            error_payload = {
-                "error": str(e),
-                "timestamp": datetime.utcnow().isoformat()
-            }
-            yield f"event: error\ndata: {json.dumps(error_payload, ensure_ascii=False)}\n\n"
+            })
+        finally:
+            # 클라이언트 연결이 끊겨 중단된 경우에도 구독 해제가 바로 반영되도록 명시적으로 닫음
+            await frames.aclose()
+            in_flight.dec()
 
     return StreamingResponse(
         event_generator(),
-        media_type="text/event-stream"
+        media_type="text/event-stream",
+        headers={"X-Stream-ID": stream.id}
     )
+
+async def generate_events(text: str, user_id: Optional[str], request_id: Optional[str]):
+    """번역 스트림을 (event, payload) 로 생성 (연결과 별도 task 에서 실행)"""
+    translated = []
+    chunk_count = 0
+    try:
+        # 스트리밍 번역 실행 (첫 조각은 즉시, 이후는 시간 창/크기 단위로 묶어서 전송)
+        chunks = coalesce(
+            get_service().stream_translate(text, user_id, request_id),
+            Global.env.SSE_COALESCE_MS,
+            Global.env.SSE_COALESCE_MAX_BYTES,
+        )
+        async for chunk in chunks:
+            translated.append(chunk)
+            chunk_count += 1
+            yield "translate", {"translated_text_chunk": chunk}
+
+        # done 이벤트
+        done_payload = {
+            "original_text": text,  
+            "translated_text": "".join(translated),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        yield "done", done_payload
+        
+        logger.info(f"스트리밍 번역 API 완료 - 총 청크: {chunk_count}개", request_id=request_id)
+        
+    except Exception as e:
+        logger.error(f"스트리밍 번역 API 에러: {str(e)}", request_id=request_id)
+        error_payload = {
+            "error": str(e),
+            "timestamp": datetime.utcnow().isoformat()
+        }
+        yield "error", error_payload
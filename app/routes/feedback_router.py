@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from app.utils.auth_utils import get_optional_user  # 로그인 상태에 따라
-from app.firebase_config import save_feedback
+from app.firebase_config import asave_feedback
 from pydantic import BaseModel
 from typing import Optional
 
@@ -16,7 +16,7 @@ async def submit_feedback(
     user: Optional[str] = Depends(get_optional_user)  # 비로그인 가능하게 하려면 Optional 처리도 가능
 ):
     try:
-        save_feedback(
+        await asave_feedback(
             rating=payload.rating,
             comment=payload.comment,
             user_id=user if user else None
@@ -8,11 +8,12 @@ import hashlib
 
 load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent.parent / ".env")
 
-import httpx
 from fastapi import APIRouter, Body, HTTPException, Header, Query, status
 from datetime import datetime, timedelta
-from app.firebase_config import db
-from app.utils.auth_utils import create_jwt_token, generateUserUUID
+from app.firebase_config import aensure_user
+from app.utils.auth_utils import create_jwt_token, generateUserUUID, revoke_access_token
+import jwt
+from app.utils.http_client import get_http_client, request_with_retry
 
 class RefreshTokenRequest(BaseModel):
     refresh_token: str
@@ -48,9 +49,10 @@ async def kakao_login(code: str):
     if KAKAO_CLIENT_SECRET:
         token_data["client_secret"] = KAKAO_CLIENT_SECRET
 
-    async with httpx.AsyncClient() as client:
-        token_resp = await client.post("https://kauth.kakao.com/oauth/token", data=token_data)
-        print("Token Response:", token_resp.status_code, token_resp.text)
+    # 로그인마다 새 연결을 맺지 않도록 공유 클라이언트 사용 (TCP/TLS 연결 재사용)
+    client = get_http_client("kakao")
+    token_resp = await request_with_retry(client, "POST", "https://kauth.kakao.com/oauth/token", data=token_data)
+    print("Token Response:", token_resp.status_code, token_resp.text)
 
 
     if token_resp.status_code != 200:
@@ -62,11 +64,12 @@ async def kakao_login(code: str):
     expires_in = token_resp.json().get("expires_in")
 
     # 2. 사용자 정보 요청
-    async with httpx.AsyncClient() as client:
-        user_resp = await client.get(
-            "https://kapi.kakao.com/v2/user/me",
-            headers={"Authorization": f"Bearer {access_token}"}
-        )
+    user_resp = await request_with_retry(
+        client,
+        "GET",
+        "https://kapi.kakao.com/v2/user/me",
+        headers={"Authorization": f"Bearer {access_token}"}
+    )
 
     if user_resp.status_code != 200:
         raise HTTPException(status_code=400, detail="카카오 사용자 정보 요청 실패")
@@ -88,16 +91,8 @@ async def kakao_login(code: str):
     # uuid 생성
     user_uuid = await generateUserUUID(user_data)
 
-    # 3. Firestore에 사용자 등록 (없으면)
-    user_ref = db.collection("users").document(user_uuid)
-    if not user_ref.get().exists:
-        user_ref.set({
-            "nickname": nickname,
-            "email": email,
-            "created_at": datetime.utcnow().isoformat()
-        })
-
-    # JWT 토큰 생성 -> access_token, expires_in
+    # 3. Firestore에 사용자 등록 (없으면) + JWT 토큰 생성 -> access_token, expires_in
+    await aensure_user(user_uuid, nickname, email)
     jwt_token = await create_jwt_token(user_uuid)
 
     # 4) myapp:// 스킴으로 리다이렉트 URL 생성
@@ -118,6 +113,24 @@ async def kakao_login(code: str):
     #     "nickname" : nickname
     # }
 
+@router.post("/token/revoke")
+async def revoke_token(authorization: str = Header(...)):
+    """발급한 access 토큰 폐기 (로그아웃 시 호출, 만료 시각까지 모든 인증에서 거절)"""
+    if not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="인증 정보가 없습니다")
+
+    try:
+        await revoke_access_token(authorization.replace("Bearer ", ""))
+    except jwt.ExpiredSignatureError:
+        raise HTTPException(status_code=401, detail="토큰 만료")
+    except jwt.InvalidTokenError:
+        raise HTTPException(status_code=401, detail="잘못된 토큰")
+
+    return {
+        "code": status.HTTP_200_OK,
+        "message": "토큰이 폐기되었습니다"
+    }
+
 # @router.post("/kakao-refresh")
 # async def refresh(data: RefreshTokenRequest = Body(...)):
 #     token_data = {
@@ -0,0 +1,158 @@
+import asyncio
+from datetime import datetime
+from fastapi import APIRouter, File, HTTPException, Request, UploadFile
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
+
+from app.config import Global
+from app.routes.easy_translate import get_service
+from app.services.pdfPipeline import PageBoundaryScanner, iter_pages, remove_spooled, spool_upload
+from app.utils.llm_scheduler import Priority, llm_lane
+from app.utils.logger import logger
+from app.utils.metrics import SSE_STREAMS_IN_FLIGHT
+from app.utils.rulebook import patterns, validate_response, validate_rulebook
+from app.utils.sse import encoder
+from app.middleware.request_id import get_request_id
+
+
+router = APIRouter(tags=["PDF"])
+
+
+def _ordered(found: set) -> list[str]:
+    return [key for key in patterns if key in found]
+
+
+def _merge(details: list[str] | None, extra: list[str]) -> list[str]:
+    return _ordered(set(details or ()) | set(extra))
+
+
+@router.post("/validate-pdf")
+async def validate_pdf(request: Request, file: UploadFile = File(...)):
+    request_id = get_request_id(request)
+    path = await spool_upload(file)
+
+    try:
+        found = set()
+        pages: dict[int, list[str]] = {}
+        boundary = PageBoundaryScanner(Global.env.PDF_PAGE_CARRY_CHARS)
+        async for total, index, text in iter_pages(path):
+            results = validate_rulebook(text)
+            found.update(results)
+            pages[index] = _merge(pages.get(index), results)
+            # 페이지 경계에 걸친 매치는 앞 페이지 결과에 합침
+            for before, categories in boundary.add(index, text):
+                found.update(categories)
+                pages[before] = _merge(pages.get(before), categories)
+
+        logger.info(f"PDF 검증 완료 - 페이지 수: {len(pages)}개", request_id=request_id)
+
+        response = validate_response(_ordered(found))
+        response["pages"] = [{"page": index + 1, "details": pages[index] or None} for index in sorted(pages)]
+        return response
+    finally:
+        remove_spooled(path)
+
+
+@router.post("/validate-pdf/streaming", response_class=StreamingResponse)
+async def validate_pdf_streaming(
+    request: Request,
+    file: UploadFile = File(...),
+    translate: bool = True,
+):
+    """페이지별 검증/번역 결과를 준비되는 대로 SSE 로 전달"""
+    request_id = get_request_id(request)
+    path = await spool_upload(file)
+
+    logger.info("PDF 스트리밍 처리 시작", request_id=request_id)
+
+    async def event_generator():
+        queue: asyncio.Queue = asyncio.Queue()
+        semaphore = asyncio.Semaphore(Global.env.PDF_TRANSLATE_CONCURRENCY)
+        tasks: set[asyncio.Task] = set()
+        found = set()
+        page_results: dict[int, list[str]] = {}
+        boundary = PageBoundaryScanner(Global.env.PDF_PAGE_CARRY_CHARS)
+        page_count = 0
+
+        async def translate_page(total: int, index: int, text: str):
+            payload = {"page": index + 1, "total": total, "translated_text": "", "error": None}
+            if translate and text.strip():
+                # PDF 페이지 번역은 일괄 작업 레인으로 실행 (task 별 context 라 다른 요청에 영향 없음)
+                async with semaphore:
+                    try:
+                        with llm_lane(Priority.BULK):
+                            payload["translated_text"] = await get_service().atranslate(
+                                text.strip(), None, request_id
+                            )
+                    except HTTPException as e:
+                        payload["error"] = e.detail
+            await queue.put(("translate", payload))
+
+        async def produce():
+            nonlocal page_count
+            try:
+                async for total, index, text in iter_pages(path):
+                    page_count = total
+                    # 추출된 페이지는 곧바로 검증 결과를 보내고 번역을 시작
+                    results = validate_rulebook(text)
+                    found.update(results)
+                    page_results[index] = _merge(page_results.get(index), results)
+                    # 페이지 경계에 걸친 매치는 앞 페이지 결과에 합침
+                    updated = [index]
+                    for before, categories in boundary.add(index, text):
+                        found.update(categories)
+                        page_results[before] = _merge(page_results.get(before), categories)
+                        if before != index:
+                            # 이미 보낸 앞 페이지의 검증 결과는 합친 내용으로 다시 보냄
+                            updated.append(before)
+                    for page in updated:
+                        await queue.put(("validate", {
+                            "page": page + 1,
+                            "total": total,
+                            "details": page_results[page] or None,
+                        }))
+                    task = asyncio.create_task(translate_page(total, index, text))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+
+                if tasks:
+                    await asyncio.gather(*tasks)
+            except HTTPException as e:
+                await queue.put(("error", {"error": e.detail}))
+            except Exception as e:
+                await queue.put(("error", {"error": str(e)}))
+            finally:
+                await queue.put(None)
+
+        producer = asyncio.create_task(produce())
+        in_flight = SSE_STREAMS_IN_FLIGHT.labels("/validate-pdf/streaming")
+        in_flight.inc()
+
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                event, payload = item
+                yield encoder.encode(event, payload)
+
+            done_payload = validate_response(_ordered(found))
+            done_payload["total"] = page_count
+            done_payload["timestamp"] = datetime.utcnow().isoformat()
+            yield encoder.encode("done", done_payload)
+
+            logger.info(f"PDF 스트리밍 처리 완료 - 페이지 수: {page_count}개", request_id=request_id)
+        finally:
+            # 클라이언트가 끊겨도 남은 작업과 임시 파일을 정리
+            in_flight.dec()
+            producer.cancel()
+            for task in list(tasks):
+                task.cancel()
+            remove_spooled(path)
+
+    # 응답 본문이 시작되기 전에 연결이 끊겨 generator 가 실행되지 않아도 임시 파일을 지움
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        background=BackgroundTask(remove_spooled, path),
+    )
@@ -0,0 +1,148 @@
+import argparse
+import re
+import unicodedata
+from collections import Counter
+from typing import Iterable, Optional
+
+from app.utils.logger import logger
+
+# 검색 토큰을 담는 아카이브 문서 필드 (array-contains-any 로 조회)
+# 복합 색인 필요: archives (user_id ==, search_tokens array-contains, timestamp desc, __name__ desc)
+# (firestore.indexes.json 에 정의, `firebase deploy --only firestore:indexes` 로 배포)
+TOKEN_FIELD = "search_tokens"
+# array-contains-any 한 번에 넣을 수 있는 최대 값 수
+QUERY_TOKEN_LIMIT = 30
+# 목록 미리보기 필드 (목록 summary 모드는 본문 대신 이 필드만 받음) / 미리보기 글자 수
+PREVIEW_FIELD = "preview"
+PREVIEW_CHARS = 100
+# 예전 방식(토큰별 postings 문서) 색인 컬렉션 - 재구축 시 정리
+LEGACY_INDEX_COLLECTION = "archive_search_index"
+# Firestore WriteBatch 한 번에 넣을 수 있는 최대 쓰기 수
+BATCH_LIMIT = 500
+
+_WORD = re.compile(r"\w+")
+
+
+def _text_of(translated_text) -> str:
+    # 문자열이든 배열이든 처리
+    if isinstance(translated_text, list):
+        return "\n".join(str(text) for text in translated_text)
+    return translated_text or ""
+
+
+def tokenize(text: str) -> Counter:
+    """검색용 토큰 (단어별 글자 2-gram, 한 글자 단어는 그대로)
+
+    형태소 분석 없이도 '주민등록' 으로 '주민등록등본을' 을 찾을 수 있도록
+    조사/어미가 붙은 한국어 단어를 글자 단위로 쪼갠다.
+    """
+    text = unicodedata.normalize("NFC", text).lower()
+    tokens: Counter = Counter()
+    for word in _WORD.findall(text):
+        if len(word) == 1:
+            tokens[word] += 1
+            continue
+        for i in range(len(word) - 1):
+            tokens[word[i:i + 2]] += 1
+    return tokens
+
+
+def query_grams(query: str) -> list[str]:
+    """검색어 토큰 (한 글자 단어만으로 된 검색어는 색인으로 찾을 수 없어 빈 목록)"""
+    grams = tokenize(query)
+    if all(len(gram) == 1 for gram in grams):
+        return []
+    return [gram for gram in grams if len(gram) > 1]
+
+
+def preview(translated_text) -> str:
+    """목록용 본문 미리보기 (PREVIEW_CHARS 글자까지)"""
+    text = "".join(translated_text) if isinstance(translated_text, list) else translated_text or ""
+    if len(text) <= PREVIEW_CHARS:
+        return text
+    return text[:PREVIEW_CHARS] + "…"
+
+
+def search_tokens(translated_text, max_tokens: int) -> list[str]:
+    """아카이브 문서에 함께 저장할 검색 토큰 (중복 없이 등장 순서대로 최대 max_tokens 개)
+
+    문서 크기와 색인 항목 수가 본문 길이에 비례해 커지지 않도록 개수를 제한한다.
+    (제한을 넘는 긴 본문은 뒷부분의 토큰으로는 찾을 수 없음)
+    """
+    return list(tokenize(_text_of(translated_text)))[:max(0, max_tokens)]
+
+
+def coverage(tokens, grams: list[str]) -> float:
+    """검색어 토큰 중 문서 토큰에 들어 있는 비율 (0~1, 검색 결과 순위에 사용)"""
+    if not grams:
+        return 0.0
+    tokens = set(tokens or ())
+    return sum(1 for gram in grams if gram in tokens) / len(grams)
+
+
+def contains_text(translated_text, query: str) -> bool:
+    """색인으로 찾을 수 없는 한 글자 검색어용 본문 포함 검사"""
+    return unicodedata.normalize("NFC", query).lower() in unicodedata.normalize("NFC", _text_of(translated_text)).lower()
+
+
+def commit_writes(db, writes: Iterable[tuple]) -> int:
+    """(문서 참조, 필드) 쓰기를 WriteBatch 단위로 나눠 커밋하고 커밋 횟수를 반환
+
+    필드가 None 이면 문서 삭제, 그 외에는 merge 로 병합한다.
+    """
+    batch, pending, commits = db.batch(), 0, 0
+    for ref, fields in writes:
+        if pending >= BATCH_LIMIT:
+            batch.commit()
+            commits += 1
+            batch, pending = db.batch(), 0
+        if fields is None:
+            batch.delete(ref)
+        else:
+            batch.set(ref, fields, merge=True)
+        pending += 1
+    if pending:
+        batch.commit()
+        commits += 1
+    return commits
+
+
+def rebuild(db, max_tokens: int, user_id: Optional[str] = None) -> int:
+    """기존 아카이브 문서의 검색 토큰과 미리보기를 다시 계산 (user_id 가 없으면 전체 사용자)"""
+    archive_query = db.collection("archives")
+    legacy_query = db.collection(LEGACY_INDEX_COLLECTION)
+    if user_id:
+        archive_query = archive_query.where("user_id", "==", user_id)
+        legacy_query = legacy_query.where("user_id", "==", user_id)
+
+    count = 0
+
+    def writes():
+        nonlocal count
+        # 본문 전체를 다시 쓰지 않고 토큰 필드만 병합
+        for doc in archive_query.select(["translated_text"]).stream():
+            count += 1
+            translated_text = doc.get("translated_text")
+            yield doc.reference, {
+                TOKEN_FIELD: search_tokens(translated_text, max_tokens),
+                PREVIEW_FIELD: preview(translated_text),
+            }
+
+    commit_writes(db, writes())
+
+    # 예전 postings 문서 삭제
+    commit_writes(db, ((doc.reference, None) for doc in legacy_query.stream()))
+    logger.info(f"아카이브 검색 토큰/미리보기 재구축 완료 - 문서 수: {count}개")
+    return count
+
+
+if __name__ == "__main__":
+    # python -m app.services.archiveIndex [--user USER_ID]
+    parser = argparse.ArgumentParser(description="아카이브 검색 토큰/미리보기 재구축")
+    parser.add_argument("--user", help="이 사용자만 재구축 (생략 시 전체)")
+    args = parser.parse_args()
+
+    from app.config import Global
+    from app.firebase_config import get_db
+
+    rebuild(get_db(), Global.env.ARCHIVE_SEARCH_MAX_TOKENS, args.user)
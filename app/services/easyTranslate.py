@@ -1,68 +1,335 @@
+import asyncio
 import time
 from app.agent.easyTranslate.graph import EasyTranslateGraph
+from app.agent.easyTranslate.prompt import EasyTranslatePrompt
+from app.agent.easyTranslate.splitter import estimate_tokens
+from app.config import Global
 from fastapi import HTTPException
+from app.utils.llm_scheduler import Priority, SchedulerOverloaded, llm_lane
 from app.utils.logger import logger
+from app.utils.metrics import TRANSLATION_CACHE_HIT_RATIO, TRANSLATION_CHARS
+from app.utils.redaction import Redaction, redact
+from app.utils.single_flight import SingleFlight
+from app.utils.translation_cache import TranslationCache, make_cache_key
 
 
 class EasyTranslateService:
     def __init__(self):
         self.graph = EasyTranslateGraph()
+        self.cache = TranslationCache.from_env()
+        # 동일 원문 동시 요청 합치기 (캐시 키 기준)
+        self.inflight = SingleFlight()
+        TRANSLATION_CACHE_HIT_RATIO.set_function(lambda: self.cache.stats()["hit_ratio"])
         logger.info("EasyTranslateService 초기화 완료")
 
-    def translate(self, text: str, user_id: str = None, request_id: str = None) -> str:
-        """단문 non-streaming 번역"""
+    @staticmethod
+    def _redact(text: str) -> Redaction:
+        """프롬프트 생성 전 개인정보를 자리표시자로 치환"""
+        if not Global.env.PII_REDACTION_ENABLED:
+            return Redaction(text, {})
+        return redact(text)
+
+    @staticmethod
+    def _overloaded(e: SchedulerOverloaded) -> HTTPException:
+        return HTTPException(
+            status_code=429,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+    def ensure_capacity(self):
+        """LLM 대기열이 가득 찼으면 429 (스트리밍 응답 시작 전 확인용)"""
+        try:
+            self.graph.scheduler.check_capacity()
+        except SchedulerOverloaded as e:
+            logger.warning(f"LLM 대기열 초과 - Retry-After: {e.retry_after}초")
+            raise self._overloaded(e)
+
+    def _cache_key(self, text: str, model: str) -> str:
+        return make_cache_key(text, EasyTranslatePrompt.system_prompt, model)
+
+    @staticmethod
+    def _replay_chunks(text: str) -> list[str]:
+        """캐시된 번역문을 SSE 청크 단위(줄)로 분할"""
+        return text.splitlines(keepends=True) or [text]
+
+    @staticmethod
+    async def _aiter(chunks):
+        """list 와 async iterator 를 같은 방식으로 순회"""
+        if hasattr(chunks, "__aiter__"):
+            async for chunk in chunks:
+                yield chunk
+        else:
+            for chunk in chunks:
+                yield chunk
+
+    async def _produce(self, text: str, cache_key: str) -> str:
+        """업스트림 번역 1회 실행 후 캐시에 저장 (single-flight 선두만 실행)"""
+        state = await self.graph.arun(text)
+        result = "".join(state["translated"])
+        await self.cache.set(cache_key, result)
+        return result
+
+    @staticmethod
+    async def _in_order(events):
+        """긴 문서 스트림의 청크별 이벤트를 원문 순서의 조각으로 변환
+
+        지금 내보낼 차례인 청크의 조각은 바로 전달하고, 뒤 청크의 조각은 모아 두었다가
+        앞 청크가 끝나는 대로 이어서 전달한다. 청크 사이에는 빈 줄을 넣는다.
+        """
+        current = 0
+        opened = False
+        pending: dict[int, list[str]] = {}
+        finished: set[int] = set()
+
+        try:
+            async for event in events:
+                if event.get("done"):
+                    finished.add(event["index"])
+                else:
+                    pending.setdefault(event["index"], []).append(event["delta"])
+
+                while True:
+                    deltas = pending.pop(current, [])
+                    if (deltas or current in finished) and not opened:
+                        opened = True
+                        if current > 0:
+                            yield "\n\n"
+                    for delta in deltas:
+                        yield delta
+                    if current not in finished:
+                        break
+                    current += 1
+                    opened = False
+        finally:
+            # 소비자가 먼저 끝나도 남은 청크 번역이 바로 취소되도록 원본 스트림을 닫음
+            await events.aclose()
+
+    async def _produce_stream(self, text: str, cache_key: str):
+        """업스트림 스트리밍 1회 실행, 구독자들에게 청크를 팬아웃"""
+        if self.graph.is_long(text):
+            deltas = self._in_order(self.graph.stream_long(text))
+        else:
+            deltas = self.graph.stream(text)
+
+        translated = []
+        async for chunk in deltas:
+            translated.append(chunk)
+            yield chunk
+
+        # 스트리밍이 끝까지 완료된 경우에만 캐시에 저장
+        await self.cache.set(cache_key, "".join(translated))
+
+    async def atranslate(self, text: str, user_id: str = None, request_id: str = None) -> str:
+        """단문 non-streaming 번역 (async, 이벤트 루프 비차단)"""
         start_time = time.time()
-        
+
         try:
             # 번역 요청 로그
             logger.log_translation_request(text, user_id, request_id)
-            
-            # 번역 실행
-            state = self.graph.run(text)
-            
-            # 번역 결과 추출
-            result = "".join(state["translated"])
-            
+
+            # 개인정보 가림 → 캐시/합치기 키도 가린 텍스트 기준
+            redaction = self._redact(text)
+            prompt_text = redaction.text
+
+            # 캐시 조회 후 미스일 때만 번역 실행 (graph.ainvoke)
+            cache_key = self._cache_key(prompt_text, self.graph.llm.model_name)
+            result = await self.cache.get(cache_key)
+
+            if result is None:
+                # 동일 원문이 이미 번역 중이면 그 결과를 함께 기다림
+                result = await self.inflight.do(
+                    cache_key, lambda: self._produce(prompt_text, cache_key)
+                )
+            else:
+                logger.info("번역 캐시 적중", user_id=user_id, request_id=request_id)
+
+            # 자리표시자를 원래 값으로 복원
+            result = redaction.restore(result)
+            TRANSLATION_CHARS.labels("input").inc(len(text))
+            TRANSLATION_CHARS.labels("output").inc(len(result))
+
             # 처리 시간 계산
             duration = time.time() - start_time
-            
+
             # 성공 로그
             logger.log_translation_success(text, result, duration, user_id, request_id)
-            
-            # 콘솔 출력 (기존 코드 유지)
-            print(f"번역 결과: {state['translated'][0] if state['translated'] else 'No translation'}")
-            
+
             return result
-            
+
+        except SchedulerOverloaded as e:
+            # 대기열이 가득 찬 경우 서비스 전체가 실패하지 않도록 재시도 안내
+            logger.warning(f"LLM 대기열 초과 - Retry-After: {e.retry_after}초", user_id=user_id, request_id=request_id)
+            raise self._overloaded(e)
+
         except Exception as e:
             # 에러 로그
             logger.log_translation_error(text, e, user_id, request_id)
-            
-            # 기존 예외 처리
+
             raise HTTPException(status_code=500, detail=f"번역 중 오류: {e}")
 
+    @staticmethod
+    def _packs(misses: list[tuple]) -> list[list[tuple]]:
+        """미스 항목을 BATCH_TRANSLATE_PACK_SIZE 개 / BATCH_TRANSLATE_PACK_TOKENS 토큰 이하의 묶음으로 나눔"""
+        packs: list[list[tuple]] = []
+        current: list[tuple] = []
+        tokens = 0
+        for miss in misses:
+            miss_tokens = estimate_tokens(miss[1])
+            if current and (
+                len(current) >= Global.env.BATCH_TRANSLATE_PACK_SIZE
+                or tokens + miss_tokens > Global.env.BATCH_TRANSLATE_PACK_TOKENS
+            ):
+                packs.append(current)
+                current, tokens = [], 0
+            current.append(miss)
+            tokens += miss_tokens
+        if current:
+            packs.append(current)
+        return packs
+
+    async def _translate_pack(self, pack: list[tuple], results: dict, user_id: str = None, request_id: str = None):
+        """묶음 하나를 한 번의 LLM 호출로 번역해 results 에 채움
+
+        응답을 항목별로 나눌 수 없거나 호출이 실패하면 그 묶음만 항목별 번역(atranslate)으로 다시 시도해
+        실패한 항목만 error 가 되도록 한다. 대기열 초과는 다시 시도해도 같으므로 바로 error 로 처리.
+        """
+        try:
+            outputs = await self.graph.arun_packed([prompt_text for _, prompt_text, _ in pack])
+        except SchedulerOverloaded as e:
+            for _, _, items in pack:
+                for text, _ in items:
+                    results[text] = {"status": "error", "error": str(e)}
+            return
+        except Exception as e:
+            logger.warning(f"묶음 번역 실패, 항목별로 다시 번역 - 항목: {len(pack)}개, 에러: {str(e)}", user_id=user_id, request_id=request_id)
+            outputs = None
+
+        if outputs is None:
+            async def translate_one(text: str):
+                try:
+                    results[text] = {"status": "ok", "translated_text": await self.atranslate(text, user_id, request_id)}
+                except HTTPException as e:
+                    results[text] = {"status": "error", "error": e.detail}
+
+            await asyncio.gather(*(translate_one(text) for _, _, items in pack for text, _ in items))
+            return
+
+        for (cache_key, _, items), output in zip(pack, outputs):
+            await self.cache.set(cache_key, output)
+            for text, redaction in items:
+                restored = redaction.restore(output)
+                TRANSLATION_CHARS.labels("input").inc(len(text))
+                TRANSLATION_CHARS.labels("output").inc(len(restored))
+                results[text] = {"status": "ok", "translated_text": restored}
+
+    async def atranslate_batch(self, texts: list[str], user_id: str = None, request_id: str = None) -> list[dict]:
+        """여러 단문을 한 번에 번역하고 입력 순서대로 항목별 결과를 반환
+
+        같은 원문은 한 번만 처리하고, 모든 원문의 캐시를 먼저 조회해 적중한 항목은 기다리지 않고
+        바로 채운다. 미스만 여러 개씩 한 프롬프트로 묶어(시스템 프롬프트는 묶음당 한 번) 번역하며,
+        묶음은 BATCH_TRANSLATE_CONCURRENCY 개씩 대화형 요청보다 낮은 우선순위로 실행한다.
+        """
+        unique = list(dict.fromkeys(text.strip() for text in texts))
+        results: dict[str, dict] = {}
+
+        # 개인정보를 가린 원문 기준 캐시 키별로 모음 (가린 결과가 같으면 한 번만 번역)
+        pending: dict[str, tuple[str, list]] = {}
+        model = self.graph.llm.model_name
+        for text in unique:
+            if not text:
+                results[text] = {"status": "error", "error": "content가 필요합니다"}
+                continue
+            redaction = self._redact(text)
+            cache_key = self._cache_key(redaction.text, model)
+            pending.setdefault(cache_key, (redaction.text, []))[1].append((text, redaction))
+
+        cached = await asyncio.gather(*(self.cache.get(cache_key) for cache_key in pending))
+        misses = []
+        for (cache_key, (prompt_text, items)), value in zip(pending.items(), cached):
+            if value is None:
+                misses.append((cache_key, prompt_text, items))
+                continue
+            for text, redaction in items:
+                results[text] = {"status": "ok", "translated_text": redaction.restore(value)}
+
+        packs = self._packs(misses)
+        logger.info(
+            f"일괄 번역 - 항목: {len(texts)}개, 중복 제거 후: {len(unique)}개, "
+            f"캐시 적중: {len(pending) - len(misses)}개, LLM 호출: {len(packs)}회",
+            user_id=user_id, request_id=request_id
+        )
+
+        semaphore = asyncio.Semaphore(Global.env.BATCH_TRANSLATE_CONCURRENCY)
+
+        async def run(pack: list[tuple]):
+            async with semaphore:
+                with llm_lane(Priority.BULK):
+                    await self._translate_pack(pack, results, user_id, request_id)
+
+        await asyncio.gather(*(run(pack) for pack in packs))
+        return [
+            {"index": index, "original_text": text.strip(), **results[text.strip()]}
+            for index, text in enumerate(texts)
+        ]
+
     async def stream_translate(self, text: str, user_id: str = None, request_id: str = None):
-        """SSE 스트리밍용 generator"""
+        """SSE 스트리밍용 generator (복원된 번역 조각 문자열을 yield)"""
         start_time = time.time()
         chunk_count = 0
+        output_chars = 0
         
         try:
             # 스트리밍 시작 로그
             logger.log_streaming_start(text, user_id, request_id)
             
-            # 스트리밍 번역 실행
-            async for state in self.graph.stream(text):
+            # 개인정보 가림 → 청크 경계에 걸친 자리표시자는 restorer 가 보류 후 복원
+            redaction = self._redact(text)
+            prompt_text = redaction.text
+            restorer = redaction.restorer()
+
+            cache_key = self._cache_key(prompt_text, self.graph.llm_stream.model_name)
+            cached = await self.cache.get(cache_key)
+
+            if cached is not None:
+                # 캐시 적중 시 저장된 번역문을 곧바로 청크로 재생
+                logger.info("번역 캐시 적중 (스트리밍)", user_id=user_id, request_id=request_id)
+                chunks = self._replay_chunks(cached)
+            else:
+                # 스트리밍 번역 실행 (동일 원문 스트림이 진행 중이면 구독)
+                chunks = self.inflight.stream(
+                    cache_key, lambda: self._produce_stream(prompt_text, cache_key)
+                )
+
+            async for chunk in self._aiter(chunks):
+                restored = restorer.feed(chunk)
+                if not restored:
+                    continue
                 chunk_count += 1
-                
+                output_chars += len(restored)
+
                 # 주기적으로 청크 로그
                 logger.log_streaming_chunk(chunk_count, user_id, request_id)
-                
-                yield state
+
+                yield restored
+
+            rest = restorer.flush()
+            if rest:
+                chunk_count += 1
+                output_chars += len(rest)
+                yield rest
             
+            TRANSLATION_CHARS.labels("input").inc(len(text))
+            TRANSLATION_CHARS.labels("output").inc(output_chars)
+
             # 스트리밍 완료 로그
             duration = time.time() - start_time
             logger.log_streaming_complete(chunk_count, duration, user_id, request_id)
-            
+
+        except SchedulerOverloaded as e:
+            logger.warning(f"LLM 대기열 초과 (스트리밍) - Retry-After: {e.retry_after}초", user_id=user_id, request_id=request_id)
+            raise self._overloaded(e)
+
         except Exception as e:
             # 스트리밍 에러 로그
             logger.log_translation_error(text, e, user_id, request_id)
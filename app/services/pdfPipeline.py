@@ -0,0 +1,168 @@
+import asyncio
+import multiprocessing
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile
+
+from app.config import Global
+from app.utils.logger import logger
+from app.utils.rulebook import patterns, scan_rulebook
+
+_executor: Optional[ProcessPoolExecutor] = None
+
+# 업로드 스풀링 시 한 번에 읽는 크기
+SPOOL_CHUNK_SIZE = 1024 * 1024
+
+
+def get_pdf_executor() -> ProcessPoolExecutor:
+    """페이지 추출용 프로세스 풀 (처음 사용할 때 생성)"""
+    global _executor
+    if _executor is None:
+        # 이벤트 루프/스레드 풀/gRPC 연결을 가진 서버 프로세스를 fork 하지 않도록
+        # forkserver(없으면 spawn) 로 깨끗한 워커를 띄움
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+        _executor = ProcessPoolExecutor(max_workers=Global.env.PDF_MAX_WORKERS, mp_context=context)
+        logger.info(f"PDF 프로세스 풀 생성 - 워커 수: {Global.env.PDF_MAX_WORKERS}")
+    return _executor
+
+
+def shutdown_pdf_executor():
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+# ---- 프로세스 풀 워커에서 실행되는 함수 (pickle 가능하도록 모듈 최상위에 둠) ----
+
+def _page_count(path: str) -> int:
+    import fitz
+
+    with fitz.open(path) as doc:
+        return doc.page_count
+
+
+def _extract_pages(path: str, start: int, end: int) -> list[Tuple[int, str]]:
+    import fitz
+
+    # 파일에서 직접 열어 필요한 페이지만 읽음
+    with fitz.open(path) as doc:
+        return [(index, doc.load_page(index).get_text() or "") for index in range(start, end)]
+
+
+async def spool_upload(file: UploadFile) -> str:
+    """업로드 파일을 임시 파일로 옮기고 경로를 반환 (전체를 메모리에 올리지 않음)"""
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        with os.fdopen(fd, "wb") as out:
+            while True:
+                chunk = await file.read(SPOOL_CHUNK_SIZE)
+                if not chunk:
+                    break
+                await asyncio.to_thread(out.write, chunk)
+    except Exception:
+        remove_spooled(path)
+        raise
+    return path
+
+
+def remove_spooled(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+class PageBoundaryScanner:
+    """페이지 경계에 걸친 rulebook 매치 찾기
+
+    페이지 단위 검사는 "성명: 홍" / "길동" 처럼 페이지 끝과 다음 페이지 시작에 나뉜 값을
+    놓친다. 페이지는 추출이 끝나는 순서대로 도착하므로, 이웃한 두 페이지가 모두 도착하면
+    앞 페이지의 끝 carry 글자와 뒤 페이지의 앞 carry 글자를 이어 경계를 넘는 매치만 찾는다.
+    """
+
+    # 페이지 사이를 그대로 붙인 경우(숫자/단어가 끊긴 경우)와 공백으로 붙인 경우 모두 검사
+    _SEPARATORS = ("", " ")
+
+    def __init__(self, carry: int):
+        self.carry = max(0, carry)
+        self._heads: dict[int, str] = {}
+        self._tails: dict[int, str] = {}
+
+    def add(self, index: int, text: str) -> list[Tuple[int, list[str]]]:
+        """페이지를 추가하고, 새로 검사할 수 있게 된 경계의 (앞 페이지 번호, 카테고리) 목록 반환"""
+        if self.carry == 0:
+            return []
+        self._heads[index] = text[:self.carry].lstrip()
+        self._tails[index] = text[-self.carry:].rstrip()
+
+        found = []
+        for before in (index - 1, index):
+            if before in self._tails and before + 1 in self._heads:
+                # 양쪽 모두 한 번만 쓰이므로 검사 후 정리
+                tail = self._tails.pop(before)
+                head = self._heads.pop(before + 1)
+                categories = self._scan(tail, head)
+                if categories:
+                    found.append((before, categories))
+        return found
+
+    def _scan(self, tail: str, head: str) -> list[str]:
+        found = set()
+        for separator in self._SEPARATORS:
+            _, matches = scan_rulebook(tail + separator + head)
+            boundary = len(tail)
+            for match in matches:
+                if match.start < boundary and match.end > boundary + len(separator):
+                    found.add(match.category)
+        return [key for key in patterns if key in found]
+
+
+async def iter_pages(path: str) -> AsyncIterator[Tuple[int, int, str]]:
+    """(전체 페이지 수, 페이지 번호, 텍스트)를 추출이 끝나는 순서대로 반환
+
+    프로세스 풀에 페이지 묶음을 나눠 맡기되, 동시에 대기하는 묶음 수를
+    워커 수의 두 배로 제한해 결과가 메모리에 쌓이지 않도록 한다.
+    """
+    loop = asyncio.get_running_loop()
+    executor = get_pdf_executor()
+
+    try:
+        total = await loop.run_in_executor(executor, _page_count, path)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"PDF 처리 실패: {e}")
+
+    batch = max(1, Global.env.PDF_PAGES_PER_TASK)
+    window = max(1, Global.env.PDF_MAX_WORKERS * 2)
+    starts = iter(range(0, total, batch))
+    pending: set[asyncio.Future] = set()
+
+    def submit_next() -> bool:
+        start = next(starts, None)
+        if start is None:
+            return False
+        pending.add(loop.run_in_executor(executor, _extract_pages, path, start, min(start + batch, total)))
+        return True
+
+    try:
+        while len(pending) < window and submit_next():
+            pass
+
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                pending.discard(future)
+                try:
+                    pages = future.result()
+                except Exception as e:
+                    raise HTTPException(status_code=400, detail=f"PDF 처리 실패: {e}")
+                submit_next()
+                for index, text in pages:
+                    yield total, index, text
+    finally:
+        for future in pending:
+            future.cancel()
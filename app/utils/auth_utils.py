@@ -9,6 +9,9 @@ import httpx
 import os
 import jwt
 
+from app.config import Global
+from app.utils.token_revocation import RevocationList, VerifiedTokenCache, token_digest
+
 load_dotenv(dotenv_path=Path(__file__).resolve().parent.parent.parent / ".env")
 
 KAKAO_CLIENT_ID = os.getenv("KAKAO_REST_API_KEY")
@@ -22,6 +25,29 @@ ALGORITHM = "HS256"
 
 security = HTTPBearer(auto_error=False)
 
+# 검증된 토큰 claims 캐시 / 폐기(로그아웃)된 토큰 목록
+token_cache = VerifiedTokenCache(Global.env.AUTH_TOKEN_CACHE_SIZE)
+revocations = RevocationList.from_env()
+
+def decode_access_token(token: str) -> dict:
+    """access 토큰 검증 (폐기 여부 확인 후, 캐시에 없을 때만 서명 검증)"""
+    digest = token_digest(token)
+    if revocations.is_revoked(digest):
+        raise jwt.InvalidTokenError("폐기된 토큰")
+
+    payload = token_cache.get(digest)
+    if payload is None:
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        token_cache.put(digest, payload)
+    return payload
+
+async def revoke_access_token(token: str) -> None:
+    """토큰 폐기 (만료 시각까지 거절됨)"""
+    payload = decode_access_token(token)
+    digest = token_digest(token)
+    token_cache.discard(digest)
+    await revocations.revoke(digest, payload["exp"])
+
 async def create_jwt_token(user_uuid: str):
     now = datetime.utcnow()
     
@@ -77,7 +103,7 @@ async def get_current_user(request: Request):
 
     try:
         # 카카오 사용자 정보 요청
-        payload = jwt.decode(access_token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(access_token)
         user_id = payload.get("sub")
 
         if payload.get("type") != "access":
@@ -100,7 +126,7 @@ async def get_optional_user(
 
     try:
         # JWT 디코딩
-        payload = jwt.decode(access_token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = decode_access_token(access_token)
         if payload.get("type") != "access":
             return None
         return payload.get("sub")  # user_uuid 반환
@@ -0,0 +1,114 @@
+import asyncio
+import random
+from typing import Optional
+
+import httpx
+
+from app.config import Global
+from app.utils.logger import logger
+
+# 요청이 서버에 닿기 전에 실패한 경우 (어떤 메서드든 재시도해도 안전)
+_CONNECT_ERRORS = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+# 멱등 요청에 한해 추가로 재시도하는 경우
+_IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+_RETRY_STATUS = {429, 502, 503, 504}
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+class HTTPClientRegistry:
+    """외부 연동별 httpx.AsyncClient 를 하나씩만 만들어 연결을 재사용
+
+    클라이언트는 처음 사용할 때 생성하고, 앱 종료 시 lifespan 에서 한꺼번에 닫는다.
+    """
+
+    def __init__(self):
+        self._clients: dict[str, httpx.AsyncClient] = {}
+
+    def _create(self, name: str, base_url: str) -> httpx.AsyncClient:
+        env = Global.env
+        http2 = env.HTTP_CLIENT_HTTP2 and _http2_available()
+        if env.HTTP_CLIENT_HTTP2 and not http2:
+            logger.warning("h2 패키지가 없어 HTTP/1.1 keep-alive 로 연결합니다")
+        logger.info(f"HTTP 클라이언트 생성 - {name} (HTTP/2: {http2})")
+        return httpx.AsyncClient(
+            base_url=base_url,
+            http2=http2,
+            timeout=httpx.Timeout(
+                env.HTTP_CLIENT_TIMEOUT_SECONDS,
+                connect=env.HTTP_CLIENT_CONNECT_TIMEOUT_SECONDS,
+            ),
+            limits=httpx.Limits(
+                max_connections=env.HTTP_CLIENT_MAX_CONNECTIONS,
+                max_keepalive_connections=env.HTTP_CLIENT_MAX_KEEPALIVE,
+                keepalive_expiry=env.HTTP_CLIENT_KEEPALIVE_SECONDS,
+            ),
+        )
+
+    def get(self, name: str, base_url: str = "") -> httpx.AsyncClient:
+        client = self._clients.get(name)
+        if client is None or client.is_closed:
+            client = self._create(name, base_url)
+            self._clients[name] = client
+        return client
+
+    async def aclose(self):
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+
+
+http_clients = HTTPClientRegistry()
+
+
+def get_http_client(name: str, base_url: str = "") -> httpx.AsyncClient:
+    """연동 이름별 공유 클라이언트 (예: "kakao_auth", "ocr")"""
+    return http_clients.get(name, base_url)
+
+
+async def close_http_clients():
+    await http_clients.aclose()
+
+
+async def request_with_retry(
+    client: httpx.AsyncClient,
+    method: str,
+    url: str,
+    retries: Optional[int] = None,
+    **kwargs,
+) -> httpx.Response:
+    """지수 백오프 + full jitter 재시도
+
+    연결 단계 실패는 항상 재시도하고, 응답을 받은 뒤의 실패(타임아웃, 5xx/429)는
+    멱등 요청일 때만 재시도한다. 인가 코드 교환처럼 한 번만 유효한 POST 가
+    서버에 두 번 전달되지 않도록 하기 위함.
+    """
+    retries = Global.env.HTTP_CLIENT_RETRIES if retries is None else retries
+    idempotent = method.upper() in _IDEMPOTENT_METHODS
+    attempt = 0
+
+    while True:
+        try:
+            response = await client.request(method, url, **kwargs)
+            if not (idempotent and response.status_code in _RETRY_STATUS) or attempt >= retries:
+                return response
+            reason = f"HTTP {response.status_code}"
+        except _CONNECT_ERRORS as e:
+            if attempt >= retries:
+                raise
+            reason = type(e).__name__
+        except httpx.TransportError as e:
+            if not idempotent or attempt >= retries:
+                raise
+            reason = type(e).__name__
+
+        delay = random.uniform(0, Global.env.HTTP_CLIENT_BACKOFF_SECONDS * (2 ** attempt))
+        attempt += 1
+        logger.warning(f"외부 요청 재시도 {attempt}/{retries} - {method} {url} ({reason}), {delay:.2f}초 후")
+        await asyncio.sleep(delay)
@@ -0,0 +1,64 @@
+import argparse
+import re
+import subprocess
+import sys
+
+# app.main import 시점에 불러오면 안 되는 무거운 모듈 (lifespan 시작 시 또는 첫 사용 시 로드)
+DEFERRED_MODULES = (
+    "langchain_openai",
+    "langgraph",
+    "fitz",
+    "firebase_admin",
+    "google.cloud.firestore_v1",
+)
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module: str) -> tuple[float, set[str]]:
+    """새 인터프리터에서 module 을 import 하고 (누적 import 시간(초), 불러온 최상위 모듈 이름) 반환"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{result.stderr[-2000:]}")
+
+    cumulative_us = 0
+    loaded = set()
+    for line in result.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        name = match.group(4)
+        loaded.add(name)
+        if name == module:
+            cumulative_us = int(match.group(2))
+    return cumulative_us / 1_000_000, loaded
+
+
+def check(module: str, budget_seconds: float) -> list[str]:
+    """예산 초과/지연 로드 대상 모듈의 조기 import 를 문제 목록으로 반환"""
+    seconds, loaded = measure(module)
+    problems = []
+    print(f"{module} import: {seconds:.3f}s (예산 {budget_seconds:.3f}s)")
+    if seconds > budget_seconds:
+        problems.append(f"import 시간 {seconds:.3f}s 가 예산 {budget_seconds:.3f}s 를 넘었습니다")
+    for deferred in DEFERRED_MODULES:
+        if deferred in loaded:
+            problems.append(f"{deferred} 가 import 시점에 로드됩니다 (lifespan/첫 사용 시점으로 미뤄야 함)")
+    return problems
+
+
+if __name__ == "__main__":
+    # python -m app.utils.import_budget [--module app.main] [--budget 2.0]
+    parser = argparse.ArgumentParser(description="시작(import) 시간 예산 확인")
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--budget", type=float, default=2.0, help="허용 import 시간(초)")
+    args = parser.parse_args()
+
+    problems = check(args.module, args.budget)
+    for problem in problems:
+        print(f"- {problem}")
+    sys.exit(1 if problems else 0)
@@ -0,0 +1,43 @@
+import threading
+from typing import Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class Lazy(Generic[T]):
+    """처음 사용할 때 한 번만 생성되는 무거운 객체 (스레드 안전)
+
+    import 시점에는 아무것도 만들지 않고, lifespan 시작 시 get() 으로 미리 만들거나
+    첫 요청에서 만든다. 생성에 실패하면 에러를 기록해 두고 다음 get() 에서 다시 시도한다.
+    """
+
+    def __init__(self, name: str, factory: Callable[[], T]):
+        self.name = name
+        self._factory = factory
+        self._value: Optional[T] = None
+        self._ready = False
+        self._lock = threading.Lock()
+        self.error: Optional[BaseException] = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready
+
+    def get(self) -> T:
+        if self._ready:
+            return self._value
+        with self._lock:
+            if not self._ready:
+                try:
+                    self._value = self._factory()
+                except Exception as e:
+                    self.error = e
+                    raise
+                self.error = None
+                self._ready = True
+        return self._value
+
+    def status(self) -> dict:
+        if self._ready:
+            return {"ready": True}
+        return {"ready": False, "error": str(self.error) if self.error else None}
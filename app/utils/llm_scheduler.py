@@ -0,0 +1,246 @@
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Callable, Optional
+
+from app.config import Global
+from app.utils.logger import logger
+from app.utils.metrics import LLM_SCHEDULER_QUEUE_DEPTH, LLM_SCHEDULER_WAIT
+
+
+class Priority(IntEnum):
+    """대기열 우선순위 (값이 작을수록 먼저 실행)"""
+    INTERACTIVE = 0
+    BULK = 1
+
+
+# 현재 요청이 어느 우선순위 레인으로 들어갈지 (None 이면 입력 크기로 결정)
+_lane: ContextVar[Optional[Priority]] = ContextVar("llm_lane", default=None)
+
+
+@contextmanager
+def llm_lane(priority: Priority):
+    """블록 안에서 시작된 LLM 호출의 우선순위 지정 (긴 문서, PDF 등 일괄 작업용)"""
+    token = _lane.set(priority)
+    try:
+        yield
+    finally:
+        _lane.reset(token)
+
+
+class SchedulerOverloaded(Exception):
+    """대기열이 가득 차 요청을 받을 수 없음"""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"번역 요청이 많습니다. {retry_after}초 후 다시 시도해주세요.")
+        self.retry_after = retry_after
+
+
+class TokenBucket:
+    """분당 허용량 기반 토큰 버킷 (예약 방식: 부족분만큼 기다린 뒤 사용)"""
+
+    def __init__(self, per_minute: int, clock: Callable[[], float] = time.monotonic):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self._clock = clock
+        self._tokens = self.capacity
+        self._updated = clock()
+
+    def reserve(self, amount: float) -> float:
+        """amount 만큼 차감하고 사용 가능해질 때까지 기다려야 할 초를 반환"""
+        now = self._clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        # 버킷보다 큰 요청은 가득 찬 버킷 하나로 취급 (영원히 기다리지 않도록)
+        self._tokens -= min(amount, self.capacity)
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def refund(self, amount: float) -> None:
+        """예약했지만 쓰지 않은 만큼 되돌림 (거절/취소된 요청)"""
+        self._tokens = min(self.capacity, self._tokens + min(amount, self.capacity))
+
+
+class LLMScheduler:
+    """LLM 호출 동시 실행 수/분당 요청·토큰 수 제한과 우선순위 대기열"""
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        max_queue: int,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        interactive_max_tokens: int = 0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_concurrency = max(1, max_concurrency)
+        self.max_queue = max(0, max_queue)
+        self.interactive_max_tokens = interactive_max_tokens
+        self._clock = clock
+        # 0 이면 해당 제한을 사용하지 않음
+        self._rpm = TokenBucket(requests_per_minute, clock) if requests_per_minute > 0 else None
+        self._tpm = TokenBucket(tokens_per_minute, clock) if tokens_per_minute > 0 else None
+
+        self._running = 0
+        # 속도 제한으로 실행 자리 없이 기다리는 요청 수
+        self._throttled = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+        # 통계
+        self.admitted = 0
+        self.rejected = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.service_seconds_total = 0.0
+        self.completed = 0
+
+    @classmethod
+    def from_env(cls) -> "LLMScheduler":
+        env = Global.env
+        logger.info(
+            f"LLM 스케줄러 초기화 - 동시 실행: {env.LLM_MAX_CONCURRENCY}, "
+            f"대기열: {env.LLM_MAX_QUEUE}, RPM: {env.LLM_REQUESTS_PER_MINUTE}, TPM: {env.LLM_TOKENS_PER_MINUTE}"
+        )
+        scheduler = cls(
+            max_concurrency=env.LLM_MAX_CONCURRENCY,
+            max_queue=env.LLM_MAX_QUEUE,
+            requests_per_minute=env.LLM_REQUESTS_PER_MINUTE,
+            tokens_per_minute=env.LLM_TOKENS_PER_MINUTE,
+            interactive_max_tokens=env.LLM_INTERACTIVE_MAX_TOKENS,
+        )
+        LLM_SCHEDULER_QUEUE_DEPTH.set_function(
+            lambda: {(lane,): depth for lane, depth in scheduler.stats()["queue_depth_by_lane"].items()}
+        )
+        return scheduler
+
+    def priority_for(self, content_tokens: int) -> Priority:
+        """지정된 레인이 없으면 사용자 입력 크기(시스템 프롬프트 제외)로 우선순위 결정"""
+        lane = _lane.get()
+        if lane is not None:
+            return lane
+        return Priority.INTERACTIVE if content_tokens <= self.interactive_max_tokens else Priority.BULK
+
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, future in self._waiters if not future.done())
+
+    def _backlog(self) -> int:
+        """실행 자리를 기다리는 요청 + 속도 제한으로 기다리는 요청"""
+        return self.queue_depth() + self._throttled
+
+    def retry_after(self) -> int:
+        """대기열이 빠질 때까지 걸릴 시간 추정 (초, 최소 1)"""
+        average = self.service_seconds_total / self.completed if self.completed else 1.0
+        return max(1, math.ceil(average * (self._backlog() + 1) / self.max_concurrency))
+
+    def check_capacity(self) -> None:
+        """대기열이 가득 찼으면 SchedulerOverloaded (응답 시작 전 확인용)"""
+        if self._running >= self.max_concurrency and self._backlog() >= self.max_queue:
+            self.rejected += 1
+            raise SchedulerOverloaded(self.retry_after())
+
+    async def _acquire(self, priority: Priority) -> None:
+        if self._running < self.max_concurrency and not self.queue_depth():
+            self._running += 1
+            return
+
+        self.check_capacity()
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), future))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # 자리를 넘겨받은 직후 취소됐다면 다음 대기자에게 양보
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        # 취소된 대기자는 건너뛰고 우선순위가 가장 높은 대기자에게 자리를 넘김
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(None)
+                return
+        self._running -= 1
+
+    def _reserve(self, tokens: int) -> float:
+        delay = 0.0
+        if self._rpm is not None:
+            delay = max(delay, self._rpm.reserve(1))
+        if self._tpm is not None:
+            delay = max(delay, self._tpm.reserve(tokens))
+        return delay
+
+    def _refund(self, tokens: int) -> None:
+        if self._rpm is not None:
+            self._rpm.refund(1)
+        if self._tpm is not None:
+            self._tpm.refund(tokens)
+
+    async def _throttle(self, delay: float) -> None:
+        # 실행 자리를 잡기 전에 기다려서, 속도 제한 대기 중에도 다른 요청이 자리를 쓸 수 있게 함
+        logger.debug(f"LLM 호출 속도 제한 대기 - {delay:.2f}초")
+        self._throttled += 1
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            self._throttled -= 1
+
+    @asynccontextmanager
+    async def slot(self, tokens: int = 0, priority: Optional[Priority] = None):
+        """실행 자리를 얻은 뒤 블록을 실행 (자리를 얻을 때까지 우선순위 순으로 대기)
+
+        분당 요청/토큰 한도는 자리를 잡기 전에 예약하고 기다린다. priority 가 없으면
+        tokens 로 분류하므로, 시스템 프롬프트를 뺀 크기로 분류하려면 priority_for 결과를 넘긴다.
+        """
+        priority = self.priority_for(tokens) if priority is None else priority
+        queued_at = self._clock()
+        started_at = None
+
+        # 어차피 거절될 요청은 한도를 예약하지 않음
+        self.check_capacity()
+        delay = self._reserve(tokens)
+        try:
+            if delay > 0:
+                await self._throttle(delay)
+            await self._acquire(priority)
+        except (SchedulerOverloaded, asyncio.CancelledError):
+            self._refund(tokens)
+            raise
+        try:
+            started_at = self._clock()
+            waited = started_at - queued_at
+            self.admitted += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            LLM_SCHEDULER_WAIT.labels(priority.name.lower()).observe(waited)
+
+            yield
+        finally:
+            if started_at is not None:
+                self.completed += 1
+                self.service_seconds_total += self._clock() - started_at
+            self._release()
+
+    def stats(self) -> dict:
+        lanes = {lane.name.lower(): 0 for lane in Priority}
+        for priority, _, future in self._waiters:
+            if not future.done():
+                lanes[Priority(priority).name.lower()] += 1
+        return {
+            "running": self._running,
+            "max_concurrency": self.max_concurrency,
+            "queue_depth": sum(lanes.values()),
+            "queue_depth_by_lane": lanes,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "wait_seconds_avg": self.wait_seconds_total / self.admitted if self.admitted else 0.0,
+            "wait_seconds_max": self.wait_seconds_max,
+        }
@@ -0,0 +1,346 @@
+import argparse
+import base64
+import bisect
+import gzip
+import hashlib
+import io
+import json
+import logging
+import logging.handlers
+import math
+import os
+import shutil
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, Optional
+
+INDEX_SUFFIX = ".idx.json"
+COMPRESSED_SUFFIXES = (".gz", ".zst")
+# 블룸 필터 크기 추정용: request_id 하나가 조각에서 차지하는 평균 바이트 (요청당 여러 줄)
+BYTES_PER_REQUEST_ID = 1024
+DEFAULT_BLOOM_CAPACITY = 100_000
+
+# 회전된 조각 압축 전용 스레드 (로그 기록 스레드를 막지 않도록 분리)
+_compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-compress")
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ImportError:
+        return None
+    return zstandard
+
+
+class BloomFilter:
+    """request_id 포함 여부 확인용 블룸 필터 (거짓 양성만 있고 거짓 음성은 없음)"""
+
+    def __init__(self, bits: int, hashes: int, data: Optional[bytearray] = None):
+        self.bits = bits
+        self.hashes = hashes
+        self.data = data if data is not None else bytearray((bits + 7) // 8)
+
+    @classmethod
+    def for_capacity(cls, capacity: int, error_rate: float = 0.01) -> "BloomFilter":
+        # m = -n ln p / (ln 2)^2, k = m/n ln 2
+        bits = max(64, int(-capacity * math.log(error_rate) / (0.6931 ** 2)))
+        hashes = max(1, round(bits / capacity * 0.6931))
+        return cls(bits, hashes)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % self.bits
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self.data[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        return all(self.data[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+    def to_dict(self) -> dict:
+        return {"bits": self.bits, "hashes": self.hashes, "data": base64.b64encode(bytes(self.data)).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, value: dict) -> "BloomFilter":
+        return cls(value["bits"], value["hashes"], bytearray(base64.b64decode(value["data"])))
+
+
+def _compress(path: str, method: str) -> None:
+    """회전된 조각을 압축하고 원본을 삭제 (백그라운드 스레드에서 실행)"""
+    zstandard = _zstd() if method == "zstd" else None
+    try:
+        if zstandard is not None:
+            with open(path, "rb") as src, open(path + ".zst", "wb") as dst:
+                zstandard.ZstdCompressor().copy_stream(src, dst)
+        else:
+            with open(path, "rb") as src, gzip.open(path + ".gz", "wb") as dst:
+                shutil.copyfileobj(src, dst)
+        os.remove(path)
+    except OSError as e:
+        sys.stderr.write(f"로그 조각 압축 실패 ({path}): {e}\n")
+
+
+def _segment_file(segment: Path) -> Optional[Path]:
+    """조각의 실제 파일 (압축 전/후 어느 쪽이든)"""
+    for suffix in ("",) + COMPRESSED_SUFFIXES:
+        candidate = segment.with_name(segment.name + suffix)
+        if candidate.exists():
+            return candidate
+    return None
+
+
+class SizeAndTimeRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """크기 또는 날짜가 바뀌면 회전하고, 회전된 조각은 압축 + 색인 파일 생성
+
+    조각 이름은 "<파일>.<YYYYmmdd-HHMMSS>" 이며 옆에 "<조각>.idx.json" 에
+    기록 시간 범위와 request_id 블룸 필터를 저장한다.
+    """
+
+    def __init__(
+        self,
+        filename,
+        max_bytes: int,
+        daily: bool = True,
+        compression: str = "gzip",
+        retention_days: int = 14,
+        max_segments: int = 50,
+        bloom_capacity: Optional[int] = None,
+        encoding: str = "utf-8",
+    ):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=0, encoding=encoding)
+        if compression == "zstd" and _zstd() is None:
+            # 로거 자신이 기록하는 핸들러라 logger 대신 stderr 로 알림
+            sys.stderr.write("zstandard 패키지가 없어 로그 조각을 gzip 으로 압축합니다\n")
+            compression = "gzip"
+        self.daily = daily
+        self.compression = compression
+        self.retention_days = retention_days
+        self.max_segments = max_segments
+        # 조각 하나에 들어갈 수 있는 request_id 수에 맞춰 블룸 필터 크기 결정 (크기 제한이 없으면 기본값)
+        if bloom_capacity is None:
+            bloom_capacity = max(1000, max_bytes // BYTES_PER_REQUEST_ID) if max_bytes > 0 else DEFAULT_BLOOM_CAPACITY
+        self.bloom_capacity = bloom_capacity
+        # 회전된 조각 (기록 종료 시각, 조각) 목록 - 시작 시 한 번만 색인을 읽고 이후에는 메모리에서 관리
+        self._segments_lock = threading.Lock()
+        self._segments: list[tuple[float, Path]] = sorted(
+            ((_index_end(segment), segment) for segment in list_segments(self.baseFilename)),
+            key=lambda item: item[0],
+        )
+        self._reset_index(existing=os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0)
+
+    def _reset_index(self, existing: bool = False) -> None:
+        now = time.time()
+        self._started = os.path.getmtime(self.baseFilename) if existing else now
+        self._first: Optional[float] = None
+        self._last: Optional[float] = None
+        self._bloom = BloomFilter.for_capacity(self.bloom_capacity)
+        # 재시작 전에 쓰인 내용은 블룸 필터에 없으므로 색인을 신뢰할 수 없음
+        self._complete = not existing
+        self._day = datetime.fromtimestamp(self._started).date()
+
+    def shouldRollover(self, record) -> bool:
+        return self._should_rollover(record, self.format(record))
+
+    def _should_rollover(self, record, msg: str) -> bool:
+        if self.daily:
+            day = datetime.fromtimestamp(record.created).date()
+            if day != self._day:
+                if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+                    return True
+                # 빈 파일이면 회전하지 않고 날짜만 갱신
+                self._day = day
+
+        if self.maxBytes <= 0:
+            return False
+        if os.path.exists(self.baseFilename) and not os.path.isfile(self.baseFilename):
+            return False
+        if self.stream is None:
+            self.stream = self._open()
+        self.stream.seek(0, 2)
+        # 파일 위치는 바이트 단위이므로 인코딩한 길이로 비교 (ASCII 면 글자 수와 같음)
+        size = len(msg) if msg.isascii() else len(msg.encode(self.encoding or "utf-8"))
+        return self.stream.tell() + size + len(self.terminator) >= self.maxBytes
+
+    def emit(self, record) -> None:
+        try:
+            # 크기 확인과 기록에 같은 문자열을 사용 (레코드당 format 한 번)
+            msg = self.format(record)
+            if self._should_rollover(record, msg):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(msg + self.terminator)
+            self.flush()
+        except Exception:
+            self.handleError(record)
+            return
+
+        if self._first is None:
+            self._first = record.created
+        self._last = record.created
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            self._bloom.add(str(request_id))
+
+    def _segment_name(self) -> str:
+        stamp = datetime.fromtimestamp(self._first or self._started).strftime("%Y%m%d-%H%M%S")
+        name = f"{self.baseFilename}.{stamp}"
+        counter = 1
+        while _segment_file(Path(name)) is not None:
+            name = f"{self.baseFilename}.{stamp}-{counter}"
+            counter += 1
+        return name
+
+    def doRollover(self) -> None:
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        if os.path.exists(self.baseFilename) and os.path.getsize(self.baseFilename) > 0:
+            segment = self._segment_name()
+            os.rename(self.baseFilename, segment)
+            end = self._write_index(segment)
+            with self._segments_lock:
+                bisect.insort(self._segments, (end, Path(segment)), key=lambda item: item[0])
+            if self.compression in ("gzip", "zstd"):
+                # 압축이 끝난 뒤 같은 스레드에서 보관 정책 적용 (압축 중인 조각을 지우지 않도록)
+                _compressor.submit(self._compress_and_retain, segment)
+            else:
+                self._apply_retention()
+
+        self._reset_index()
+        if not self.delay:
+            self.stream = self._open()
+
+    def _compress_and_retain(self, segment: str) -> None:
+        _compress(segment, self.compression)
+        try:
+            self._apply_retention()
+        except OSError as e:
+            sys.stderr.write(f"로그 조각 정리 실패: {e}\n")
+
+    def _write_index(self, segment: str) -> float:
+        """색인 파일을 쓰고 기록 종료 시각을 반환"""
+        # 재시작 전 내용이 섞인 조각은 시작 시각을 알 수 없으므로 0 (시간 조건으로 제외되지 않음)
+        start = self._first if self._first is not None else self._started
+        index = {
+            "start": start if self._complete else 0,
+            "end": self._last if self._last is not None else time.time(),
+            "bloom": self._bloom.to_dict() if self._complete else None,
+        }
+        with open(segment + INDEX_SUFFIX, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        return index["end"]
+
+    def _apply_retention(self) -> None:
+        """개수/기간을 넘은 오래된 조각과 색인 삭제"""
+        # 같은 초에 회전된 조각은 이름 정렬이 시간 순서와 다를 수 있어 기록 종료 시각 순으로 유지
+        with self._segments_lock:
+            count = len(self._segments) - self.max_segments if self.max_segments > 0 else 0
+            count = max(0, count)
+            if self.retention_days > 0:
+                cutoff = time.time() - self.retention_days * 86400
+                while count < len(self._segments) and self._segments[count][0] < cutoff:
+                    count += 1
+            expired = [segment for _, segment in self._segments[:count]]
+            del self._segments[:count]
+
+        for segment in expired:
+            for path in (_segment_file(segment), segment.with_name(segment.name + INDEX_SUFFIX)):
+                if path is not None and path.exists():
+                    path.unlink()
+
+
+def _index_end(segment: Path) -> float:
+    try:
+        with open(segment.with_name(segment.name + INDEX_SUFFIX), encoding="utf-8") as f:
+            return json.load(f)["end"]
+    except (OSError, ValueError, KeyError):
+        return _segment_mtime(segment)
+
+
+def _segment_mtime(segment: Path) -> float:
+    path = _segment_file(segment)
+    return path.stat().st_mtime if path is not None else 0.0
+
+
+def list_segments(base_filename) -> list[Path]:
+    """회전된 조각 목록 (압축 확장자/색인 파일을 뗀 조각 이름)"""
+    base = Path(base_filename)
+    names = set()
+    for path in base.parent.glob(base.name + ".*"):
+        name = path.name
+        if name.endswith(INDEX_SUFFIX):
+            name = name[:-len(INDEX_SUFFIX)]
+        for suffix in COMPRESSED_SUFFIXES:
+            if name.endswith(suffix):
+                name = name[:-len(suffix)]
+        names.add(name)
+    return [base.with_name(name) for name in sorted(names)]
+
+
+def candidate_segments(base_filename, request_id: str, since: float = None, until: float = None) -> list[Path]:
+    """request_id 가 들어 있을 수 있는 조각 파일만 반환 (색인이 없으면 포함)"""
+    candidates = []
+    for segment in list_segments(base_filename):
+        path = _segment_file(segment)
+        if path is None:
+            continue
+        try:
+            with open(segment.with_name(segment.name + INDEX_SUFFIX), encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            candidates.append(path)
+            continue
+
+        if since is not None and index["end"] < since:
+            continue
+        if until is not None and index["start"] > until:
+            continue
+        if index.get("bloom") is not None and request_id not in BloomFilter.from_dict(index["bloom"]):
+            continue
+        candidates.append(path)
+
+    # 아직 회전되지 않은 현재 파일은 항상 확인
+    if Path(base_filename).exists():
+        candidates.append(Path(base_filename))
+    return candidates
+
+
+def _open_text(path: Path):
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8", errors="replace")
+    if path.suffix == ".zst":
+        zstandard = _zstd()
+        if zstandard is None:
+            raise RuntimeError(f"zstandard 패키지가 없어 {path} 를 열 수 없습니다")
+        return io.TextIOWrapper(zstandard.ZstdDecompressor().stream_reader(open(path, "rb")), encoding="utf-8", errors="replace")
+    return open(path, encoding="utf-8", errors="replace")
+
+
+def find_request(base_filename, request_id: str, since: float = None, until: float = None) -> Iterator[str]:
+    """request_id 가 포함된 로그 줄을 후보 조각에서만 찾아 반환"""
+    for path in candidate_segments(base_filename, request_id, since, until):
+        with _open_text(path) as f:
+            for line in f:
+                if request_id in line:
+                    yield line.rstrip("\n")
+
+
+if __name__ == "__main__":
+    # python -m app.utils.log_rotation <request_id> [--file logs/easy_translate.json]
+    parser = argparse.ArgumentParser(description="request_id 로 로그 조각 검색")
+    parser.add_argument("request_id")
+    parser.add_argument("--file", default="logs/easy_translate.json", help="검색할 로그 파일 (회전 전 이름)")
+    args = parser.parse_args()
+
+    for line in find_request(args.file, args.request_id):
+        print(line)
@@ -1,11 +1,22 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
 import os
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import json
+from contextvars import ContextVar
 from pathlib import Path
 
+from app.config import Global
+from app.utils.log_rotation import SizeAndTimeRotatingFileHandler
+from app.utils.metrics import LOG_RECORDS_DROPPED
+
+# 현재 요청의 request_id (RequestIDMiddleware 가 설정, 로그에 자동으로 포함)
+current_request_id: ContextVar[Optional[str]] = ContextVar("current_request_id", default=None)
+
 class CustomFormatter(logging.Formatter):
     """색상과 함께 로그를 포맷하는 커스텀 포맷터"""
     
@@ -19,23 +30,41 @@ class CustomFormatter(logging.Formatter):
         'RESET': '\033[0m'      # 리셋
     }
     
+    def __init__(self):
+        super().__init__()
+        # (레벨, 컨텍스트 종류) 조합별 Formatter 캐시 - 레코드마다 새로 만들지 않도록
+        self._formatters: Dict[tuple, logging.Formatter] = {}
+
+    def _formatter_for(self, levelname: str, context: str) -> logging.Formatter:
+        key = (levelname, context)
+        formatter = self._formatters.get(key)
+        if formatter is None:
+            # 로그 레벨에 따른 색상 적용
+            color = self.COLORS.get(levelname, self.COLORS['RESET'])
+            reset = self.COLORS['RESET']
+
+            # 기본 포맷 설정
+            log_format = f"{color}[%(asctime)s] %(levelname)s{reset} - %(name)s - %(message)s"
+
+            # 추가 정보가 있으면 포함
+            if context == 'user_id':
+                log_format = f"{color}[%(asctime)s] %(levelname)s{reset} - %(name)s - [User: %(user_id)s] - %(message)s"
+
+            if context == 'request_id':
+                log_format = f"{color}[%(asctime)s] %(levelname)s{reset} - %(name)s - [ReqID: %(request_id)s] - %(message)s"
+
+            formatter = logging.Formatter(log_format, datefmt='%Y-%m-%d %H:%M:%S')
+            self._formatters[key] = formatter
+        return formatter
+
     def format(self, record):
-        # 로그 레벨에 따른 색상 적용
-        color = self.COLORS.get(record.levelname, self.COLORS['RESET'])
-        reset = self.COLORS['RESET']
-        
-        # 기본 포맷 설정
-        log_format = f"{color}[%(asctime)s] %(levelname)s{reset} - %(name)s - %(message)s"
-        
-        # 추가 정보가 있으면 포함
+        # request_id 가 있으면 user_id 보다 우선
+        context = ''
         if hasattr(record, 'user_id'):
-            log_format = f"{color}[%(asctime)s] %(levelname)s{reset} - %(name)s - [User: %(user_id)s] - %(message)s"
-        
+            context = 'user_id'
         if hasattr(record, 'request_id'):
-            log_format = f"{color}[%(asctime)s] %(levelname)s{reset} - %(name)s - [ReqID: %(request_id)s] - %(message)s"
-            
-        formatter = logging.Formatter(log_format, datefmt='%Y-%m-%d %H:%M:%S')
-        return formatter.format(record)
+            context = 'request_id'
+        return self._formatter_for(record.levelname, context).format(record)
 
 class JSONFormatter(logging.Formatter):
     """구조화된 JSON 로그 포맷터"""
@@ -63,12 +92,40 @@ class JSONFormatter(logging.Formatter):
             
         return json.dumps(log_entry, ensure_ascii=False)
 
+class DropCountingQueueHandler(logging.handlers.QueueHandler):
+    """큐가 가득 차면 기다리지 않고 레코드를 버린 뒤 개수만 셈"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record):
+        # 포맷은 리스너 스레드의 핸들러가 하도록 레코드를 그대로 넘김
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_RECORDS_DROPPED.inc()
+
+
+def _stream_closed(handler: logging.Handler) -> bool:
+    """스트림이 이미 닫힌 핸들러인지 (인터프리터 종료 중 stdout 이 먼저 닫힌 경우 등)"""
+    stream = getattr(handler, "stream", None)
+    return stream is not None and getattr(stream, "closed", False)
+
+
 class EasyTranslateLogger:
     """쉬운말 번역 서비스 전용 로거"""
     
     def __init__(self, name: str = "easy_translate"):
         self.logger = logging.getLogger(name)
         self.logger.setLevel(logging.INFO)
+        self._handlers: list[logging.Handler] = []
+        self._queue_handler: Optional[DropCountingQueueHandler] = None
+        self._listener: Optional[logging.handlers.QueueListener] = None
         
         # 중복 핸들러 방지
         if not self.logger.handlers:
@@ -84,34 +141,82 @@ class EasyTranslateLogger:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
         console_handler.setFormatter(CustomFormatter())
-        self.logger.addHandler(console_handler)
+        self._handlers.append(console_handler)
         
         # 2. 파일 핸들러 (일반 로그)
-        file_handler = logging.FileHandler(
-            log_dir / "easy_translate.log",
-            encoding='utf-8'
-        )
+        file_handler = self._file_handler(log_dir / "easy_translate.log")
         file_handler.setLevel(logging.INFO)
         file_handler.setFormatter(CustomFormatter())
-        self.logger.addHandler(file_handler)
+        self._handlers.append(file_handler)
         
         # 3. JSON 파일 핸들러 (구조화된 로그)
-        json_handler = logging.FileHandler(
-            log_dir / "easy_translate.json",
-            encoding='utf-8'
-        )
+        json_handler = self._file_handler(log_dir / "easy_translate.json")
         json_handler.setLevel(logging.INFO)
         json_handler.setFormatter(JSONFormatter())
-        self.logger.addHandler(json_handler)
+        self._handlers.append(json_handler)
         
         # 4. 에러 전용 핸들러
-        error_handler = logging.FileHandler(
-            log_dir / "errors.log",
-            encoding='utf-8'
-        )
+        error_handler = self._file_handler(log_dir / "errors.log")
         error_handler.setLevel(logging.ERROR)
         error_handler.setFormatter(CustomFormatter())
-        self.logger.addHandler(error_handler)
+        self._handlers.append(error_handler)
+
+        if not Global.env.LOG_ASYNC:
+            for handler in self._handlers:
+                self.logger.addHandler(handler)
+            return
+
+        # 요청 경로에서는 큐에 넣기만 하고, 포맷/파일 쓰기는 리스너 스레드에서 처리
+        log_queue: queue.Queue = queue.Queue(maxsize=Global.env.LOG_QUEUE_SIZE)
+        self._queue_handler = DropCountingQueueHandler(log_queue)
+        self._listener = logging.handlers.QueueListener(
+            log_queue, *self._handlers, respect_handler_level=True
+        )
+        self.logger.addHandler(self._queue_handler)
+        self._listener.start()
+        atexit.register(self.shutdown)
+
+    @staticmethod
+    def _file_handler(path: Path) -> logging.Handler:
+        """크기/날짜 기준으로 회전하고 지난 조각은 압축·보관 기간 관리"""
+        env = Global.env
+        return SizeAndTimeRotatingFileHandler(
+            path,
+            max_bytes=env.LOG_MAX_BYTES,
+            daily=env.LOG_ROTATE_DAILY,
+            compression=env.LOG_COMPRESSION,
+            retention_days=env.LOG_RETENTION_DAYS,
+            max_segments=env.LOG_MAX_SEGMENTS,
+            encoding='utf-8'
+        )
+
+    @property
+    def dropped(self) -> int:
+        """큐가 가득 차서 버려진 로그 수"""
+        return self._queue_handler.dropped if self._queue_handler else 0
+
+    def shutdown(self):
+        """큐에 남은 로그를 모두 기록하고 이후 로그는 동기 핸들러로 기록 (종료 시)
+
+        lifespan 종료 시 호출되며, 호출되지 않은 경우(스크립트, 테스트 등)에만 atexit 에서 실행된다.
+        여러 번 호출해도 한 번만 처리하고, 이미 닫힌 스트림의 핸들러는 건너뛴다.
+        """
+        if self._listener is None:
+            return
+        listener, self._listener = self._listener, None
+        atexit.unregister(self.shutdown)
+
+        handlers = [handler for handler in self._handlers if not _stream_closed(handler)]
+        listener.handlers = tuple(handlers)
+        listener.stop()
+
+        self.logger.removeHandler(self._queue_handler)
+        for handler in handlers:
+            self.logger.addHandler(handler)
+        if self._queue_handler.dropped:
+            self.warning(f"로그 큐 초과로 버려진 로그: {self._queue_handler.dropped}개")
+        for handler in handlers:
+            handler.flush()
     
     def info(self, message: str, **kwargs):
         """일반 정보 로그"""
@@ -137,9 +242,10 @@ class EasyTranslateLogger:
         if 'user_id' in kwargs:
             extra['user_id'] = kwargs.pop('user_id')
         
-        # 요청 ID 추가
-        if 'request_id' in kwargs:
-            extra['request_id'] = kwargs.pop('request_id')
+        # 요청 ID 추가 (명시하지 않았거나 None 이면 현재 요청 컨텍스트에서 가져옴)
+        request_id = kwargs.pop('request_id', None) or current_request_id.get()
+        if request_id:
+            extra['request_id'] = request_id
         
         # 번역 통계 추가
         if 'translation_stats' in kwargs:
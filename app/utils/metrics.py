@@ -0,0 +1,408 @@
+import bisect
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from app.config import Global
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = Tuple[str, ...]
+
+
+class _Child:
+    """라벨 조합 하나의 값 (스레드별 shard 에 기록해 락 없이 갱신)
+
+    각 스레드는 자기 shard 만 수정하므로 기록 시 경쟁이 없고, 수집할 때만 shard 를 합산한다.
+    """
+
+    __slots__ = ("_size", "_shards")
+
+    def __init__(self, size: int):
+        self._size = size
+        self._shards: Dict[int, list] = {}
+
+    def _shard(self) -> list:
+        ident = threading.get_ident()
+        shard = self._shards.get(ident)
+        if shard is None:
+            shard = self._shards[ident] = [0.0] * self._size
+        return shard
+
+    def values(self) -> list:
+        total = [0.0] * self._size
+        for shard in list(self._shards.values()):
+            for i, value in enumerate(shard):
+                total[i] += value
+        return total
+
+
+class CounterChild(_Child):
+    def __init__(self):
+        super().__init__(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._shard()[0] += amount
+
+
+class GaugeChild(_Child):
+    def __init__(self):
+        super().__init__(1)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._shard()[0] += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._shard()[0] -= amount
+
+
+class HistogramChild(_Child):
+    """버킷별 개수 + 합계 + 개수 (버킷 개수는 수집 시 누적으로 변환)"""
+
+    __slots__ = ("_buckets",)
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        super().__init__(len(buckets) + 3)
+        self._buckets = buckets
+
+    def observe(self, value: float) -> None:
+        shard = self._shard()
+        shard[bisect.bisect_left(self._buckets, value)] += 1
+        shard[-2] += value
+        shard[-1] += 1
+
+    def time(self):
+        return _Timer(self)
+
+
+class _Timer:
+    def __init__(self, child: HistogramChild):
+        self._child = child
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._child.observe(time.perf_counter() - self._start)
+
+
+class Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[LabelValues, _Child] = {}
+        if not self.labelnames:
+            self._default = self.labels()
+
+    def _new_child(self) -> _Child:
+        raise NotImplementedError
+
+    def labels(self, *values, **kwargs):
+        if kwargs:
+            values = tuple(str(kwargs[name]) for name in self.labelnames)
+        else:
+            values = tuple(str(value) for value in values)
+        child = self._children.get(values)
+        if child is None:
+            child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def samples(self) -> Dict[LabelValues, list]:
+        return {values: child.values() for values, child in list(self._children.items())}
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def _new_child(self) -> CounterChild:
+        return CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+
+class Gauge(Metric):
+    """inc/dec 게이지 또는 수집 시 함수로 값을 구하는 게이지
+
+    aggregate 는 멀티프로세스 모드에서 워커별 값을 합치는 방법 ("sum" | "max" | "avg").
+    """
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), aggregate: str = "sum"):
+        super().__init__(name, documentation, labelnames)
+        self.aggregate = aggregate
+        self._function: Optional[Callable[[], Dict[LabelValues, float]]] = None
+
+    def _new_child(self) -> GaugeChild:
+        return GaugeChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+    def set_function(self, fn: Callable[[], object]) -> None:
+        """fn 은 숫자(라벨 없음) 또는 {라벨 값 tuple: 숫자} 를 반환"""
+        self._function = fn
+
+    def samples(self) -> Dict[LabelValues, list]:
+        if self._function is None:
+            return super().samples()
+        try:
+            value = self._function()
+        except Exception:
+            return {}
+        if isinstance(value, dict):
+            return {tuple(str(v) for v in key): [float(v)] for key, v in value.items()}
+        return {(): [float(value)]}
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self) -> HistogramChild:
+        return HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def time(self):
+        return self._default.time()
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Tuple[str, ...], values: LabelValues, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    pairs = list(zip(names, values)) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name: str, documentation: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Iterable[str] = (), aggregate: str = "sum") -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames, aggregate))
+
+    def histogram(self, name: str, documentation: str, labelnames: Iterable[str] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def snapshot(self) -> dict:
+        """현재 프로세스의 값 (멀티프로세스 파일 저장/합산용)"""
+        return {
+            name: {
+                "kind": metric.kind,
+                "help": metric.documentation,
+                "labelnames": list(metric.labelnames),
+                "buckets": list(getattr(metric, "buckets", ())),
+                "aggregate": getattr(metric, "aggregate", "sum"),
+                "samples": [[list(values), sample] for values, sample in metric.samples().items()],
+            }
+            for name, metric in list(self._metrics.items())
+        }
+
+    def render(self, snapshot: Optional[dict] = None) -> str:
+        """Prometheus text exposition format (0.0.4)"""
+        snapshot = self.snapshot() if snapshot is None else snapshot
+        lines = []
+        for name, metric in sorted(snapshot.items()):
+            labelnames = tuple(metric["labelnames"])
+            lines.append(f"# HELP {name} {metric['help']}")
+            lines.append(f"# TYPE {name} {metric['kind']}")
+            for values, sample in sorted(metric["samples"], key=lambda item: item[0]):
+                values = tuple(values)
+                if metric["kind"] != "histogram":
+                    lines.append(f"{name}{_format_labels(labelnames, values)} {_format_value(sample[0])}")
+                    continue
+                cumulative = 0.0
+                for bound, count in zip(list(metric["buckets"]) + [math.inf], sample):
+                    cumulative += count
+                    labels = _format_labels(labelnames, values, (("le", _format_value(bound)),))
+                    lines.append(f"{name}_bucket{labels} {_format_value(cumulative)}")
+                lines.append(f"{name}_sum{_format_labels(labelnames, values)} {_format_value(sample[-2])}")
+                lines.append(f"{name}_count{_format_labels(labelnames, values)} {_format_value(sample[-1])}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+
+# ---- 멀티프로세스 모드 (uvicorn 워커 여러 개) ----
+# 각 워커가 METRICS_MULTIPROC_DIR/<pid>.json 에 주기적으로 자기 값을 쓰고,
+# /metrics 를 받은 워커가 모든 파일을 합산해 응답한다.
+
+def _alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def write_snapshot(directory: str) -> None:
+    path = Path(directory)
+    path.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(REGISTRY.snapshot(), f)
+    os.replace(tmp, path / f"{os.getpid()}.json")
+
+
+def merge_snapshots(directory: str) -> dict:
+    """워커별 파일 합산 (종료된 워커의 게이지는 제외, 카운터/히스토그램은 유지)"""
+    merged: dict = {}
+    gauge_counts: Dict[Tuple[str, LabelValues], int] = {}
+
+    for file in Path(directory).glob("*.json"):
+        try:
+            pid = int(file.stem)
+            with open(file, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except (ValueError, OSError):
+            continue
+        alive = _alive(pid)
+
+        for name, metric in snapshot.items():
+            if metric["kind"] == "gauge" and not alive:
+                continue
+            target = merged.setdefault(name, {**metric, "samples": {}})
+            for values, sample in metric["samples"]:
+                key = tuple(values)
+                current = target["samples"].get(key)
+                if current is None:
+                    target["samples"][key] = list(sample)
+                elif metric["kind"] == "gauge" and metric["aggregate"] == "max":
+                    target["samples"][key] = [max(current[0], sample[0])]
+                else:
+                    target["samples"][key] = [a + b for a, b in zip(current, sample)]
+                if metric["kind"] == "gauge":
+                    gauge_counts[(name, key)] = gauge_counts.get((name, key), 0) + 1
+
+    for name, metric in merged.items():
+        if metric["kind"] == "gauge" and metric["aggregate"] == "avg":
+            for key, sample in metric["samples"].items():
+                sample[0] /= gauge_counts[(name, key)]
+        metric["samples"] = [[list(key), sample] for key, sample in metric["samples"].items()]
+    return merged
+
+
+_flusher: Optional[threading.Thread] = None
+
+
+def start_multiprocess_flusher() -> None:
+    """멀티프로세스 모드면 자기 값을 주기적으로 파일에 기록하는 스레드 시작"""
+    global _flusher
+    directory = Global.env.METRICS_MULTIPROC_DIR
+    if not directory or _flusher is not None:
+        return
+
+    def flush_forever():
+        while True:
+            try:
+                write_snapshot(directory)
+            except OSError:
+                pass
+            time.sleep(Global.env.METRICS_FLUSH_SECONDS)
+
+    _flusher = threading.Thread(target=flush_forever, name="metrics-flush", daemon=True)
+    _flusher.start()
+
+
+def render_metrics() -> str:
+    directory = Global.env.METRICS_MULTIPROC_DIR
+    if not directory:
+        return REGISTRY.render()
+    write_snapshot(directory)
+    return REGISTRY.render(merge_snapshots(directory))
+
+
+# ---- 서비스 공통 지표 ----
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "route", "status")
+)
+SSE_STREAMS_IN_FLIGHT = REGISTRY.gauge(
+    "sse_streams_in_flight", "진행 중인 SSE 스트림 수", ("route",)
+)
+SSE_FRAMES = REGISTRY.counter(
+    "sse_frames_total", "전송한 SSE 이벤트 수", ("event",)
+)
+SSE_BYTES = REGISTRY.counter(
+    "sse_bytes_total", "전송한 SSE 바이트 수", ("event",)
+)
+LLM_CALL_DURATION = REGISTRY.histogram(
+    "llm_call_duration_seconds", "LLM 호출 전체 시간", ("mode",)
+)
+LLM_TIME_TO_FIRST_TOKEN = REGISTRY.histogram(
+    "llm_time_to_first_token_seconds", "스트리밍 LLM 첫 토큰까지 걸린 시간"
+)
+LLM_INPUT_TOKENS = REGISTRY.counter(
+    "llm_input_tokens_total", "LLM 입력 토큰 수 (프롬프트 캐시 적중 여부별)", ("model", "cache")
+)
+LLM_OUTPUT_TOKENS = REGISTRY.counter(
+    "llm_output_tokens_total", "LLM 출력 토큰 수", ("model",)
+)
+LLM_STREAM_CANCELLED = REGISTRY.counter(
+    "llm_stream_cancelled_total", "클라이언트 연결 종료로 취소된 스트리밍 LLM 호출 수"
+)
+LLM_TOKENS_SAVED = REGISTRY.counter(
+    "llm_stream_tokens_saved_total", "스트리밍 취소로 생성하지 않은 토큰 수 (추정)"
+)
+LLM_TOKENS_PER_SECOND = REGISTRY.histogram(
+    "llm_stream_tokens_per_second", "스트리밍 LLM 초당 토큰 수",
+    buckets=(1, 5, 10, 20, 40, 60, 80, 100, 150, 200, 400)
+)
+TRANSLATION_CHARS = REGISTRY.counter(
+    "translation_chars_total", "번역 입력/출력 글자 수", ("direction",)
+)
+TRANSLATION_CACHE_REQUESTS = REGISTRY.counter(
+    "translation_cache_requests_total", "번역 캐시 조회 수", ("result",)
+)
+TRANSLATION_CACHE_HIT_RATIO = REGISTRY.gauge(
+    "translation_cache_hit_ratio", "번역 캐시 적중률 (멀티프로세스 모드에서는 워커 평균)", aggregate="avg"
+)
+FIRESTORE_CALL_DURATION = REGISTRY.histogram(
+    "firestore_call_duration_seconds", "Firestore 호출 시간 (firebase_config 함수별)", ("function",)
+)
+LLM_SCHEDULER_QUEUE_DEPTH = REGISTRY.gauge(
+    "llm_scheduler_queue_depth", "LLM 스케줄러 대기열 길이", ("lane",)
+)
+LLM_SCHEDULER_WAIT = REGISTRY.histogram(
+    "llm_scheduler_wait_seconds", "LLM 스케줄러 대기 시간", ("lane",)
+)
+LOG_RECORDS_DROPPED = REGISTRY.counter(
+    "log_records_dropped_total", "로그 큐가 가득 차 기록하지 못하고 버린 로그 수"
+)
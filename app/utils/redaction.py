@@ -0,0 +1,112 @@
+import re
+from typing import Dict
+
+from app.utils.rulebook import scan_rulebook, value_span
+
+# LLM 에 보내기 전 개인정보를 대신할 자리표시자
+PLACEHOLDER_FORMAT = "[[PII_{index}]]"
+_PLACEHOLDER = re.compile(r"\[\[PII_\d+\]\]")
+# 스트리밍 청크 끝에 걸친 "미완성" 자리표시자 (예: "[[PI", "[[PII_1]")
+_PARTIAL_PLACEHOLDER = re.compile(r"\[(?:\[(?:P(?:I(?:I(?:_(?:\d+\]?)?)?)?)?)?)?$")
+
+
+class StreamRestorer:
+    """스트리밍 청크의 자리표시자를 원문으로 복원 (청크 경계에 걸친 경우 보류)"""
+
+    def __init__(self, redaction: "Redaction"):
+        self._redaction = redaction
+        self._buffer = ""
+
+    def feed(self, chunk: str) -> str:
+        self._buffer += chunk
+        partial = _PARTIAL_PLACEHOLDER.search(self._buffer)
+        cut = partial.start() if partial else len(self._buffer)
+        ready, self._buffer = self._buffer[:cut], self._buffer[cut:]
+        return self._redaction.restore(ready)
+
+    def flush(self) -> str:
+        rest, self._buffer = self._buffer, ""
+        return self._redaction.restore(rest)
+
+
+class Redaction:
+    """개인정보를 자리표시자로 바꾼 텍스트와 복원용 매핑"""
+
+    def __init__(self, text: str, mapping: Dict[str, str]):
+        self.text = text
+        self.mapping = mapping
+
+    def restore(self, text: str) -> str:
+        if not self.mapping:
+            return text
+        return _PLACEHOLDER.sub(lambda m: self.mapping.get(m.group(0), m.group(0)), text)
+
+    def restorer(self) -> StreamRestorer:
+        return StreamRestorer(self)
+
+
+# 라벨 없이 다시 나온 값을 가릴 때의 경계 조건 (카테고리별)
+# 이름은 "확인", "기재란에" 같은 일반 단어가 잡힐 수 있으므로 호칭이 붙은 경우("홍길동님")만 가린다.
+# 나머지(번호/연락처/주소)는 형식이 분명하므로 다른 단어/숫자의 일부가 아닌 곳이면 모두 가린다.
+_REPEAT_BOUNDARIES = {
+    "이름": (r"(?<![가-힣])", r"(?=\s?(?:님|씨|귀하))"),
+}
+_DEFAULT_BOUNDARY = (r"(?<![0-9A-Za-z가-힣])", r"(?![0-9A-Za-z])")
+
+
+def _merge(spans: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    """겹치는 span 을 합침 (같은 숫자열이 여러 카테고리에 잡힌 경우 등)"""
+    merged: list[tuple[int, int]] = []
+    for start, end in sorted(spans):
+        if merged and start < merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def redact(text: str) -> Redaction:
+    """rulebook 매치의 값 부분을 안정적인 자리표시자로 치환
+
+    "성명: 홍길동" 처럼 라벨이 있는 패턴은 라벨을 남기고 값만 가린다. 한 번 찾은 값이
+    라벨 없이 다시 나오면 카테고리별 경계 조건(_REPEAT_BOUNDARIES)을 만족할 때만 가린다.
+    같은 값은 같은 자리표시자를 받고, 번호는 등장 순서대로 매겨진다. 사용자마다 다른
+    개인정보가 빠지므로 같은 안내문은 같은 캐시 키를 갖게 된다.
+    """
+    _, matches = scan_rulebook(text)
+    if not matches:
+        return Redaction(text, {})
+
+    spans = []
+    repeats: Dict[str, str] = {}
+    for match in matches:
+        start, end = value_span(text, match)
+        if start == end:
+            continue
+        spans.append((start, end))
+        repeats.setdefault(text[start:end], match.category)
+
+    for value, category in repeats.items():
+        before, after = _REPEAT_BOUNDARIES.get(category, _DEFAULT_BOUNDARY)
+        for found in re.finditer(before + re.escape(value) + after, text):
+            spans.append(found.span())
+
+    if not spans:
+        return Redaction(text, {})
+
+    placeholders: Dict[str, str] = {}
+    parts = []
+    last = 0
+    for start, end in _merge(spans):
+        value = text[start:end]
+        placeholder = placeholders.get(value)
+        if placeholder is None:
+            placeholder = PLACEHOLDER_FORMAT.format(index=len(placeholders) + 1)
+            placeholders[value] = placeholder
+        parts.append(text[last:start])
+        parts.append(placeholder)
+        last = end
+    parts.append(text[last:])
+
+    mapping = {placeholder: value for value, placeholder in placeholders.items()}
+    return Redaction("".join(parts), mapping)
@@ -1,14 +1,18 @@
 import re
-from typing import Dict, Any
+from typing import Dict, Any, NamedTuple
 
+# 모든 패턴은 한 번의 스캔에서 선형 시간으로 끝나도록 작성한다.
+# (공백 구간을 두 개의 \s* 가 나눠 갖거나, 단어 중간마다 게으른 수량자를
+#  다시 시작하는 형태는 긴 입력에서 역추적이 제곱으로 늘어난다.)
 patterns = {
     # 개인 정보
     "이름": re.compile(r"""
-        (?:성명|이름)   # '성명' 또는 '이름'
-        \s*            # 콜론 앞뒤의 공백 허용
-        [ :：]         # ASCII 콜론 또는 fullwidth 콜론
-        \s*            # 콜론 뒤 공백 허용
-        ([가-힣]{2,4}) # 실제 이름(2~4글자)
+        (?:성명|이름)          # '성명' 또는 '이름'
+        (?:
+            \s*[:：]\s*        # 콜론(ASCII/fullwidth) 앞뒤의 공백 허용
+          | [^\S ]*[ ]\s*      # 또는 공백 한 칸 이상
+        )
+        ([가-힣]{2,4})         # 실제 이름(2~4글자)
     """, re.VERBOSE),
     "주민등록번호": re.compile(r"[0-9]{6}-[0-9]{7}"), #외국인 등록 번호도 이와 동일
     "운전면허번호": re.compile(r"[0-9]{2}-[0-9]{2}-[0-9]{6}-[0-9]{2}"),
@@ -17,30 +21,125 @@ patterns = {
     # 계좌 번호는 직접 안써서 보내지 않나 싶음.
     # 사업자 등록 번호
     "사업자등록번호" : re.compile(r"[0-9]{3}-[0-9]{2}-[0-9]{5}"),
-    "법인등록번호" : re.compile(r"법인등록번호\s*[:：]?\s*[0-9]{6}-[0-9]{7}"),
+    "법인등록번호" : re.compile(r"법인등록번호\s*(?:[:：]\s*)?([0-9]{6}-[0-9]{7})"),
 
     # 연락처
     "전화번호":  re.compile(r"01[016789]-[0-9]{3,4}-[0-9]{4}"),
-    "이메일": re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+"),
-    
+    # 로컬 파트 중간에서 다시 시작하지 않도록 단어 시작에서만 매칭
+    "이메일": re.compile(r"(?<![a-zA-Z0-9._%+-])[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+"),
+
     # 집 주소는 정확할 것이라고 생각.
     "주소": re.compile(r"""
-         (?:주소[:：]?\s*)?                                   
-        (?:(?P<province>[가-힣]+?(?:도|광역시|특별시|시))\s+)?  
-        (?P<city>[가-힣]+?(?:시|군|구))                       
+        (?<![가-힣])                                         # 한글 단어 시작에서만 시도
+        (?:주소[:：]?\s*)?
+        (                                                    # 실제 주소 (라벨 제외)
+        (?:(?P<province>[가-힣]+?(?:도|광역시|특별시|시))\s+)?
+        (?P<city>[가-힣]+?(?:시|군|구))
         \s+
-        (?P<district>[가-힣]+?(?:구|읍|면|동|리))               
+        (?P<district>[가-힣]+?(?:구|읍|면|동|리))
         \s+
-        (?P<street>[가-힣0-9]+?(?:로|길))                     
+        (?P<street>[가-힣0-9]+?(?:로|길))
         \s*
-        (?P<number>\d+) 
+        (?P<number>\d+)
+        )
     """, re.VERBOSE),
     # "우편번호" : re.compile(r"(?<!\d)[0-9]{5}(?!\d)"),
 }
 
+# 라벨("성명:", "법인등록번호" 등)과 값을 함께 매칭하는 패턴의 값 그룹 번호.
+# 개인정보 가림은 라벨을 남기고 이 그룹만 가린다.
+_value_groups = {"이름": 1, "법인등록번호": 1, "주소": 1}
+
+# 그룹 이름 → 카테고리 (정규식 그룹 이름으로 한글을 쓰지 않기 위해 rule{n} 사용)
+_group_categories = {f"rule{i}": key for i, key in enumerate(patterns)}
+
+# 전체 패턴을 하나의 전방탐색 alternation 으로 합친 단일 스캐너.
+# 전방탐색이라 문자를 소비하지 않으므로 서로 겹치는 매치도 놓치지 않는다.
+_scanner = re.compile(
+    "(?=" + "|".join(
+        f"(?P<{group}>{patterns[key].pattern})"
+        for group, key in _group_categories.items()
+    ) + ")",
+    re.VERBOSE,
+)
+
+
+def validate_response(results):
+    """
+    validate_rulebook 결과를 받아서
+    {"isTrue": bool, "details" : ... } 구조로 반환한다.
+    """
+    if not results:
+        return {"isTrue": False, "details": None}
+    return {"isTrue": True, "details":results}
+
+
+class RuleMatch(NamedTuple):
+    category: str
+    start: int
+    end: int
+
+
+def _merge_spans(matches: list[RuleMatch]) -> list[RuleMatch]:
+    """같은 카테고리에서 겹치는 span 을 하나로 합침 (예: 긴 숫자열의 건강보험증번호)"""
+    merged: list[RuleMatch] = []
+    last: Dict[str, int] = {}
+    for match in sorted(matches, key=lambda m: (m.start, -m.end)):
+        index = last.get(match.category)
+        if index is not None and match.start < merged[index].end:
+            prev = merged[index]
+            merged[index] = RuleMatch(prev.category, prev.start, max(prev.end, match.end))
+            continue
+        last[match.category] = len(merged)
+        merged.append(match)
+    return merged
+
+
+def scan_rulebook(text: str) -> tuple[list[str], list[RuleMatch]]:
+    """한 번의 스캔으로 (카테고리 목록, 매치 span 목록)을 함께 반환"""
+    matches: list[RuleMatch] = []
+
+    for match in _scanner.finditer(text):
+        start = match.start()
+        for group, key in _group_categories.items():
+            if match.group(group) is not None:
+                matches.append(RuleMatch(key, start, match.end(group)))
+                continue
+            # 같은 위치에서 시작하는 다른 카테고리의 매치도 수집
+            anchored = patterns[key].match(text, start)
+            if anchored:
+                matches.append(RuleMatch(key, start, anchored.end()))
+
+    matches = _merge_spans(matches)
+    found = {m.category for m in matches}
+    return [key for key in patterns if key in found], matches
+
+
+def value_span(text: str, match: RuleMatch) -> tuple[int, int]:
+    """매치 span 중 라벨을 뺀 실제 값의 (start, end)"""
+    group = _value_groups.get(match.category)
+    if group is not None:
+        anchored = patterns[match.category].match(text, match.start)
+        if anchored and anchored.group(group) is not None:
+            return anchored.span(group)
+    return match.start, match.end
+
+
 def validate_rulebook(text: str) -> list[str]:
-    return [
-        key
-        for key, regex in patterns.items()
-        if regex.search(text)
-    ]
+    """입력을 한 번만 훑어 매칭된 카테고리 목록을 patterns 순서대로 반환"""
+    found = set()
+
+    for match in _scanner.finditer(text):
+        start = match.start()
+        for group, key in _group_categories.items():
+            if key in found:
+                continue
+            # alternation 은 한 위치에서 첫 번째로 맞는 패턴만 알려주므로
+            # 같은 위치에서 시작하는 나머지 카테고리는 고정 위치에서 확인
+            if match.group(group) is not None or patterns[key].match(text, start):
+                found.add(key)
+
+        if len(found) == len(patterns):
+            break
+
+    return [key for key in patterns if key in found]
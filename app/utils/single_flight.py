@@ -0,0 +1,97 @@
+import asyncio
+from typing import AsyncIterator, Awaitable, Callable, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class StreamFanout:
+    """하나의 업스트림 스트림을 여러 구독자에게 처음부터 같은 순서로 전달"""
+
+    def __init__(self, source: AsyncIterator[str], on_cancel: Optional[Callable[[], None]] = None):
+        self._chunks: list[str] = []
+        self._on_cancel = on_cancel
+        self._done = False
+        self._error: Optional[BaseException] = None
+        self._changed = asyncio.Event()
+        self.subscribers = 0
+        self.active = 0
+        self.task = asyncio.create_task(self._pump(source))
+
+    def _notify(self) -> None:
+        # 대기 중인 구독자를 깨우고 다음 변경을 위한 이벤트로 교체
+        event, self._changed = self._changed, asyncio.Event()
+        event.set()
+
+    async def _pump(self, source: AsyncIterator[str]) -> None:
+        try:
+            async for chunk in source:
+                self._chunks.append(chunk)
+                self._notify()
+        except BaseException as e:
+            self._error = e
+            if isinstance(e, asyncio.CancelledError):
+                raise
+        finally:
+            self._done = True
+            self._notify()
+
+    async def subscribe(self) -> AsyncIterator[str]:
+        self.subscribers += 1
+        self.active += 1
+        index = 0
+        try:
+            while True:
+                changed = self._changed
+                while index < len(self._chunks):
+                    yield self._chunks[index]
+                    index += 1
+                if self._done:
+                    if isinstance(self._error, asyncio.CancelledError):
+                        # 업스트림 취소를 그대로 다시 던지면 구독자 task 가 취소된 것처럼 보이므로 일반 에러로 변환
+                        raise RuntimeError("업스트림 스트림이 취소되었습니다")
+                    if self._error is not None:
+                        raise self._error
+                    return
+                await changed.wait()
+        finally:
+            self.active -= 1
+            # 마지막 구독자가 중간에 떠나면 더 읽을 사람이 없으므로 업스트림 생성 취소
+            if self.active == 0 and not self._done:
+                # 취소 완료(done callback)를 기다리지 않고 바로 목록에서 빼서, 그 사이 들어온 같은 요청이
+                # 취소 중인 스트림에 붙지 않고 새 스트림을 시작하도록 함
+                if self._on_cancel is not None:
+                    self._on_cancel()
+                self.task.cancel()
+
+
+class SingleFlight:
+    """동일 키로 동시에 들어온 요청을 하나의 업스트림 실행으로 합침"""
+
+    def __init__(self):
+        self._calls: dict[str, asyncio.Task] = {}
+        self._streams: dict[str, StreamFanout] = {}
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            # 선두 호출자의 취소가 다른 대기자에게 번지지 않도록 별도 task 로 실행
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._calls.pop(key, None))
+        return await asyncio.shield(task)
+
+    def stream(self, key: str, factory: Callable[[], AsyncIterator[str]]) -> AsyncIterator[str]:
+        fanout = self._streams.get(key)
+        if fanout is None:
+            fanout = StreamFanout(factory(), on_cancel=lambda: self._forget(key, fanout))
+            self._streams[key] = fanout
+            fanout.task.add_done_callback(lambda _: self._forget(key, fanout))
+        return fanout.subscribe()
+
+    def _forget(self, key: str, fanout: StreamFanout) -> None:
+        # 같은 키로 이미 새 스트림이 시작됐으면 그것은 지우지 않음
+        if self._streams.get(key) is fanout:
+            del self._streams[key]
+
+    def inflight(self) -> int:
+        return len(self._calls) + len(self._streams)
@@ -0,0 +1,285 @@
+import asyncio
+import json
+import time
+import uuid
+from collections import OrderedDict, deque
+from typing import Any, AsyncIterator, Optional
+
+from app.config import Global
+from app.utils.metrics import SSE_BYTES, SSE_FRAMES
+
+try:
+    import orjson
+except ImportError:  # 설치되지 않은 환경에서는 표준 json 사용
+    orjson = None
+
+_END = object()
+
+
+def dumps(value) -> bytes:
+    """JSON 직렬화 (orjson 이 있으면 사용, 한글은 이스케이프하지 않음)"""
+    if orjson is not None:
+        return orjson.dumps(value)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class EventEncoder:
+    """이벤트 이름별로 "event: ...\\ndata: " 접두어를 미리 인코딩해 두고 재사용"""
+
+    def __init__(self):
+        self._prefixes: dict[str, bytes] = {}
+
+    def prefix(self, event: str) -> bytes:
+        prefix = self._prefixes.get(event)
+        if prefix is None:
+            prefix = self._prefixes[event] = f"event: {event}\ndata: ".encode("utf-8")
+        return prefix
+
+    def encode(self, event: str, payload, event_id: Optional[str] = None) -> bytes:
+        frame = self.prefix(event) + dumps(payload) + b"\n\n"
+        if event_id is not None:
+            frame = b"id: " + event_id.encode("ascii") + b"\n" + frame
+        SSE_FRAMES.labels(event).inc()
+        SSE_BYTES.labels(event).inc(len(frame))
+        return frame
+
+
+encoder = EventEncoder()
+
+
+async def coalesce(source: AsyncIterator[str], interval_ms: int, max_bytes: int) -> AsyncIterator[str]:
+    """첫 조각은 바로 내보내고, 이후 조각은 interval_ms 또는 max_bytes 단위로 묶어서 내보냄
+
+    토큰이 잠시 멈춰도 쌓인 내용은 interval_ms 안에 전달되도록 별도 task 가 source 를 읽는다.
+    """
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def pump():
+        item = _END
+        try:
+            async for chunk in source:
+                queue.put_nowait(chunk)
+        except BaseException as e:
+            item = e
+            # 취소 등은 task 로 전파 (에러는 큐로만 전달)
+            if not isinstance(e, Exception):
+                raise
+        finally:
+            # 어떤 식으로 끝나든 소비자가 queue.get() 에서 멈추지 않도록 알림
+            queue.put_nowait(item)
+
+    task = asyncio.create_task(pump())
+    loop = asyncio.get_running_loop()
+    interval = interval_ms / 1000
+
+    try:
+        # 첫 토큰은 기다리지 않고 전달 (time-to-first-token 최소화)
+        item = await queue.get()
+        if isinstance(item, BaseException):
+            raise item
+        if item is _END:
+            return
+        yield item
+
+        buffer: list[str] = []
+        size = 0
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - loop.time())
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                item = None
+
+            if item is None or item is _END or isinstance(item, BaseException):
+                if buffer:
+                    yield "".join(buffer)
+                    buffer, size, deadline = [], 0, None
+                if item is _END:
+                    return
+                if isinstance(item, BaseException):
+                    raise item
+                continue
+
+            if deadline is None:
+                deadline = loop.time() + interval
+            buffer.append(item)
+            size += len(item.encode("utf-8"))
+            if size >= max_bytes:
+                yield "".join(buffer)
+                buffer, size, deadline = [], 0, None
+    finally:
+        # 소비자가 먼저 끝나도 source 의 정리(finally)까지 마친 뒤 반환
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+
+class StreamGap(Exception):
+    """이어받을 이벤트가 이미 버퍼에서 밀려난 경우"""
+
+
+class ResumableStream:
+    """생성 중/완료된 SSE 이벤트를 번호와 함께 보관하는 링 버퍼
+
+    이벤트 id 는 "<stream_id>:<seq>" 형식이며, 생성은 연결과 별도 task 에서 진행되므로
+    클라이언트가 끊겼다가 Last-Event-ID 로 다시 붙으면 다음 이벤트부터 이어서 받는다.
+    """
+
+    def __init__(self, stream_id: str, max_events: int, grace_seconds: float = 0.0):
+        self.id = stream_id
+        self.grace_seconds = grace_seconds
+        self._frames: deque[tuple[int, bytes]] = deque(maxlen=max_events)
+        self._next_seq = 1
+        self._changed = asyncio.Event()
+        self.done = False
+        self.cancelled = False
+        self.finished_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+        self.subscribers = 0
+        # 클라이언트가 이벤트 id 를 하나라도 받았는지 (받지 못했다면 이어받을 수 없음)
+        self.delivered = False
+        self._abandon_timer: Optional[asyncio.TimerHandle] = None
+
+    @property
+    def first_seq(self) -> int:
+        """버퍼에 남아 있는 가장 오래된 이벤트 번호"""
+        return self._frames[0][0] if self._frames else self._next_seq
+
+    def append(self, event: str, payload) -> None:
+        seq = self._next_seq
+        self._next_seq += 1
+        self._frames.append((seq, encoder.encode(event, payload, f"{self.id}:{seq}")))
+        self._notify()
+
+    def _notify(self) -> None:
+        self._changed.set()
+        self._changed = asyncio.Event()
+
+    async def run(self, source: AsyncIterator[tuple[str, Any]]) -> None:
+        """(event, payload) 를 내는 생성기를 끝까지 소비해 버퍼에 기록"""
+        try:
+            async for event, payload in source:
+                self.append(event, payload)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        finally:
+            self.done = True
+            self.finished_at = time.monotonic()
+            self._notify()
+
+    async def subscribe(self, after: int = 0) -> AsyncIterator[bytes]:
+        """after 번 이후의 이벤트를 보내고, 생성이 끝날 때까지 새 이벤트를 기다림"""
+        self.subscribers += 1
+        if self._abandon_timer is not None:
+            self._abandon_timer.cancel()
+            self._abandon_timer = None
+        try:
+            while True:
+                # 이벤트를 보내는 동안 추가된 내용도 놓치지 않도록 대기 대상을 먼저 잡아 둠
+                changed = self._changed
+                while True:
+                    # 버퍼 전체를 다시 훑지 않고 다음 번호의 위치로 바로 접근
+                    # (보내는 동안 앞쪽이 밀려날 수 있으므로 매번 first_seq 기준으로 계산)
+                    index = after + 1 - self.first_seq
+                    if index < 0:
+                        raise StreamGap(f"{self.id}:{after + 1}")
+                    if index >= len(self._frames):
+                        break
+                    after, frame = self._frames[index]
+                    # 응답으로 넘긴 시점부터 클라이언트가 이 id 로 이어받을 수 있음
+                    self.delivered = True
+                    yield frame
+                if self.done and after + 1 >= self._next_seq:
+                    return
+                await changed.wait()
+        finally:
+            self.subscribers -= 1
+            if self.subscribers == 0 and not self.done:
+                if self.grace_seconds <= 0 or not self.delivered:
+                    # 이어받을 이벤트 id 를 받은 적 없는 연결이면 재연결을 기다리지 않음
+                    self._abandon()
+                else:
+                    # 연결이 모두 끊기면 grace_seconds 동안 재연결을 기다린 뒤 생성 취소
+                    self._abandon_timer = asyncio.get_running_loop().call_later(self.grace_seconds, self._abandon)
+
+    def _abandon(self) -> None:
+        self._abandon_timer = None
+        if self.subscribers == 0 and self.task is not None and not self.task.done():
+            self.task.cancel()
+
+
+class StreamRegistry:
+    """stream_id 별 ResumableStream 보관 (개수 제한 + 완료 후 TTL)"""
+
+    def __init__(self, max_streams: int, max_events: int, ttl_seconds: float, grace_seconds: float = 0.0):
+        self.max_streams = max(1, max_streams)
+        self.max_events = max(1, max_events)
+        self.ttl_seconds = ttl_seconds
+        self.grace_seconds = grace_seconds
+        self._streams: OrderedDict[str, ResumableStream] = OrderedDict()
+        self.resumed = 0
+
+    @classmethod
+    def from_env(cls) -> "StreamRegistry":
+        return cls(
+            max_streams=Global.env.SSE_RESUME_MAX_STREAMS,
+            max_events=Global.env.SSE_RESUME_MAX_EVENTS,
+            ttl_seconds=Global.env.SSE_RESUME_TTL_SECONDS,
+            grace_seconds=Global.env.SSE_RESUME_GRACE_SECONDS,
+        )
+
+    def start(self, source: AsyncIterator[tuple[str, Any]]) -> ResumableStream:
+        """새 스트림 생성 후 생성 task 시작 (연결이 끊겨도 grace_seconds 동안은 계속 진행)"""
+        self._evict()
+        stream = ResumableStream(uuid.uuid4().hex, self.max_events, self.grace_seconds)
+        stream.task = asyncio.create_task(stream.run(source))
+        self._streams[stream.id] = stream
+        return stream
+
+    def resume(self, last_event_id: Optional[str]) -> Optional[tuple[ResumableStream, int]]:
+        """Last-Event-ID 로 이어받을 스트림과 마지막으로 받은 번호 (불가능하면 None)"""
+        if not last_event_id:
+            return None
+        stream_id, _, seq = last_event_id.strip().partition(":")
+        stream = self._streams.get(stream_id)
+        # 재연결이 늦어 취소된 스트림은 이어받을 수 없으므로 새로 시작
+        if stream is None or stream.cancelled or not seq.isdigit():
+            return None
+        after = int(seq)
+        if after + 1 < stream.first_seq:
+            return None
+        self.resumed += 1
+        return stream, after
+
+    def _evict(self) -> None:
+        now = time.monotonic()
+        for stream_id, stream in list(self._streams.items()):
+            if stream.done and now - stream.finished_at > self.ttl_seconds:
+                del self._streams[stream_id]
+
+        # 개수를 넘으면 완료된 것부터, 그래도 넘으면 오래된 순으로 목록에서 제외
+        # (목록에서 빠져도 이미 연결된 클라이언트의 생성은 계속됨)
+        while len(self._streams) >= self.max_streams:
+            victim = next((k for k, v in self._streams.items() if v.done), None)
+            if victim is None:
+                victim = next(iter(self._streams))
+            stream = self._streams.pop(victim)
+            # 아무도 듣지 않는 생성은 더 이상 이어받을 수도 없으므로 취소
+            if stream.subscribers == 0 and stream.task is not None:
+                stream.task.cancel()
+
+    async def aclose(self) -> None:
+        """진행 중인 생성 task 취소 (종료 시)"""
+        tasks = [s.task for s in self._streams.values() if s.task is not None and not s.task.done()]
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "streams": len(self._streams),
+            "running": sum(1 for s in self._streams.values() if not s.done),
+            "resumed": self.resumed,
+        }
@@ -0,0 +1,183 @@
+import asyncio
+import hashlib
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+from app.config import Global
+from app.utils.logger import logger
+
+
+def token_digest(token: str) -> bytes:
+    """토큰 원문 대신 보관/비교에 쓰는 키 (SHA-256)"""
+    return hashlib.sha256(token.encode("utf-8")).digest()
+
+
+class VerifiedTokenCache:
+    """서명 검증을 마친 JWT claims 를 토큰의 exp 까지 보관하는 LRU"""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[bytes, dict] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, digest: bytes) -> Optional[dict]:
+        claims = self._entries.get(digest)
+        if claims is None:
+            self.misses += 1
+            return None
+        if claims["exp"] <= time.time():
+            # 만료된 토큰은 다시 decode 해서 만료 에러가 나도록 캐시에서 제거
+            del self._entries[digest]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(digest)
+        self.hits += 1
+        return claims
+
+    def put(self, digest: bytes, claims: dict) -> None:
+        if self.max_entries <= 0 or not isinstance(claims.get("exp"), (int, float)):
+            return
+        self._entries[digest] = claims
+        self._entries.move_to_end(digest)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def discard(self, digest: bytes) -> None:
+        self._entries.pop(digest, None)
+
+    def stats(self) -> dict[str, Any]:
+        return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
+
+
+class RevocationBackend:
+    """폐기된 토큰 저장소 인터페이스 (프로세스 간 공유용)
+
+    since(cursor) 는 cursor 이후에 추가된 (digest, expires_at) 목록과 새 cursor 를 반환한다.
+    Redis 등 다른 저장소도 이 두 메서드만 구현하면 교체할 수 있다.
+    """
+
+    def add(self, digest: bytes, expires_at: float) -> None:
+        raise NotImplementedError
+
+    def since(self, cursor: int) -> tuple[list[tuple[bytes, float]], int]:
+        raise NotImplementedError
+
+
+class MemoryRevocationBackend(RevocationBackend):
+    """단일 프로세스용 (공유 저장소를 설정하지 않은 경우)"""
+
+    def add(self, digest: bytes, expires_at: float) -> None:
+        pass
+
+    def since(self, cursor: int) -> tuple[list[tuple[bytes, float]], int]:
+        return [], cursor
+
+
+class SQLiteRevocationBackend(RevocationBackend):
+    """로컬 SQLite 파일 저장소 (같은 서버의 워커 프로세스끼리 폐기 목록 공유)"""
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS revoked_tokens ("
+            " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+            " digest BLOB NOT NULL UNIQUE,"
+            " expires_at REAL NOT NULL)"
+        )
+
+    def add(self, digest: bytes, expires_at: float) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO revoked_tokens (digest, expires_at) VALUES (?, ?)",
+                (digest, expires_at),
+            )
+            # 만료된 토큰은 어차피 검증에서 거절되므로 목록에서 정리
+            self._conn.execute("DELETE FROM revoked_tokens WHERE expires_at < ?", (time.time(),))
+
+    def since(self, cursor: int) -> tuple[list[tuple[bytes, float]], int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, digest, expires_at FROM revoked_tokens WHERE id > ? ORDER BY id", (cursor,)
+            ).fetchall()
+        if rows:
+            cursor = rows[-1][0]
+        return [(digest, expires_at) for _, digest, expires_at in rows], cursor
+
+
+class RevocationList:
+    """폐기된 토큰의 프로세스 내 사본
+
+    요청 경로에서는 메모리의 dict 만 확인하고, 저장소와는 sync_seconds 마다 새로 추가된
+    항목만 가져와 맞춘다. (다른 워커에서 폐기한 토큰은 최대 sync_seconds 늦게 반영)
+    저장소 호출(SQLite 등)은 블로킹이므로 이벤트 루프가 아니라 스레드에서 실행한다.
+    """
+
+    def __init__(self, backend: RevocationBackend, sync_seconds: float):
+        self.backend = backend
+        self.sync_seconds = sync_seconds
+        self._revoked: dict[bytes, float] = {}
+        self._cursor = 0
+        self._next_sync = 0.0
+        self._sync_task: Optional[asyncio.Task] = None
+
+    @classmethod
+    def from_env(cls) -> "RevocationList":
+        path = Global.env.AUTH_REVOCATION_DB
+        backend = SQLiteRevocationBackend(path) if path else MemoryRevocationBackend()
+        return cls(backend, Global.env.AUTH_REVOCATION_SYNC_SECONDS)
+
+    async def sync(self) -> None:
+        """저장소에서 새로 폐기된 항목을 가져와 반영 (조회만 스레드에서, 반영은 이벤트 루프에서)"""
+        self._next_sync = time.monotonic() + self.sync_seconds
+        try:
+            entries, cursor = await asyncio.to_thread(self.backend.since, self._cursor)
+        except Exception as e:
+            # 저장소 장애 시에도 인증은 계속 (메모리 사본 기준)
+            logger.error(f"토큰 폐기 목록 동기화 실패: {str(e)}")
+            return
+        self._apply(entries, cursor)
+
+    def _apply(self, entries: list[tuple[bytes, float]], cursor: int) -> None:
+        self._cursor = max(self._cursor, cursor)
+        wall = time.time()
+        for digest, expires_at in entries:
+            self._revoked[digest] = expires_at
+        # 만료된 항목 정리
+        for digest in [d for d, expires_at in self._revoked.items() if expires_at < wall]:
+            del self._revoked[digest]
+
+    def _schedule_sync(self) -> None:
+        if self._sync_task is not None and not self._sync_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # 이벤트 루프 밖(스크립트 등)에서는 바로 동기화
+            self._next_sync = time.monotonic() + self.sync_seconds
+            try:
+                self._apply(*self.backend.since(self._cursor))
+            except Exception as e:
+                logger.error(f"토큰 폐기 목록 동기화 실패: {str(e)}")
+            return
+        # 요청은 기다리지 않고 메모리 사본으로 판단, 동기화는 뒤에서 진행
+        self._sync_task = loop.create_task(self.sync())
+
+    def is_revoked(self, digest: bytes) -> bool:
+        if time.monotonic() >= self._next_sync:
+            self._schedule_sync()
+        return digest in self._revoked
+
+    async def revoke(self, digest: bytes, expires_at: float) -> None:
+        self._revoked[digest] = expires_at
+        await asyncio.to_thread(self.backend.add, digest, expires_at)
+
+    def stats(self) -> dict[str, Any]:
+        return {"revoked": len(self._revoked)}
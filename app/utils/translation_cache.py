@@ -0,0 +1,190 @@
+import asyncio
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+from app.config import Global
+from app.utils.logger import logger
+from app.utils.metrics import TRANSLATION_CACHE_REQUESTS
+
+
+def normalize_text(text: str) -> str:
+    """캐시 키용 원문 정규화 (NFC, 줄 단위 공백 정리)"""
+    text = unicodedata.normalize("NFC", text)
+    lines = [re.sub(r"[ \t\u00a0\u3000]+", " ", line).strip() for line in text.splitlines()]
+    return re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+
+
+def make_cache_key(original: str, system_prompt: str, model: str) -> str:
+    """(정규화된 원문, 시스템 프롬프트, 모델명) 해시"""
+    digest = hashlib.sha256()
+    for part in (normalize_text(original), system_prompt, model):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class CacheBackend(ABC):
+    """여러 인스턴스가 공유하는 캐시 계층 (동기 API, 스레드에서 호출됨)"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[str]: ...
+
+    @abstractmethod
+    def set(self, key: str, value: str, ttl: int) -> None: ...
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """로컬 SQLite 파일을 공유 캐시로 사용"""
+
+    def __init__(self, path: str):
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS translation_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._conn.commit()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM translation_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] < time.time():
+                self._conn.execute("DELETE FROM translation_cache WHERE key = ?", (key,))
+                self._conn.commit()
+                return None
+            return row[0]
+
+    def set(self, key: str, value: str, ttl: int) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO translation_cache (key, value, expires_at) VALUES (?, ?, ?)",
+                (key, value, time.time() + ttl),
+            )
+            self._conn.commit()
+
+
+class LRUTTLCache:
+    """프로세스 내 LRU 캐시 (TTL + 항목 수/바이트 기준 제거)"""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: int):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._data: "OrderedDict[str, tuple[str, float, int]]" = OrderedDict()
+        self._bytes = 0
+
+    def get(self, key: str) -> Optional[str]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        value, expires_at, _ = item
+        if expires_at < time.monotonic():
+            self._pop(key)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: str) -> None:
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        if key in self._data:
+            self._pop(key)
+        self._data[key] = (value, time.monotonic() + self.ttl, size)
+        self._bytes += size
+        # 오래된 항목부터 제거
+        while len(self._data) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._data))
+            self._pop(oldest)
+
+    def _pop(self, key: str) -> None:
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+
+class TranslationCache:
+    """메모리 LRU 계층 + 선택적 공유 계층으로 구성된 번역 캐시"""
+
+    def __init__(self, memory: LRUTTLCache, shared: Optional[CacheBackend] = None):
+        self.memory = memory
+        self.shared = shared
+        self.hits = 0
+        self.misses = 0
+        self.shared_hits = 0
+
+    @classmethod
+    def from_env(cls) -> "TranslationCache":
+        env = Global.env
+        memory = LRUTTLCache(
+            max_entries=env.TRANSLATION_CACHE_MAX_ENTRIES,
+            max_bytes=env.TRANSLATION_CACHE_MAX_BYTES,
+            ttl=env.TRANSLATION_CACHE_TTL_SECONDS,
+        )
+        shared = None
+        if env.TRANSLATION_CACHE_BACKEND == "sqlite":
+            shared = SQLiteCacheBackend(env.TRANSLATION_CACHE_SQLITE_PATH)
+        logger.info(f"번역 캐시 초기화 - 공유 계층: {env.TRANSLATION_CACHE_BACKEND}")
+        return cls(memory, shared)
+
+    async def get(self, key: str) -> Optional[str]:
+        value = self.memory.get(key)
+        if value is None and self.shared is not None:
+            try:
+                value = await asyncio.to_thread(self.shared.get, key)
+            except Exception as e:
+                logger.warning(f"공유 캐시 조회 실패: {str(e)}")
+                value = None
+            if value is not None:
+                self.shared_hits += 1
+                self.memory.set(key, value)
+
+        if value is None:
+            self.misses += 1
+            TRANSLATION_CACHE_REQUESTS.labels("miss").inc()
+        else:
+            self.hits += 1
+            TRANSLATION_CACHE_REQUESTS.labels("hit").inc()
+        return value
+
+    async def set(self, key: str, value: str) -> None:
+        if not value:
+            return
+        self.memory.set(key, value)
+        if self.shared is not None:
+            try:
+                await asyncio.to_thread(self.shared.set, key, value, self.memory.ttl)
+            except Exception as e:
+                logger.warning(f"공유 캐시 저장 실패: {str(e)}")
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared_hits": self.shared_hits,
+            "hit_ratio": self.hits / total if total else 0.0,
+            "entries": len(self.memory),
+            "bytes": self.memory.size_bytes,
+        }
@@ -0,0 +1,81 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Generic, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class WriteBehindBuffer(Generic[T, R]):
+    """짧은 시간 창 안에 들어온 단건 쓰기를 모아 한 번에 flush
+
+    submit() 은 자기 항목이 포함된 flush 가 끝날 때까지 기다렸다가 그 항목의 결과를
+    돌려주므로, 호출자 입장에서는 단건 저장과 같은 의미(커밋 후 응답)를 유지한다.
+    flush 함수는 항목 목록을 받아 같은 순서의 결과 목록을 반환해야 한다.
+    """
+
+    def __init__(
+        self,
+        flush: Callable[[list[T]], Awaitable[list[R]]],
+        window_seconds: float,
+        max_items: int,
+    ):
+        self._flush = flush
+        self.window_seconds = window_seconds
+        self.max_items = max(1, max_items)
+        self._pending: list[tuple[T, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set[asyncio.Task] = set()
+        self.flushes = 0
+        self.items = 0
+
+    async def submit(self, item: T) -> R:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+
+        if len(self._pending) >= self.max_items:
+            self._flush_now()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window_seconds, self._flush_now)
+
+        return await future
+
+    def _flush_now(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        # 호출자가 취소돼도 이미 받은 쓰기는 끝까지 실행되도록 별도 task 로 flush
+        task = asyncio.ensure_future(self._run(pending))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, pending: list[tuple[T, asyncio.Future]]) -> None:
+        self.flushes += 1
+        self.items += len(pending)
+        try:
+            results = await self._flush([item for item, _ in pending])
+        except Exception as e:
+            for _, future in pending:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(pending, results):
+            if not future.done():
+                future.set_result(result)
+
+    async def drain(self) -> None:
+        """대기 중인 항목을 즉시 flush 하고 진행 중인 flush 가 끝날 때까지 대기 (종료 시)"""
+        self._flush_now()
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "flushes": self.flushes,
+            "items": self.items,
+            "pending": len(self._pending),
+        }
@@ -0,0 +1,8 @@
+import os
+
+# app.config 는 import 시점에 환경변수를 읽으므로 테스트 모듈보다 먼저 설정
+# (실제 OpenAI/Firebase 를 호출하지 않고 가짜 클라이언트로 대체해서 테스트)
+os.environ.setdefault("OPENAI_API_KEY", "test-key")
+os.environ.setdefault("TRANSLATION_CACHE_BACKEND", "none")
+os.environ.setdefault("PII_REDACTION_ENABLED", "true")
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret")
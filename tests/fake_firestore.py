@@ -0,0 +1,274 @@
+import copy
+import threading
+import time
+import uuid
+from typing import Any, Optional
+
+# google.cloud.firestore_v1 의 정렬 방향 문자열과 같은 값
+ASCENDING = "ASCENDING"
+DESCENDING = "DESCENDING"
+BATCH_LIMIT = 500
+
+
+class FakeSnapshot:
+    def __init__(self, reference: "FakeDocumentReference", data: Optional[dict], fields: Optional[list] = None):
+        self.reference = reference
+        self.id = reference.id
+        self.exists = data is not None
+        if data is not None and fields is not None:
+            data = {key: value for key, value in data.items() if key in fields}
+        self._data = copy.deepcopy(data)
+
+    def to_dict(self) -> Optional[dict]:
+        return copy.deepcopy(self._data)
+
+    def get(self, field: str):
+        return (self._data or {}).get(field)
+
+
+class FakeDocumentReference:
+    def __init__(self, db: "FakeFirestore", collection: str, doc_id: str):
+        self._db = db
+        self._collection = collection
+        self.id = doc_id
+
+    @property
+    def path(self) -> str:
+        return f"{self._collection}/{self.id}"
+
+    def get(self, field_paths=None) -> FakeSnapshot:
+        self._db.round_trip("get")
+        with self._db.lock:
+            self._db.docs_read += 1
+            return FakeSnapshot(self, self._db.docs(self._collection).get(self.id), field_paths)
+
+    def set(self, data: dict, merge: bool = False) -> None:
+        self._db.round_trip("set")
+        with self._db.lock:
+            self._db.apply(("set", self, data, merge))
+
+    def create(self, data: dict) -> None:
+        from google.api_core.exceptions import AlreadyExists
+
+        self._db.round_trip("create")
+        with self._db.lock:
+            if self.id in self._db.docs(self._collection):
+                raise AlreadyExists(f"{self.path} 가 이미 있습니다")
+            self._db.apply(("set", self, data, False))
+
+    def delete(self) -> None:
+        self._db.round_trip("delete")
+        with self._db.lock:
+            self._db.apply(("delete", self, None, False))
+
+
+class FakeQuery:
+    def __init__(self, db: "FakeFirestore", collection: str):
+        self._db = db
+        self._collection = collection
+        self._filters: list[tuple[str, str, Any]] = []
+        self._orders: list[tuple[str, str]] = []
+        self._fields: Optional[list] = None
+        self._start_after: Optional[dict] = None
+        self._limit: Optional[int] = None
+
+    def _copy(self) -> "FakeQuery":
+        query = FakeQuery(self._db, self._collection)
+        query._filters = list(self._filters)
+        query._orders = list(self._orders)
+        query._fields = self._fields
+        query._start_after = self._start_after
+        query._limit = self._limit
+        return query
+
+    def where(self, field: str, op: str, value) -> "FakeQuery":
+        query = self._copy()
+        query._filters.append((field, op, value))
+        return query
+
+    def order_by(self, field: str, direction: str = ASCENDING) -> "FakeQuery":
+        query = self._copy()
+        query._orders.append((field, direction))
+        return query
+
+    def select(self, fields) -> "FakeQuery":
+        query = self._copy()
+        query._fields = list(fields)
+        return query
+
+    def start_after(self, values) -> "FakeQuery":
+        query = self._copy()
+        if isinstance(values, FakeSnapshot):
+            values = {field: self._value(values.id, values._data, field) for field, _ in self._orders}
+        query._start_after = values
+        return query
+
+    def limit(self, count: int) -> "FakeQuery":
+        query = self._copy()
+        query._limit = count
+        return query
+
+    @staticmethod
+    def _value(doc_id: str, data: dict, field: str):
+        if field == "__name__":
+            return doc_id
+        return data.get(field)
+
+    def _matches(self, data: dict) -> bool:
+        for field, op, value in self._filters:
+            actual = data.get(field)
+            if op == "==" and actual != value:
+                return False
+            if op == "in" and actual not in value:
+                return False
+            if op == "array_contains" and value not in (actual or []):
+                return False
+            if op == "array_contains_any":
+                if len(value) > 30:
+                    raise ValueError("array_contains_any 는 최대 30개 값까지 가능합니다")
+                if not set(value) & set(actual or []):
+                    return False
+        return True
+
+    def _key(self, doc_id: str, data: dict) -> list:
+        return [self._value(doc_id, data, field) for field, _ in self._orders]
+
+    def _after(self, key: list, cursor: list) -> bool:
+        """정렬 순서상 key 가 cursor 보다 뒤인지"""
+        for (field, direction), a, b in zip(self._orders, key, cursor):
+            if a == b:
+                continue
+            return a < b if direction == DESCENDING else a > b
+        return False
+
+    def stream(self):
+        self._db.round_trip("query")
+        self._db.selects.append(self._fields)
+        with self._db.lock:
+            rows = [
+                (doc_id, data) for doc_id, data in self._db.docs(self._collection).items()
+                if self._matches(data)
+            ]
+            # 여러 필드 정렬: 마지막 정렬 기준부터 안정 정렬
+            for index in reversed(range(len(self._orders))):
+                field, direction = self._orders[index]
+                rows.sort(key=lambda row: self._value(row[0], row[1], field), reverse=direction == DESCENDING)
+            if self._start_after is not None:
+                cursor = []
+                for field, _ in self._orders:
+                    value = self._start_after[field]
+                    cursor.append(value.id if isinstance(value, FakeDocumentReference) else value)
+                rows = [row for row in rows if self._after(self._key(*row), cursor)]
+            if self._limit is not None:
+                rows = rows[:self._limit]
+            snapshots = [
+                FakeSnapshot(FakeDocumentReference(self._db, self._collection, doc_id), data, self._fields)
+                for doc_id, data in rows
+            ]
+            self._db.docs_read += len(snapshots)
+        return iter(snapshots)
+
+    def get(self):
+        return list(self.stream())
+
+
+class FakeCollection(FakeQuery):
+    def document(self, doc_id: Optional[str] = None) -> FakeDocumentReference:
+        return FakeDocumentReference(self._db, self._collection, doc_id or uuid.uuid4().hex[:20])
+
+
+class FakeWriteBatch:
+    def __init__(self, db: "FakeFirestore"):
+        self._db = db
+        self._writes: list[tuple] = []
+
+    def set(self, ref: FakeDocumentReference, data: dict, merge: bool = False) -> None:
+        self._writes.append(("set", ref, data, merge))
+
+    def delete(self, ref: FakeDocumentReference) -> None:
+        self._writes.append(("delete", ref, None, False))
+
+    def __len__(self) -> int:
+        return len(self._writes)
+
+    def commit(self) -> list:
+        if len(self._writes) > BATCH_LIMIT:
+            raise ValueError(f"WriteBatch 는 최대 {BATCH_LIMIT}개 쓰기까지 가능합니다")
+        self._db.round_trip("commit")
+        with self._db.lock:
+            if self._db.fail_commit is not None and self._db.fail_commit(self._writes):
+                raise RuntimeError("커밋 실패 (테스트용)")
+            # 한 배치의 쓰기는 모두 적용되거나 모두 적용되지 않음
+            for write in self._writes:
+                self._db.apply(write)
+        self._db.commits.append(len(self._writes))
+        return []
+
+
+class FakeFirestore:
+    """테스트용 인메모리 Firestore (동기 SDK 와 같은 모양, 호출마다 latency 만큼 스레드를 멈춤)
+
+    round_trips 로 왕복 횟수를, docs_read 로 받아 온 문서 수를, selects 로 쿼리별 필드 마스크를,
+    commits 로 배치별 쓰기 수를 확인할 수 있다.
+    fail_commit(writes) 가 True 를 반환하면 그 배치 커밋은 실패한다.
+    """
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.lock = threading.RLock()
+        self.data: dict[str, dict[str, dict]] = {}
+        self.round_trips = 0
+        self.docs_read = 0
+        self.selects: list[Optional[list]] = []
+        self.calls: list[str] = []
+        self.commits: list[int] = []
+        self.fail_commit = None
+
+    def round_trip(self, kind: str) -> None:
+        with self.lock:
+            self.round_trips += 1
+            self.calls.append(kind)
+        if self.latency:
+            time.sleep(self.latency)
+
+    def docs(self, collection: str) -> dict[str, dict]:
+        return self.data.setdefault(collection, {})
+
+    def apply(self, write: tuple) -> None:
+        from google.cloud.firestore_v1 import DELETE_FIELD
+
+        kind, ref, data, merge = write
+        docs = self.docs(ref._collection)
+        if kind == "delete":
+            docs.pop(ref.id, None)
+            return
+        data = copy.deepcopy(data)
+        if not merge:
+            docs[ref.id] = {k: v for k, v in data.items() if v is not DELETE_FIELD}
+            return
+        current = docs.setdefault(ref.id, {})
+        _merge(current, data, DELETE_FIELD)
+
+    def collection(self, name: str) -> FakeCollection:
+        return FakeCollection(self, name)
+
+    def batch(self) -> FakeWriteBatch:
+        return FakeWriteBatch(self)
+
+    def get_all(self, refs, field_paths=None):
+        self.round_trip("get_all")
+        with self.lock:
+            snapshots = [FakeSnapshot(ref, self.docs(ref._collection).get(ref.id), field_paths) for ref in refs]
+            self.docs_read += len(snapshots)
+        # 실제 SDK 처럼 순서를 보장하지 않음
+        return iter(reversed(snapshots))
+
+
+def _merge(target: dict, data: dict, delete_field) -> None:
+    for key, value in data.items():
+        if value is delete_field:
+            target.pop(key, None)
+        elif isinstance(value, dict) and isinstance(target.get(key), dict):
+            _merge(target[key], value, delete_field)
+        else:
+            target[key] = value
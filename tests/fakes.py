@@ -0,0 +1,104 @@
+import asyncio
+import json
+import time
+from typing import Callable, Optional
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+
+class FakeChatModel:
+    """ChatOpenAI 대신 쓰는 가짜 LLM (지연을 넣고 호출/토큰 수를 셈)
+
+    ScheduledLLM.llm 자리에 넣으면 노드/그래프/서비스는 실제 코드 그대로 실행된다.
+    reply_fn 을 주면 원문마다 다른 번역문을 돌려주고, 여러 단문을 묶은 프롬프트에는
+    항목별 번역문의 JSON 배열로 답한다. fail_on 문자열이 프롬프트에 있으면 호출이 실패한다.
+    """
+
+    def __init__(
+        self,
+        reply: str = "쉬운 말로 바꾼 번역입니다.",
+        latency: float = 0.05,
+        token_delay: float = 0.0,
+        tokens: Optional[list[str]] = None,
+        model_name: str = "fake-model",
+        reply_fn: Optional[Callable[[str], str]] = None,
+        fail_on: Optional[str] = None,
+    ):
+        self.reply = reply
+        self.latency = latency
+        self.token_delay = token_delay
+        self.tokens = tokens if tokens is not None else list(reply)
+        self.model_name = model_name
+        self.reply_fn = reply_fn
+        self.fail_on = fail_on
+        self.streaming = True
+        self.calls = 0
+        self.stream_calls = 0
+        self.tokens_emitted = 0
+        self.stream_closed = asyncio.Event()
+        self.streams_closed = 0
+        self.prompts: list = []
+        self.input_tokens = 0
+        self.output_tokens = 0
+
+    def _usage(self) -> dict:
+        return {"input_tokens": 10, "output_tokens": len(self.tokens), "total_tokens": 10 + len(self.tokens)}
+
+    def _respond(self, messages) -> AIMessage:
+        from app.agent.easyTranslate.splitter import estimate_tokens
+
+        self.calls += 1
+        self.prompts.append(messages)
+        contents = [str(message.content) for message in messages]
+        if self.fail_on and any(self.fail_on in content for content in contents):
+            raise RuntimeError("가짜 LLM 호출 실패")
+
+        original = contents[-1]
+        if len(messages) > 2:
+            # 여러 단문을 묶은 프롬프트 (마지막 메시지가 원문 JSON 배열)
+            reply = json.dumps([self._translate(item) for item in json.loads(original)], ensure_ascii=False)
+        else:
+            reply = self._translate(original)
+        self.input_tokens += sum(estimate_tokens(content) for content in contents)
+        self.output_tokens += estimate_tokens(reply)
+        return AIMessage(content=reply, usage_metadata=self._usage())
+
+    def _translate(self, original: str) -> str:
+        return self.reply_fn(original) if self.reply_fn else self.reply
+
+    def invoke(self, messages, **kwargs):
+        time.sleep(self.latency)
+        return self._respond(messages)
+
+    async def ainvoke(self, messages, **kwargs):
+        await asyncio.sleep(self.latency)
+        return self._respond(messages)
+
+    async def astream(self, messages, **kwargs):
+        self.stream_calls += 1
+        self.prompts.append(messages)
+        tokens = self.tokens
+        if self.reply_fn:
+            tokens = list(self.reply_fn(str(messages[-1].content)))
+        try:
+            await asyncio.sleep(self.latency)
+            for token in tokens:
+                if self.token_delay:
+                    await asyncio.sleep(self.token_delay)
+                self.tokens_emitted += 1
+                yield AIMessageChunk(content=token)
+            yield AIMessageChunk(content="", usage_metadata=self._usage())
+        finally:
+            # 업스트림 HTTP 스트림이 닫히는 시점
+            self.streams_closed += 1
+            self.stream_closed.set()
+
+
+def make_service(llm: FakeChatModel):
+    """가짜 LLM 을 쓰는 EasyTranslateService (스케줄러/캐시/합치기는 실제 구현)"""
+    from app.services.easyTranslate import EasyTranslateService
+
+    service = EasyTranslateService()
+    service.graph.llm.llm = llm
+    service.graph.llm_stream.llm = llm
+    return service
@@ -0,0 +1,54 @@
+import pytest
+
+from app import firebase_config
+from app.services import archiveIndex
+from tests.fake_firestore import FakeFirestore
+
+USER = "user-1"
+LONG_TEXT = "가" * 5000
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeFirestore()
+    monkeypatch.setattr(firebase_config, "get_db", lambda: db)
+    for day in range(1, 26):
+        firebase_config.save_archive(USER, LONG_TEXT, f"2026-01-{day:02d}")
+    return db
+
+
+def test_summary_list_reads_only_the_stored_preview(db):
+    db.round_trips = 0
+    seen, cursor = [], None
+    while True:
+        page = firebase_config.get_archives_by_user_id(USER, cursor, limit=10, summary=True)
+        seen.extend(page["archives"])
+        if not page["has_more"]:
+            break
+        cursor = page["next_cursor"]
+
+    # 페이지당 쿼리 1회, 본문은 받지 않음
+    assert db.round_trips == 3
+    assert all(fields == [archiveIndex.PREVIEW_FIELD, "timestamp"] for fields in db.selects)
+    assert len({item["archive_id"] for item in seen}) == 25
+    assert all(item["preview"] == "가" * archiveIndex.PREVIEW_CHARS + "…" for item in seen)
+    assert all("translated_text" not in item for item in seen)
+
+
+def test_summary_list_falls_back_for_archives_without_preview(db):
+    old_id = next(iter(db.docs("archives")))
+    del db.docs("archives")[old_id][archiveIndex.PREVIEW_FIELD]
+    db.round_trips = 0
+
+    page = firebase_config.get_archives_by_user_id(USER, None, limit=30, summary=True)
+
+    # 미리보기가 없는 문서만 본문을 추가로 조회
+    assert db.calls[-2:] == ["query", "get_all"]
+    assert {item["archive_id"]: item["preview"] for item in page["archives"]}[old_id].startswith("가")
+
+
+def test_full_list_returns_translated_text(db):
+    page = firebase_config.get_archives_by_user_id(USER, None, limit=5)
+
+    assert db.selects[-1] == ["translated_text", "timestamp"]
+    assert all(item["translated_text"] == LONG_TEXT for item in page["archives"])
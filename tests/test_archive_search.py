@@ -0,0 +1,174 @@
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import pytest
+from fastapi import HTTPException
+
+from app import firebase_config
+from app.config import Global
+from app.routes import archive_router
+from app.services import archiveIndex
+from tests.fake_firestore import FakeFirestore
+
+USER = "user-1"
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeFirestore()
+    monkeypatch.setattr(firebase_config, "get_db", lambda: db)
+    return db
+
+
+def _seed(count: int, every: int = 50) -> list[str]:
+    """count 개 아카이브 저장, every 개마다 하나는 '주민등록등본' 포함 (나머지도 '등록' 은 포함)"""
+    items = []
+    for i in range(count):
+        text = f"주민등록등본을 떼어 오세요 {i}" if i % every == 0 else f"사업자 등록 안내 {i}"
+        items.append({"user_id": USER, "translated_text": text, "timestamp": f"2026-01-{i % 28 + 1:02d}"})
+    ids = []
+    for start in range(0, count, 500):
+        results = firebase_config.save_archives_batch(items[start:start + 500])
+        ids.extend(result["archive_id"] for result in results)
+    return ids
+
+
+def _search_all(query: str, limit: int = 10) -> list[str]:
+    found, cursor = [], None
+    while True:
+        page = firebase_config.search_archives_query(USER, query, cursor, limit)
+        found.extend(archive["archive_id"] for archive in page["archives"])
+        if not page["has_more"]:
+            return found
+        cursor = page["next_cursor"]
+
+
+def test_save_writes_archive_and_tokens_in_one_write(db):
+    firebase_config.save_archive(USER, "주민등록등본을 떼어 오세요", "2026-01-01")
+
+    assert db.calls == ["set"]
+    (doc,) = db.docs("archives").values()
+    assert "주민" in doc[archiveIndex.TOKEN_FIELD]
+
+
+def test_search_returns_only_full_matches_across_pages(db):
+    ids = _seed(300)
+    expected = {ids[i] for i in range(0, 300, 50)}
+
+    assert set(_search_all("주민등록", limit=2)) == expected
+    assert len(_search_all("주민등록", limit=2)) == len(expected)
+    # 한 글자 검색어는 본문으로 확인
+    assert set(_search_all("본")) == expected
+
+
+def test_search_continues_from_cursor_when_scan_limit_is_reached(db, monkeypatch):
+    monkeypatch.setattr(Global.env, "ARCHIVE_SEARCH_SCAN_LIMIT", 30)
+    ids = _seed(300)
+
+    page = firebase_config.search_archives_query(USER, "주민등록", None, 10)
+    # 한 요청이 확인하는 후보 수는 제한되고, 남은 결과는 cursor 로 이어서 찾음
+    assert len(page["archives"]) < 10 and page["has_more"]
+    assert set(_search_all("주민등록")) == {ids[i] for i in range(0, 300, 50)}
+
+
+def test_full_matches_rank_above_newer_partial_matches(db):
+    results = firebase_config.save_archives_batch([
+        {"user_id": USER, "translated_text": "주민등록등본을 떼어 오세요", "timestamp": "2026-01-01"},
+        {"user_id": USER, "translated_text": "주민 센터에서 등록 안내", "timestamp": "2026-01-05"},
+        {"user_id": USER, "translated_text": "사업자 등록 안내", "timestamp": "2026-01-09"},
+        {"user_id": USER, "translated_text": "주민등록 번호를 적으세요", "timestamp": "2026-01-03"},
+    ])
+    full_old, partial, unrelated, full_new = [result["archive_id"] for result in results]
+
+    # 검색어 토큰 (주민, 민등, 등록) 을 모두 가진 문서가 최신순으로 먼저, 2/3 만 가진 문서는 그 뒤
+    assert _search_all("주민등록", limit=2) == [full_new, full_old, partial]
+    assert unrelated not in _search_all("주민등록")
+
+
+def test_scan_limited_pages_are_never_empty_while_has_more(db, monkeypatch):
+    monkeypatch.setattr(Global.env, "ARCHIVE_SEARCH_SCAN_LIMIT", 30)
+    # 300개 중 가장 오래된 쪽의 1개만 일치 (첫 한도 구간에는 결과가 없음)
+    items = [{"user_id": USER, "translated_text": f"사업자 등록 안내 {i}", "timestamp": f"2026-02-{i % 28 + 1:02d}"}
+             for i in range(299)]
+    items.append({"user_id": USER, "translated_text": "주민등록등본", "timestamp": "2026-01-01"})
+    ids = [result["archive_id"] for result in firebase_config.save_archives_batch(items)]
+
+    page = firebase_config.search_archives_query(USER, "주민등록", None, 10)
+
+    assert [archive["archive_id"] for archive in page["archives"]] == [ids[-1]]
+    assert not page["has_more"]
+
+    _seed(300)
+    cursor = None
+    while True:
+        page = firebase_config.search_archives_query(USER, "주민등록", cursor, 3)
+        assert page["archives"] or not page["has_more"]
+        if not page["has_more"]:
+            break
+        cursor = page["next_cursor"]
+
+
+def test_composite_index_is_committed():
+    config = json.loads((Path(__file__).parent.parent / "firestore.indexes.json").read_text(encoding="utf-8"))
+    fields = [
+        [(field["fieldPath"], field.get("order") or field.get("arrayConfig")) for field in index["fields"]]
+        for index in config["indexes"] if index["collectionGroup"] == "archives"
+    ]
+
+    assert [
+        ("user_id", "ASCENDING"),
+        (archiveIndex.TOKEN_FIELD, "CONTAINS"),
+        ("timestamp", "DESCENDING"),
+        ("__name__", "DESCENDING"),
+    ] in fields
+
+
+def test_delete_removes_archive_from_search(db):
+    ids = _seed(100)
+
+    firebase_config.delete_archive(USER, ids[0])
+    results = firebase_config.delete_archives_batch(USER, [ids[50], ids[1]])
+
+    assert [r["status"] for r in results] == ["deleted", "deleted"]
+    assert _search_all("주민등록") == []
+
+
+def test_tokens_are_bounded_and_rebuild_fills_old_archives(db, monkeypatch):
+    monkeypatch.setattr(Global.env, "ARCHIVE_SEARCH_MAX_TOKENS", 20)
+    long_text = "".join(chr(0xAC00 + i) for i in range(5000))
+    firebase_config.save_archive(USER, long_text, "2026-01-01")
+    (doc,) = db.docs("archives").values()
+    assert len(doc[archiveIndex.TOKEN_FIELD]) == 20
+
+    # 토큰 필드가 없던 예전 문서와 예전 postings 색인 문서
+    db.docs("archives")["old"] = {"user_id": USER, "translated_text": "주민등록등본", "timestamp": doc["timestamp"]}
+    db.docs(archiveIndex.LEGACY_INDEX_COLLECTION)[f"{USER}:주민"] = {"user_id": USER, "postings": {}}
+    assert archiveIndex.rebuild(db, 20, USER) == 2
+    assert "old" in _search_all("주민등록")
+    assert db.docs(archiveIndex.LEGACY_INDEX_COLLECTION) == {}
+
+
+def test_search_route_caps_limit(db):
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(archive_router.search_archives("주민", cursor=None, limit=10_000, user=USER))
+    assert error.value.status_code == 400
+
+
+@pytest.mark.parametrize("count", [100, 1_000, 10_000])
+def test_search_cost_does_not_grow_with_history(db, count):
+    """사용자 아카이브 수가 늘어도 검색 1회의 왕복/읽는 문서 수는 후보 확인 한도 안에 머묾"""
+    _seed(count)
+    db.round_trips = db.docs_read = 0
+
+    started = time.perf_counter()
+    page = firebase_config.search_archives_query(USER, "주민등록", None, 10)
+    elapsed = time.perf_counter() - started
+
+    scan_limit = Global.env.ARCHIVE_SEARCH_SCAN_LIMIT
+    print(f"\n{count} archives: {db.round_trips} round trips, {db.docs_read} docs read, {elapsed * 1000:.1f} ms (fake)")
+    assert len(page["archives"]) == min(10, (count + 49) // 50)
+    # 후보 구간 + 남은 후보 확인용 1개 + 결과 페이지 본문
+    assert db.docs_read <= scan_limit + 1 + 10
+    assert db.round_trips <= scan_limit // firebase_config.SEARCH_SCAN_CHUNK + 2
@@ -0,0 +1,71 @@
+import asyncio
+import time
+
+import pytest
+
+from app import firebase_config
+from app.services import archiveIndex
+from tests.fake_firestore import FakeFirestore
+
+COMMIT_LATENCY = 0.005
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeFirestore(latency=COMMIT_LATENCY)
+    monkeypatch.setattr(firebase_config, "get_db", lambda: db)
+    return db
+
+
+def test_one_users_failed_batch_does_not_fail_other_users(db):
+    """같은 flush 에 묶여도 각 호출자는 자기 사용자 배치의 결과만 받아야 함"""
+    db.fail_commit = lambda writes: any(archive["user_id"] == "bad" for _, _, archive, _ in writes)
+
+    async def run():
+        saves = [
+            firebase_config.asave_archive(user, f"{user} 번역 {i}", "2026-01-01")
+            for i in range(5) for user in ("good", "bad")
+        ]
+        return await asyncio.gather(*saves, return_exceptions=True)
+
+    results = asyncio.run(run())
+
+    good, bad = results[0::2], results[1::2]
+    assert all(isinstance(result, str) for result in good)
+    assert all(isinstance(result, Exception) for result in bad)
+    saved = db.docs("archives").values()
+    assert {archive["user_id"] for archive in saved} == {"good"}
+    # 아카이브 문서마다 검색 토큰/미리보기가 함께 저장됨
+    assert all(archive[archiveIndex.TOKEN_FIELD] and archive[archiveIndex.PREVIEW_FIELD] for archive in saved)
+
+
+def test_batch_api_reports_per_item_results(db):
+    items = [{"translated_text": f"번역 {i}", "timestamp": "2026-01-01"} for i in range(3)]
+    items[1]["timestamp"] = "잘못된 날짜"
+
+    results = asyncio.run(firebase_config.asave_archives_batch("user-1", items))
+
+    assert [result["status"] for result in results] == ["saved", "error", "saved"]
+    assert db.commits == [2]
+
+
+def test_thousand_single_saves_are_coalesced(db):
+    """단건 저장 1,000건이 최대 묶음 크기 단위 커밋으로 합쳐지는지 (왕복 수/시간 비교)"""
+    count = 1_000
+
+    async def run():
+        started = time.perf_counter()
+        ids = await asyncio.gather(*(
+            firebase_config.asave_archive(f"user-{i % 4}", f"번역 {i}", "2026-01-01") for i in range(count)
+        ))
+        return ids, time.perf_counter() - started
+
+    ids, elapsed = asyncio.run(run())
+
+    batch = firebase_config._archive_buffer.max_items
+    print(f"\n{count} saves: {db.round_trips} round trips, {elapsed * 1000:.0f} ms "
+          f"(one set() per save would be {count} round trips, {count * COMMIT_LATENCY * 1000:.0f} ms serial)")
+    assert len(set(ids)) == count
+    # 사용자별로 나눠도 flush 당 사용자 수(4) 이하의 커밋
+    assert db.round_trips <= (count // batch + 1) * 4
+    assert len(db.docs("archives")) == count
@@ -0,0 +1,42 @@
+import asyncio
+import time
+
+from tests.fakes import FakeChatModel, make_service
+
+LATENCY = 0.2
+
+
+def test_parallel_requests_finish_in_about_one_llm_latency():
+    """N 개 동시 요청이 LLM 지연 N 배가 아니라 약 1 배 안에 끝나야 함 (이벤트 루프 비차단)"""
+    llm = FakeChatModel(latency=LATENCY)
+    service = make_service(llm)
+    n = service.graph.scheduler.max_concurrency
+
+    async def run():
+        # 번역 중에도 다른 작업(헬스 체크, SSE 등)이 계속 실행되는지 확인하는 ticker
+        gaps = []
+
+        async def ticker(stop: asyncio.Event):
+            last = time.perf_counter()
+            while not stop.is_set():
+                await asyncio.sleep(0.01)
+                now = time.perf_counter()
+                gaps.append(now - last)
+                last = now
+
+        stop = asyncio.Event()
+        tick = asyncio.create_task(ticker(stop))
+        started = time.perf_counter()
+        results = await asyncio.gather(*(service.atranslate(f"안내문 {i}") for i in range(n)))
+        elapsed = time.perf_counter() - started
+        stop.set()
+        await tick
+        return results, elapsed, max(gaps)
+
+    results, elapsed, max_gap = asyncio.run(run())
+
+    print(f"\n{n}개 동시 요청: {elapsed:.3f}s (LLM 지연 {LATENCY}s, 순차 실행이면 {n * LATENCY:.1f}s)")
+    assert len(results) == n
+    assert llm.calls == n
+    assert elapsed < LATENCY * 2
+    assert max_gap < LATENCY / 2
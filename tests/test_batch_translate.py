@@ -0,0 +1,167 @@
+import asyncio
+import math
+import time
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.config import Global
+from app.routes import easy_translate
+from app.routes.easy_translate import BatchTranslateRequest, easy_translate_batch
+from tests.fakes import FakeChatModel, make_service
+
+
+def _easy(text: str) -> str:
+    return f"쉬운말 {text}"
+
+
+def _batch(service, contents: list[str]) -> list[dict]:
+    return asyncio.run(service.atranslate_batch(contents))
+
+
+def test_results_keep_input_order_and_duplicates_are_translated_once():
+    llm = FakeChatModel(latency=0.01, reply_fn=_easy)
+    service = make_service(llm)
+
+    results = _batch(service, ["성명", "주소", " 성명 ", "", "연락처"])
+
+    assert [item["index"] for item in results] == [0, 1, 2, 3, 4]
+    assert [item.get("translated_text") for item in results] == [
+        "쉬운말 성명", "쉬운말 주소", "쉬운말 성명", None, "쉬운말 연락처"
+    ]
+    assert results[3] == {"index": 3, "original_text": "", "status": "error", "error": "content가 필요합니다"}
+    # 중복을 뺀 미스 3개가 한 프롬프트로 묶여 LLM 호출 1회
+    assert llm.calls == 1
+
+
+def test_cached_items_do_not_wait_for_the_llm():
+    llm = FakeChatModel(latency=0.01, reply_fn=_easy)
+    service = make_service(llm)
+    _batch(service, ["성명", "주소"])
+    llm.latency = 0.5
+
+    async def run():
+        scheduler = service.graph.scheduler
+        release = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot():
+                await release.wait()
+
+        # LLM 실행 자리를 모두 차지한 상태에서도 캐시 적중 항목은 바로 반환
+        holders = [asyncio.create_task(hold()) for _ in range(scheduler.max_concurrency)]
+        await asyncio.sleep(0)
+        started = time.perf_counter()
+        results = await service.atranslate_batch(["주소", "성명", "주소"])
+        elapsed = time.perf_counter() - started
+        release.set()
+        await asyncio.gather(*holders)
+        return results, elapsed
+
+    results, elapsed = asyncio.run(run())
+
+    assert [item["translated_text"] for item in results] == ["쉬운말 주소", "쉬운말 성명", "쉬운말 주소"]
+    assert llm.calls == 1
+    assert elapsed < 0.05
+
+
+def test_failed_pack_is_retried_per_item_so_only_the_bad_item_fails():
+    llm = FakeChatModel(latency=0.01, reply_fn=_easy, fail_on="실패")
+    service = make_service(llm)
+
+    results = _batch(service, ["성명", "실패하는 항목", "주소"])
+
+    assert [item["status"] for item in results] == ["ok", "error", "ok"]
+    assert results[0]["translated_text"] == "쉬운말 성명"
+    assert "번역 중 오류" in results[1]["error"]
+    # 묶음 1회 + 항목별 재시도 3회
+    assert llm.calls == 4
+
+
+def test_unparseable_pack_reply_falls_back_to_per_item_translation():
+    class ChattyModel(FakeChatModel):
+        def _respond(self, messages):
+            response = super()._respond(messages)
+            if len(messages) > 2:
+                response.content = "번역 결과입니다:\n" + response.content
+            return response
+
+    llm = ChattyModel(latency=0.01, reply_fn=_easy)
+    service = make_service(llm)
+
+    results = _batch(service, ["성명", "주소"])
+
+    assert [item["translated_text"] for item in results] == ["쉬운말 성명", "쉬운말 주소"]
+    assert llm.calls == 3
+
+
+def test_route_rejects_whole_batch_up_front_when_queue_is_full(monkeypatch):
+    llm = FakeChatModel(latency=0.01, reply_fn=_easy)
+    service = make_service(llm)
+    monkeypatch.setattr(easy_translate, "get_service", lambda: service)
+    scheduler = service.graph.scheduler
+    monkeypatch.setattr(scheduler, "max_queue", 0)
+
+    async def run():
+        release = asyncio.Event()
+
+        async def hold():
+            async with scheduler.slot():
+                await release.wait()
+
+        holders = [asyncio.create_task(hold()) for _ in range(scheduler.max_concurrency)]
+        await asyncio.sleep(0)
+        request = Request({"type": "http", "method": "POST", "path": "/easy-translate/batch", "headers": []})
+        try:
+            await easy_translate_batch(BatchTranslateRequest(contents=["성명", "주소"]), request)
+        finally:
+            release.set()
+            await asyncio.gather(*holders)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(run())
+
+    assert error.value.status_code == 429
+    assert int(error.value.headers["Retry-After"]) >= 1
+    assert llm.calls == 0
+
+
+def test_500_labels_benchmark():
+    """양식 항목명 500개 (고유 100개): 항목별 호출 대비 LLM 호출 수와 입력 토큰 수"""
+    labels = [f"신청인 {i % 100}번 항목" for i in range(500)]
+    unique = len(set(labels))
+
+    # 기존 방식: 고유 원문마다 atranslate 1회 (BATCH_TRANSLATE_CONCURRENCY 개씩)
+    per_item_llm = FakeChatModel(latency=0.02, reply_fn=_easy)
+    per_item = make_service(per_item_llm)
+
+    async def translate_each():
+        semaphore = asyncio.Semaphore(Global.env.BATCH_TRANSLATE_CONCURRENCY)
+
+        async def translate_one(text: str):
+            async with semaphore:
+                return await per_item.atranslate(text)
+
+        return await asyncio.gather(*(translate_one(text) for text in dict.fromkeys(labels)))
+
+    started = time.perf_counter()
+    asyncio.run(translate_each())
+    per_item_elapsed = time.perf_counter() - started
+
+    packed_llm = FakeChatModel(latency=0.02, reply_fn=_easy)
+    packed = make_service(packed_llm)
+    started = time.perf_counter()
+    results = _batch(packed, labels)
+    packed_elapsed = time.perf_counter() - started
+
+    print(
+        f"\n500 labels ({unique} unique): "
+        f"per-item {per_item_llm.calls} calls / {per_item_llm.input_tokens} input tokens / {per_item_elapsed * 1000:.0f}ms, "
+        f"packed {packed_llm.calls} calls / {packed_llm.input_tokens} input tokens / {packed_elapsed * 1000:.0f}ms"
+    )
+    assert [item["translated_text"] for item in results] == [_easy(text) for text in labels]
+    assert per_item_llm.calls == unique
+    assert packed_llm.calls == math.ceil(unique / Global.env.BATCH_TRANSLATE_PACK_SIZE)
+    # 시스템 프롬프트를 항목마다 보내지 않으므로 입력 토큰이 크게 줄어듦
+    assert packed_llm.input_tokens * 5 < per_item_llm.input_tokens
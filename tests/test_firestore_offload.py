@@ -0,0 +1,52 @@
+import asyncio
+import time
+
+from app import firebase_config
+from app.routes import archive_router, feedback_router
+from tests.fake_firestore import FakeFirestore
+from tests.fakes import FakeChatModel, make_service
+
+FIRESTORE_LATENCY = 0.2
+TOKEN_DELAY = 0.01
+
+
+def test_streaming_is_not_delayed_by_concurrent_firestore_calls(monkeypatch):
+    """Firestore 응답을 기다리는 동안에도 스트리밍 조각은 토큰 간격대로 전달되어야 함"""
+    db = FakeFirestore(latency=FIRESTORE_LATENCY)
+    monkeypatch.setattr(firebase_config, "get_db", lambda: db)
+    llm = FakeChatModel(latency=0.0, token_delay=TOKEN_DELAY, tokens=[f"{i} " for i in range(60)])
+    service = make_service(llm)
+
+    async def stream():
+        gaps = []
+        last = time.perf_counter()
+        async for _ in service.stream_translate("안내문을 쉽게 바꿔 주세요"):
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+        return gaps
+
+    async def firestore_traffic():
+        # 라우터 함수를 그대로 호출 (동기 SDK 호출은 전용 스레드 풀에서 실행되어야 함)
+        await asyncio.sleep(TOKEN_DELAY * 5)
+        calls = []
+        for i in range(10):
+            calls.append(archive_router.save_archive_route(
+                archive_router.ArchiveSaveRequest(translated_text=f"번역 {i}", timestamp="2026-01-01"),
+                user="user-1",
+            ))
+            calls.append(feedback_router.submit_feedback(
+                feedback_router.FeedbackRequest(rating="최고예요"), user="user-1",
+            ))
+        await asyncio.gather(*calls)
+        return await archive_router.get_archives(cursor=None, limit=20, summary=False, user="user-1")
+
+    async def run():
+        return await asyncio.gather(stream(), firestore_traffic())
+
+    gaps, listing = asyncio.run(run())
+
+    assert len(listing["archives"]) == 10
+    assert db.round_trips >= 11
+    # Firestore 호출이 이벤트 루프를 막았다면 조각 사이 간격이 latency(0.2s) 이상 벌어짐
+    assert max(gaps) < FIRESTORE_LATENCY / 2
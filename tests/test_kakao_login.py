@@ -0,0 +1,208 @@
+import asyncio
+import statistics
+import time
+
+import httpx
+import pytest
+
+from app import firebase_config
+from app.config import Global
+from app.routes import kakao_auth_router
+from app.utils.http_client import HTTPClientRegistry, request_with_retry
+from tests.fake_firestore import FakeFirestore
+
+FIRESTORE_LATENCY = 0.03
+
+
+@pytest.fixture
+def db(monkeypatch):
+    db = FakeFirestore(latency=FIRESTORE_LATENCY)
+    monkeypatch.setattr(firebase_config, "get_db", lambda: db)
+    monkeypatch.setattr(firebase_config, "_known_users", type(firebase_config._known_users)())
+
+    async def fake_kakao(client, method, url, **kwargs):
+        if url.endswith("/oauth/token"):
+            return httpx.Response(200, json={"access_token": "kakao-token", "expires_in": 3600})
+        return httpx.Response(200, json={
+            "id": 1234,
+            "kakao_account": {"email": "user@example.com", "profile": {"nickname": "홍길동"}},
+        })
+
+    monkeypatch.setattr(kakao_auth_router, "request_with_retry", fake_kakao)
+    return db
+
+
+def _login() -> float:
+    started = time.perf_counter()
+    response = asyncio.run(kakao_auth_router.kakao_login(code="code"))
+    assert response.headers["location"].startswith("myapp://auth?access_token=")
+    return time.perf_counter() - started
+
+
+def test_repeat_login_skips_firestore_until_ttl_expires(db, monkeypatch):
+    first = _login()
+    repeat = _login()
+
+    print(f"\nfirst login: {first * 1000:.1f} ms, repeat login: {repeat * 1000:.1f} ms "
+          f"(Firestore latency {FIRESTORE_LATENCY * 1000:.0f} ms)")
+    # 첫 로그인은 create 1회, 재로그인은 Firestore 호출 없음
+    assert db.calls == ["create"]
+    assert repeat < FIRESTORE_LATENCY
+
+    # TTL 이 지나면 다시 확인 (그 사이 사용자 문서가 지워졌다면 다시 생성)
+    db.docs("users").clear()
+    monkeypatch.setattr(Global.env, "KNOWN_USER_CACHE_TTL_SECONDS", 0)
+    _login()
+    assert db.calls == ["create", "create"]
+    assert len(db.docs("users")) == 1
+
+
+def test_existing_user_is_not_overwritten(db):
+    _login()
+    (user_id,) = db.docs("users")
+    db.docs("users")[user_id]["nickname"] = "바뀐 이름"
+    firebase_config._known_users.clear()
+
+    _login()
+
+    assert db.docs("users")[user_id]["nickname"] == "바뀐 이름"
+
+
+class CountingTransport(httpx.AsyncBaseTransport):
+    """경로별 호출 수를 세고 응답 대신 정해진 결과(예외 또는 상태 코드 목록)를 돌려주는 가짜 전송 계층"""
+
+    def __init__(self, outcomes: dict):
+        self.outcomes = {path: list(outcome) for path, outcome in outcomes.items()}
+        self.calls: dict[str, int] = {}
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        self.calls[path] = self.calls.get(path, 0) + 1
+        outcome = self.outcomes[path].pop(0) if len(self.outcomes[path]) > 1 else self.outcomes[path][0]
+        if isinstance(outcome, type) and issubclass(outcome, Exception):
+            raise outcome("가짜 전송 오류", request=request)
+        return httpx.Response(outcome, json={"access_token": "kakao-token"}, request=request)
+
+
+def _retry(transport: CountingTransport, method: str, path: str):
+    async def run():
+        async with httpx.AsyncClient(transport=transport, base_url="https://kauth.kakao.com") as client:
+            return await request_with_retry(client, method, path, retries=2)
+
+    return asyncio.run(run())
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(Global.env, "HTTP_CLIENT_BACKOFF_SECONDS", 0.0)
+
+
+@pytest.mark.parametrize("outcome", [httpx.ReadTimeout, httpx.RemoteProtocolError, 500, 503])
+def test_authorization_code_post_is_never_resent(no_backoff, outcome):
+    transport = CountingTransport({"/oauth/token": [outcome]})
+
+    if isinstance(outcome, int):
+        assert _retry(transport, "POST", "/oauth/token").status_code == outcome
+    else:
+        with pytest.raises(outcome):
+            _retry(transport, "POST", "/oauth/token")
+
+    assert transport.calls == {"/oauth/token": 1}
+
+
+def test_post_is_retried_only_when_it_never_reached_the_server(no_backoff):
+    transport = CountingTransport({"/oauth/token": [httpx.ConnectError, httpx.ConnectTimeout, 200]})
+
+    assert _retry(transport, "POST", "/oauth/token").status_code == 200
+    assert transport.calls == {"/oauth/token": 3}
+
+
+def test_idempotent_get_is_retried_after_timeout_and_5xx(no_backoff):
+    transport = CountingTransport({"/v2/user/me": [httpx.ReadTimeout, 503, 200]})
+
+    assert _retry(transport, "GET", "/v2/user/me").status_code == 200
+    assert transport.calls == {"/v2/user/me": 3}
+
+
+@pytest.mark.parametrize("outcome", [httpx.ReadTimeout, 502])
+def test_login_sends_the_authorization_code_once(no_backoff, monkeypatch, outcome):
+    transport = CountingTransport({"/oauth/token": [outcome]})
+    client = httpx.AsyncClient(transport=transport)
+    monkeypatch.setattr(kakao_auth_router, "get_http_client", lambda name: client)
+
+    with pytest.raises((httpx.ReadTimeout, kakao_auth_router.HTTPException)):
+        asyncio.run(kakao_auth_router.kakao_login(code="code"))
+
+    assert transport.calls == {"/oauth/token": 1}
+
+
+async def _mock_server(delay: float):
+    """keep-alive 를 지원하는 최소 HTTP/1.1 서버 (카카오 API 대역)"""
+    body = b'{"access_token":"kakao-token"}'
+    response = (
+        b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+        b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body
+    )
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line.lower().startswith(b"content-length:"):
+                        length = int(line.split(b":", 1)[1])
+                await reader.readexactly(length)
+                await asyncio.sleep(delay)
+                writer.write(response)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    return await asyncio.start_server(handle, "127.0.0.1", 0)
+
+
+def test_shared_client_latency_benchmark(monkeypatch):
+    """가짜 카카오 서버 대상 요청 지연 p50/p99: 요청마다 새 클라이언트 vs 공유 keep-alive 클라이언트"""
+    requests = 200
+    monkeypatch.setattr(Global.env, "HTTP_CLIENT_HTTP2", False)
+
+    async def run():
+        server = await _mock_server(delay=0.001)
+        url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/oauth/token"
+        results = {}
+
+        # 기존 방식: 요청마다 AsyncClient 생성 (SSL 컨텍스트 생성 + 새 TCP 연결)
+        latencies = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            async with httpx.AsyncClient() as client:
+                await client.post(url, data={"code": "code"})
+            latencies.append(time.perf_counter() - started)
+        results["per-request client"] = latencies
+
+        registry = HTTPClientRegistry()
+        client = registry.get("kakao_bench")
+        latencies = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            await request_with_retry(client, "POST", url, data={"code": "code"})
+            latencies.append(time.perf_counter() - started)
+        results["shared client"] = latencies
+
+        await registry.aclose()
+        server.close()
+        await server.wait_closed()
+        return results
+
+    results = asyncio.run(run())
+
+    summary = {}
+    for name, latencies in results.items():
+        latencies.sort()
+        summary[name] = (statistics.median(latencies), latencies[int(len(latencies) * 0.99)])
+        print(f"\n{name}: p50 {summary[name][0] * 1000:.2f}ms, p99 {summary[name][1] * 1000:.2f}ms")
+    assert summary["shared client"][0] < summary["per-request client"][0]
+    assert summary["shared client"][1] < summary["per-request client"][1]
@@ -0,0 +1,199 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+from langchain_core.messages import HumanMessage, SystemMessage
+from starlette.requests import Request
+
+from app.agent.easyTranslate.llm import ScheduledLLM
+from app.agent.easyTranslate.prompt import EasyTranslatePrompt
+from app.routes import easy_translate
+from app.routes.easy_translate import TranslateRequest
+from app.utils.llm_scheduler import LLMScheduler, Priority, SchedulerOverloaded, TokenBucket
+from tests.fakes import FakeChatModel, make_service
+
+SHORT = "주민센터에 신분증을 가져오세요."
+LONG = "신청서 작성 방법을 안내합니다. " * 400
+
+
+def _messages(text: str) -> list:
+    return [SystemMessage(content=EasyTranslatePrompt.system_prompt), HumanMessage(content=text)]
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+async def _hold(scheduler: LLMScheduler, release: asyncio.Event, count: int):
+    """실행 자리를 count 개 차지한 채 release 까지 대기하는 태스크들"""
+    async def hold():
+        async with scheduler.slot(priority=Priority.INTERACTIVE):
+            await release.wait()
+
+    holders = [asyncio.create_task(hold()) for _ in range(count)]
+    await asyncio.sleep(0)
+    return holders
+
+
+def test_token_bucket_reserves_and_refills():
+    clock = FakeClock()
+    bucket = TokenBucket(per_minute=600, clock=clock)
+
+    assert bucket.reserve(600) == 0.0
+    # 초당 10개씩 차므로 50개가 모자라면 5초
+    assert bucket.reserve(50) == pytest.approx(5.0)
+    clock.now = 5.0
+    assert bucket.reserve(0) == 0.0
+    # 버킷보다 큰 요청은 가득 찬 버킷 하나만큼만 기다림
+    clock.now = 65.0
+    assert bucket.reserve(10_000) == 0.0
+    bucket.refund(600)
+    assert bucket.reserve(600) == 0.0
+
+
+def test_interactive_requests_run_before_queued_bulk_requests():
+    llm = FakeChatModel(latency=0.01)
+    scheduler = LLMScheduler(max_concurrency=1, max_queue=10, interactive_max_tokens=500)
+    scheduled = ScheduledLLM(llm, scheduler)
+
+    async def run():
+        release = asyncio.Event()
+        holders = await _hold(scheduler, release, 1)
+        order = []
+
+        async def call(name: str, text: str):
+            await scheduled.ainvoke(_messages(text))
+            order.append(name)
+
+        tasks = []
+        for name, text in (("bulk-1", LONG), ("bulk-2", LONG), ("interactive", SHORT)):
+            tasks.append(asyncio.create_task(call(name, text)))
+            await asyncio.sleep(0)
+        assert scheduler.stats()["queue_depth_by_lane"] == {"interactive": 1, "bulk": 2}
+        release.set()
+        await asyncio.gather(*holders, *tasks)
+        return order
+
+    assert asyncio.run(run()) == ["interactive", "bulk-1", "bulk-2"]
+    assert llm.calls == 3
+
+
+def test_priority_ignores_the_system_prompt():
+    # 시스템 프롬프트만으로도 대화형 한도를 넘도록 작게 설정
+    scheduler = LLMScheduler(max_concurrency=1, max_queue=10, interactive_max_tokens=100)
+    scheduled = ScheduledLLM(FakeChatModel(latency=0.0), scheduler)
+    lanes = []
+
+    original = scheduler.slot
+
+    def slot(tokens=0, priority=None):
+        lanes.append((tokens, priority))
+        return original(tokens, priority)
+
+    scheduler.slot = slot
+    asyncio.run(scheduled.ainvoke(_messages(SHORT)))
+    asyncio.run(scheduled.ainvoke(_messages(LONG)))
+
+    (short_tokens, short_lane), (_, long_lane) = lanes
+    assert short_tokens > 100
+    assert short_lane is Priority.INTERACTIVE
+    assert long_lane is Priority.BULK
+
+
+def test_rate_limited_request_waits_without_holding_a_slot():
+    llm = FakeChatModel(latency=0.0)
+    # 초당 100 토큰: 버킷을 다 쓴 뒤 50 토큰 요청은 0.5초 대기
+    scheduler = LLMScheduler(max_concurrency=1, max_queue=10, tokens_per_minute=6000)
+
+    async def run():
+        async with scheduler.slot(6000):
+            pass
+        throttled = asyncio.create_task(scheduled_call(50))
+        await asyncio.sleep(0.1)
+        # 속도 제한으로 기다리는 동안 실행 자리를 차지하지 않음 (대기 건수에는 포함)
+        stats = scheduler.stats()
+        backlog = scheduler._backlog()
+        return stats["running"], backlog, await throttled
+
+    async def scheduled_call(tokens: int) -> float:
+        started = time.perf_counter()
+        async with scheduler.slot(tokens):
+            await llm.ainvoke([HumanMessage(content=SHORT)])
+        return time.perf_counter() - started
+
+    running, backlog, throttled_elapsed = asyncio.run(run())
+
+    assert running == 0
+    assert backlog == 1
+    assert 0.45 < throttled_elapsed < 0.8
+
+
+def test_retry_after_scales_with_backlog_and_service_time():
+    clock = FakeClock()
+    scheduler = LLMScheduler(max_concurrency=2, max_queue=10, clock=clock)
+    assert scheduler.retry_after() == 1
+
+    async def run():
+        # 평균 처리 시간 2초인 호출 4건
+        for _ in range(4):
+            async with scheduler.slot():
+                clock.now += 2.0
+        release = asyncio.Event()
+        holders = await _hold(scheduler, release, 2)
+        queued = await _hold(scheduler, release, 3)
+        retry_after = scheduler.retry_after()
+        release.set()
+        await asyncio.gather(*holders, *queued)
+        return retry_after
+
+    # 2초 × (대기 3 + 1) / 동시 실행 2
+    assert asyncio.run(run()) == 4
+
+
+def test_full_queue_raises_scheduler_overloaded():
+    scheduler = LLMScheduler(max_concurrency=1, max_queue=1)
+
+    async def run():
+        release = asyncio.Event()
+        holders = await _hold(scheduler, release, 2)
+        try:
+            async with scheduler.slot():
+                pass
+        finally:
+            release.set()
+            await asyncio.gather(*holders)
+
+    with pytest.raises(SchedulerOverloaded) as error:
+        asyncio.run(run())
+    assert error.value.retry_after >= 1
+    assert scheduler.rejected == 1
+
+
+def test_route_returns_429_with_retry_after_when_queue_is_full(monkeypatch):
+    llm = FakeChatModel(latency=0.01)
+    service = make_service(llm)
+    monkeypatch.setattr(easy_translate, "get_service", lambda: service)
+    scheduler = service.graph.scheduler
+    monkeypatch.setattr(scheduler, "max_queue", 0)
+
+    async def run():
+        release = asyncio.Event()
+        holders = await _hold(scheduler, release, scheduler.max_concurrency)
+        request = Request({"type": "http", "method": "POST", "path": "/easy-translate", "headers": []})
+        try:
+            await easy_translate.easy_translate(TranslateRequest(content=SHORT), request)
+        finally:
+            release.set()
+            await asyncio.gather(*holders)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(run())
+
+    assert error.value.status_code == 429
+    assert int(error.value.headers["Retry-After"]) >= 1
+    assert llm.calls == 0
@@ -0,0 +1,118 @@
+import logging
+
+from app.utils import log_rotation
+from app.utils.log_rotation import SizeAndTimeRotatingFileHandler, find_request, list_segments
+
+
+class CountingFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(message)s")
+        self.calls = 0
+
+    def format(self, record):
+        self.calls += 1
+        return super().format(record)
+
+
+def _record(message: str, request_id: str = None) -> logging.LogRecord:
+    record = logging.LogRecord("test", logging.INFO, __file__, 0, message, None, None)
+    if request_id:
+        record.request_id = request_id
+    return record
+
+
+def _wait_for_compressor():
+    log_rotation._compressor.submit(lambda: None).result()
+
+
+def test_each_record_is_formatted_once(tmp_path):
+    handler = SizeAndTimeRotatingFileHandler(tmp_path / "app.log", max_bytes=200, compression="none")
+    formatter = CountingFormatter()
+    handler.setFormatter(formatter)
+
+    for i in range(100):
+        handler.handle(_record(f"message {i:03d} " + "x" * 20))
+    handler.close()
+
+    assert formatter.calls == 100
+    assert len(list_segments(tmp_path / "app.log")) > 5
+
+
+def test_retention_runs_after_compression(tmp_path):
+    base = tmp_path / "app.log"
+    handler = SizeAndTimeRotatingFileHandler(base, max_bytes=100, compression="gzip", max_segments=3)
+    handler.setFormatter(logging.Formatter("%(request_id)s %(message)s"))
+
+    for i in range(200):
+        handler.handle(_record(f"request {i:03d} " + "y" * 40, request_id=f"req-{i:03d}"))
+    handler.close()
+    _wait_for_compressor()
+
+    segments = list_segments(base)
+    files = sorted(path.name for path in tmp_path.iterdir())
+    # 압축이 끝난 조각만 남고, 보관 개수를 넘은 조각은 원본/압축본/색인 모두 삭제
+    assert len(segments) == 3
+    assert all(log_rotation._segment_file(segment).suffix == ".gz" for segment in segments)
+    assert len(files) == 3 * 2 + 1
+    assert len(list(find_request(base, "req-198"))) == 1
+
+
+def test_size_limit_counts_encoded_bytes(tmp_path):
+    base = tmp_path / "app.log"
+    handler = SizeAndTimeRotatingFileHandler(base, max_bytes=300, compression="none")
+    handler.setFormatter(logging.Formatter("%(message)s"))
+
+    # 한글은 UTF-8 로 3바이트
+    for i in range(50):
+        handler.handle(_record(f"번역 요청 {i:03d} " + "가" * 20))
+    handler.close()
+
+    files = [log_rotation._segment_file(segment) for segment in list_segments(base)] + [base]
+    assert len(files) > 5
+    assert all(path.stat().st_size <= 300 for path in files)
+
+
+def test_retention_does_not_reread_index_files(tmp_path, monkeypatch):
+    base = tmp_path / "app.log"
+    handler = SizeAndTimeRotatingFileHandler(base, max_bytes=100, compression="none", max_segments=3)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    reads = []
+    original = log_rotation._index_end
+    monkeypatch.setattr(log_rotation, "_index_end", lambda segment: reads.append(segment) or original(segment))
+
+    for i in range(200):
+        handler.handle(_record(f"message {i:03d} " + "z" * 40))
+    handler.close()
+
+    assert reads == []
+    assert len(list_segments(base)) == 3
+
+    # 재시작하면 남아 있는 조각 색인을 한 번만 읽어 목록을 복원
+    restarted = SizeAndTimeRotatingFileHandler(base, max_bytes=100, compression="none", max_segments=2)
+    restarted.setFormatter(logging.Formatter("%(message)s"))
+    assert len(reads) == 3
+    for i in range(3):
+        restarted.handle(_record(f"after restart {i} " + "z" * 80))
+    restarted.close()
+    assert len(list_segments(base)) == 2
+
+
+def test_bloom_filter_is_sized_from_max_bytes(tmp_path):
+    small = SizeAndTimeRotatingFileHandler(tmp_path / "small.log", max_bytes=1024 * 1024, compression="none")
+    large = SizeAndTimeRotatingFileHandler(tmp_path / "large.log", max_bytes=100 * 1024 * 1024, compression="none")
+    try:
+        assert small._bloom.bits * 50 < large._bloom.bits
+        assert small.bloom_capacity == 1024
+    finally:
+        small.close()
+        large.close()
+
+
+def test_zstd_falls_back_to_gzip_with_a_warning(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(log_rotation, "_zstd", lambda: None)
+
+    handler = SizeAndTimeRotatingFileHandler(tmp_path / "app.log", max_bytes=100, compression="zstd")
+    handler.close()
+
+    assert handler.compression == "gzip"
+    assert "gzip" in capsys.readouterr().err
@@ -0,0 +1,87 @@
+import io
+import logging
+import queue
+import statistics
+import time
+
+from app.config import Global
+from app.utils.logger import DropCountingQueueHandler, EasyTranslateLogger
+from app.utils.metrics import LOG_RECORDS_DROPPED
+
+LINES_PER_REQUEST = 5
+
+
+def _logger(monkeypatch, tmp_path, name: str, async_: bool) -> EasyTranslateLogger:
+    tmp_path.mkdir(parents=True, exist_ok=True)
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(Global.env, "LOG_ASYNC", async_)
+    logger = EasyTranslateLogger(name)
+    # 콘솔 출력은 테스트 결과를 어지럽히지 않도록 메모리로
+    logger._handlers[0].setStream(io.StringIO())
+    return logger
+
+
+def _close(logger: EasyTranslateLogger):
+    logger.shutdown()
+    for handler in logger._handlers:
+        logger.logger.removeHandler(handler)
+        handler.close()
+
+
+def test_shutdown_is_idempotent_and_skips_closed_streams(monkeypatch, tmp_path):
+    logger = _logger(monkeypatch, tmp_path, "test_shutdown", async_=True)
+    logger.info("종료 전 로그")
+    # 인터프리터 종료 시처럼 콘솔 스트림이 먼저 닫힌 상태
+    logger._handlers[0].stream.close()
+
+    logger.shutdown()
+    logger.shutdown()
+    logger.info("종료 후 로그")
+
+    assert logger._listener is None
+    assert logger._handlers[0] not in logger.logger.handlers
+    _close(logger)
+    assert "종료 후 로그" in (tmp_path / "logs" / "easy_translate.log").read_text(encoding="utf-8")
+
+
+def test_dropped_records_are_counted_and_exported():
+    handler = DropCountingQueueHandler(queue.Queue(maxsize=1))
+    before = LOG_RECORDS_DROPPED.samples()[()][0]
+
+    for i in range(3):
+        handler.handle(logging.LogRecord("test", logging.INFO, __file__, 0, f"message {i}", None, None))
+
+    assert handler.dropped == 2
+    assert LOG_RECORDS_DROPPED.samples()[()][0] - before == 2
+
+
+def _request_costs(logger: EasyTranslateLogger, requests: int) -> list[float]:
+    """요청 1건 (로그 LINES_PER_REQUEST 줄) 당 요청 경로에서 쓴 시간"""
+    costs = []
+    for i in range(requests):
+        started = time.perf_counter()
+        for line in range(LINES_PER_REQUEST):
+            logger.info(f"번역 요청 처리 {line}", request_id=f"req-{i:06d}", text_length=120)
+        costs.append(time.perf_counter() - started)
+    return costs
+
+
+def test_logging_overhead_at_1k_rps_benchmark(monkeypatch, tmp_path):
+    """1k RPS (1초 분량 요청 1000건) 에서 요청 경로의 로깅 비용: 동기 핸들러 vs 비동기 큐"""
+    results = {}
+    for async_ in (False, True):
+        logger = _logger(monkeypatch, tmp_path / str(async_), f"bench_{async_}", async_=async_)
+        costs = sorted(_request_costs(logger, 1000))
+        _close(logger)
+        results[async_] = costs
+        assert logger.dropped == 0
+
+    for async_, costs in results.items():
+        p99 = costs[int(len(costs) * 0.99)]
+        # 요청당 평균 비용 × 1000 요청 = 1초 중 로깅에 쓴 비율
+        share = statistics.fmean(costs) * 1000
+        print(
+            f"\n{'async' if async_ else 'sync '}: p50 {statistics.median(costs) * 1e6:.0f}µs, "
+            f"p99 {p99 * 1e6:.0f}µs per request, {share * 100:.1f}% of a core at 1k RPS"
+        )
+    assert statistics.median(results[True]) < statistics.median(results[False])
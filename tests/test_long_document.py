@@ -0,0 +1,155 @@
+import asyncio
+import math
+import re
+import time
+
+import pytest
+
+from app.agent.easyTranslate.splitter import estimate_tokens, split_document
+from app.config import Global
+from tests.fakes import FakeChatModel, make_service
+
+SENTENCE = "주민센터에 신청서를 내고 신분증을 꼭 보여 주세요."
+
+
+def _paragraph(index: int, sentences: int = 3) -> str:
+    return f"문단{index:04d} " + " ".join([SENTENCE] * sentences)
+
+
+def _document(chars: int) -> str:
+    paragraphs = []
+    while sum(len(p) + 2 for p in paragraphs) < chars:
+        paragraphs.append(_paragraph(len(paragraphs)))
+    return "\n\n".join(paragraphs)
+
+
+def _tag(text: str) -> str:
+    """가짜 번역문: 청크에 들어 있는 문단 번호 목록"""
+    return ",".join(re.findall(r"문단\d{4}", text))
+
+
+def test_paragraphs_are_packed_up_to_the_token_budget():
+    paragraphs = [_paragraph(i) for i in range(20)]
+    # 문단 3개 + 구분자 2개
+    budget = estimate_tokens(paragraphs[0]) * 3 + 2
+
+    chunks = split_document("\n\n".join(paragraphs), budget)
+
+    assert all(estimate_tokens(chunk) <= budget for chunk in chunks)
+    assert [len(chunk.split("\n\n")) for chunk in chunks] == [3] * 6 + [2]
+    # 이어 붙이면 원문 순서 그대로
+    assert "\n\n".join(chunks) == "\n\n".join(paragraphs)
+
+
+def test_oversized_paragraph_falls_back_to_sentences_then_characters():
+    big = _paragraph(0, sentences=10)
+    run_on = "가" * 150
+    budget = estimate_tokens(SENTENCE) * 2 + 5
+
+    chunks = split_document(f"{big}\n\n{run_on}\n\n{_paragraph(1)}", budget)
+
+    assert all(estimate_tokens(chunk) <= budget for chunk in chunks)
+    # 큰 문단은 문장 경계에서 잘림 (문장 중간에서 자르지 않음)
+    big_chunks = [chunk for chunk in chunks if SENTENCE in chunk and "가" * 10 not in chunk][:-1]
+    assert len(big_chunks) > 2 and all(chunk.endswith(".") for chunk in big_chunks)
+    # 마침표 없는 긴 문장은 글자 수로 잘림
+    assert [chunk for chunk in chunks if set(chunk) == {"가"}] == [
+        "가" * budget, "가" * budget, "가" * (150 - 2 * budget)
+    ]
+    # 공백을 빼면 내용과 순서가 원문과 같음
+    squeeze = lambda value: re.sub(r"\s+", "", value)
+    assert squeeze("".join(chunks)) == squeeze(big + run_on + _paragraph(1))
+
+
+def test_long_graph_merges_chunks_in_original_order():
+    llm = FakeChatModel(latency=0.01, reply_fn=_tag)
+    service = make_service(llm)
+    text = _document(20_000)
+
+    state = asyncio.run(service.graph.arun(text))
+
+    chunks = split_document(text, Global.env.LONG_DOC_CHUNK_TOKENS)
+    translated = "".join(state["translated"]).split("\n\n")
+    assert llm.calls == len(chunks) > 1
+    assert translated == [_tag(chunk) for chunk in chunks]
+
+
+def _stream_long(service, text: str):
+    """long_graph 스트림을 원문 순서의 조각으로 (캐시/합치기 계층 없이)"""
+    return service._in_order(service.graph.stream_long(text))
+
+
+class _FirstChunkSlowest(FakeChatModel):
+    """앞 청크일수록 늦게 끝나는 가짜 LLM (완료 순서가 원문 순서와 반대)"""
+
+    async def astream(self, messages, **kwargs):
+        first = int(re.search(r"문단(\d{4})", str(messages[-1].content)).group(1))
+        await asyncio.sleep(max(0.0, 0.2 - first * 0.002))
+        async for token in super().astream(messages, **kwargs):
+            yield token
+
+
+def test_stream_long_yields_chunks_in_original_order():
+    llm = _FirstChunkSlowest(latency=0.0, reply_fn=_tag)
+    service = make_service(llm)
+    text = _document(20_000)
+
+    async def run():
+        return "".join([delta async for delta in service.stream_translate(text)])
+
+    streamed = asyncio.run(run())
+
+    chunks = split_document(text, Global.env.LONG_DOC_CHUNK_TOKENS)
+    assert streamed.split("\n\n") == [_tag(chunk) for chunk in chunks]
+
+
+def test_stream_long_closes_every_chunk_stream_on_disconnect():
+    llm = FakeChatModel(latency=0.0, token_delay=0.01, reply_fn=lambda text: "가" * 200)
+    service = make_service(llm)
+    text = _document(20_000)
+
+    async def run():
+        stream = _stream_long(service, text)
+        await stream.__anext__()
+        await stream.aclose()
+        # aclose 가 끝난 시점에 모든 청크 스트림이 이미 정리되어 있어야 함
+        return llm.tokens_emitted, llm.stream_calls, llm.streams_closed
+
+    emitted, calls, closed = asyncio.run(run())
+
+    assert calls == Global.env.LONG_DOC_MAX_CONCURRENCY
+    assert closed == calls
+    assert emitted < calls * 200
+
+
+@pytest.mark.parametrize("chars", [1_000, 10_000, 50_000])
+def test_long_document_latency_benchmark(chars):
+    """문서 길이별 전체 번역 시간과 스트리밍 첫 조각까지의 시간 (LLM 호출당 50ms 가짜 지연)"""
+    latency = 0.05
+    text = _document(chars)
+
+    llm = FakeChatModel(latency=latency, reply_fn=_tag)
+    service = make_service(llm)
+    started = time.perf_counter()
+    asyncio.run(service.graph.arun(text))
+    elapsed = time.perf_counter() - started
+
+    stream_llm = FakeChatModel(latency=latency, reply_fn=_tag)
+    stream_service = make_service(stream_llm)
+
+    async def first_delta():
+        stream = _stream_long(stream_service, text)
+        started = time.perf_counter()
+        await stream.__anext__()
+        ttft = time.perf_counter() - started
+        await stream.aclose()
+        return ttft
+
+    ttft = asyncio.run(first_delta())
+
+    calls = llm.calls
+    rounds = math.ceil(calls / Global.env.LONG_DOC_MAX_CONCURRENCY)
+    print(f"\n{chars} chars: {calls} LLM calls, total {elapsed * 1000:.0f}ms, first delta {ttft * 1000:.0f}ms")
+    # 청크는 LONG_DOC_MAX_CONCURRENCY 개씩 병렬 실행, 첫 조각은 첫 청크 응답 시간만큼만 기다림
+    assert elapsed < rounds * latency + 0.5
+    assert ttft < latency * 3
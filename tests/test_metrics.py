@@ -0,0 +1,47 @@
+import threading
+import time
+
+from app.utils.metrics import MetricsRegistry
+
+THREADS = 8
+PER_THREAD = 20_000
+
+
+def test_sharded_values_add_up_across_threads():
+    registry = MetricsRegistry()
+    histogram = registry.histogram("test_seconds", "test", ["route"], buckets=(0.1, 1.0))
+    counter = registry.counter("test_total", "test")
+    child = histogram.labels("/x")
+
+    def work():
+        for i in range(PER_THREAD):
+            child.observe(0.05 if i % 2 else 0.5)
+            counter.inc()
+
+    threads = [threading.Thread(target=work) for _ in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    buckets = histogram.samples()[("/x",)]
+    total = THREADS * PER_THREAD
+    assert buckets[-1] == total
+    assert buckets[0] == buckets[1] == total / 2
+    assert counter.samples()[()] == [total]
+    assert 'test_seconds_bucket{route="/x",le="0.1"} ' + str(total // 2) in registry.render()
+
+
+def test_observe_overhead():
+    """기록 1회 비용 측정 (요청/토큰 경로에서 호출되므로 수 µs 이내여야 함)"""
+    registry = MetricsRegistry()
+    child = registry.histogram("bench_seconds", "bench", ["route"]).labels("/bench")
+    count = 200_000
+
+    started = time.perf_counter()
+    for _ in range(count):
+        child.observe(0.123)
+    per_call = (time.perf_counter() - started) / count
+
+    print(f"\nhistogram observe: {per_call * 1e6:.2f} µs/call")
+    assert per_call < 5e-6
@@ -0,0 +1,144 @@
+import asyncio
+import os
+import resource
+import threading
+import time
+
+import fitz
+import pytest
+
+from app.services import pdfPipeline
+from app.services.pdfPipeline import PageBoundaryScanner, iter_pages, shutdown_pdf_executor
+
+
+def _make_pdf(path, pages):
+    doc = fitz.open()
+    for text in pages:
+        doc.new_page().insert_text((72, 72), text, fontname="korea")
+    doc.save(path)
+
+
+def test_boundary_match_is_found_regardless_of_page_order():
+    for order in ((0, 1), (1, 0)):
+        scanner = PageBoundaryScanner(carry=100)
+        texts = {0: "안내문\n성명: 홍\n", 1: "길동\n감사합니다\n"}
+        found = []
+        for index in order:
+            found.extend(scanner.add(index, texts[index]))
+        assert found == [(0, ["이름"])]
+
+
+def test_split_number_is_found_and_in_page_matches_are_not_repeated():
+    scanner = PageBoundaryScanner(carry=100)
+    # 앞 페이지 안에 있는 전화번호는 페이지 검사에서 이미 찾으므로 경계 결과에 넣지 않음
+    assert scanner.add(0, "연락처 010-1234-5678\n등록번호 900101-\n") == []
+    assert scanner.add(1, "1234567 입니다\n") == [(0, ["주민등록번호"])]
+
+
+def test_pdf_pages_are_extracted_in_clean_worker_processes(tmp_path):
+    path = str(tmp_path / "notice.pdf")
+    _make_pdf(path, ["안내문\n성명: 홍", "길동\n감사합니다"])
+
+    async def run():
+        scanner = PageBoundaryScanner(carry=100)
+        found = []
+        async for _, index, text in iter_pages(path):
+            found.extend(scanner.add(index, text))
+        return found
+
+    try:
+        assert asyncio.run(run()) == [(0, ["이름"])]
+        # 서버 프로세스를 fork 하지 않고 새로 띄운 워커를 씀
+        assert pdfPipeline._executor._mp_context.get_start_method() in ("forkserver", "spawn")
+    finally:
+        shutdown_pdf_executor()
+
+
+def test_streaming_route_removes_spooled_upload(tmp_path, monkeypatch):
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+    from app.routes import pdf_router
+
+    source = str(tmp_path / "notice.pdf")
+    _make_pdf(source, ["안내문\n성명: 홍", "길동\n감사합니다"])
+    spooled = []
+
+    async def spool(file):
+        path = await pdfPipeline.spool_upload(file)
+        spooled.append(path)
+        return path
+
+    monkeypatch.setattr(pdf_router, "spool_upload", spool)
+    client = TestClient(app)
+    try:
+        with open(source, "rb") as f:
+            response = client.post(
+                "/validate-pdf/streaming?translate=false",
+                files={"file": ("notice.pdf", f, "application/pdf")},
+            )
+    finally:
+        shutdown_pdf_executor()
+
+    assert response.status_code == 200
+    assert '"details":["이름"]' in response.text.replace(" ", "")
+    assert spooled and not os.path.exists(spooled[0])
+
+
+def _rss_bytes() -> int:
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+
+
+def test_200_page_streaming_benchmark(tmp_path, monkeypatch):
+    """200쪽 PDF 스트리밍 검증: 초당 처리 페이지 수와 처리 중 서버 프로세스 최대 RSS 증가량"""
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    if not os.path.exists("/proc/self/statm"):
+        pytest.skip("RSS 측정에 /proc 가 필요합니다")
+
+    pages = 200
+    source = str(tmp_path / "notice.pdf")
+    _make_pdf(source, [f"안내문 {i}쪽\n성명: 홍길동\n연락처 010-1234-{i:04d}\n" + "신청서를 제출해 주세요.\n" * 30 for i in range(pages)])
+
+    baseline = _rss_bytes()
+    peak = baseline
+    sampling = True
+
+    def sample():
+        nonlocal peak
+        while sampling:
+            peak = max(peak, _rss_bytes())
+            time.sleep(0.005)
+
+    sampler = threading.Thread(target=sample)
+    sampler.start()
+    client = TestClient(app)
+    try:
+        started = time.perf_counter()
+        with open(source, "rb") as f:
+            response = client.post(
+                "/validate-pdf/streaming?translate=false",
+                files={"file": ("notice.pdf", f, "application/pdf")},
+            )
+        elapsed = time.perf_counter() - started
+    finally:
+        sampling = False
+        sampler.join()
+        shutdown_pdf_executor()
+    # 종료된 추출 워커 중 가장 큰 최대 RSS (리눅스는 KB 단위)
+    worker_peak = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss * 1024
+
+    growth = peak - baseline
+    print(
+        f"\n{pages} pages: {pages / elapsed:.0f} pages/s ({elapsed * 1000:.0f}ms), "
+        f"server RSS +{growth / 2**20:.1f}MB, worker peak RSS {worker_peak / 2**20:.1f}MB"
+    )
+    assert response.status_code == 200
+    assert response.text.count("event: validate") >= pages
+    assert response.text.rstrip().split("\n\n")[-1].startswith("event: done")
+    # 페이지를 모아 두지 않고 흘려보내므로 서버 메모리 증가가 문서 크기에 비례하지 않음
+    assert growth < 64 * 2**20
+    assert pages / elapsed > 20
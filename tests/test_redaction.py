@@ -0,0 +1,68 @@
+import asyncio
+
+from app.utils.redaction import redact
+from tests.fakes import FakeChatModel, make_service
+
+NOTICE = (
+    "성명: 홍길동\n"
+    "법인등록번호: 110111-1234567\n"
+    "주소: 서울특별시 강남구 역삼동 테헤란로 123\n"
+    "홍길동님, 서울특별시 강남구 역삼동 테헤란로 123 으로 서류를 보내 드렸습니다."
+)
+
+
+def test_labels_are_kept_and_only_values_are_redacted():
+    redaction = redact(NOTICE)
+
+    assert redaction.text.startswith("성명: [[PII_1]]\n법인등록번호: [[PII_2]]\n주소: [[PII_3]]\n")
+    assert redaction.mapping == {
+        "[[PII_1]]": "홍길동",
+        "[[PII_2]]": "110111-1234567",
+        "[[PII_3]]": "서울특별시 강남구 역삼동 테헤란로 123",
+    }
+    assert redaction.restore(redaction.text) == NOTICE
+
+
+def test_every_occurrence_of_a_found_value_is_redacted():
+    redaction = redact(NOTICE)
+
+    # 라벨 없이 다시 나온 이름/주소도 같은 자리표시자로 가려져야 함
+    assert "홍길동" not in redaction.text
+    assert "테헤란로" not in redaction.text
+    assert redaction.text.endswith("[[PII_1]]님, [[PII_3]] 으로 서류를 보내 드렸습니다.")
+
+
+def test_llm_prompt_contains_no_redacted_values():
+    llm = FakeChatModel(reply="[[PII_1]]님께 서류를 보냈어요.")
+    service = make_service(llm)
+
+    result = asyncio.run(service.atranslate(NOTICE))
+
+    prompt = str(llm.prompts[-1])
+    for value in ("홍길동", "110111-1234567", "테헤란로"):
+        assert value not in prompt
+    assert result == "홍길동님께 서류를 보냈어요."
+
+
+def test_common_words_after_a_name_label_are_not_masked_elsewhere():
+    # "이름 확인" 의 "확인" 은 이름 패턴에 걸리지만, 라벨 없이 나온 일반 단어까지 가리면 안 됨
+    redaction = redact("이름 확인 후 제출하세요. 본인 확인 절차가 필요합니다. 확인서를 내세요.")
+
+    assert redaction.text.endswith("본인 확인 절차가 필요합니다. 확인서를 내세요.")
+
+    redaction = redact("성명 기재란에 이름을 쓰고 기재란에 서명하세요")
+
+    assert redaction.text.endswith("이름을 쓰고 기재란에 서명하세요")
+
+
+def test_repeated_names_are_masked_only_with_an_honorific():
+    redaction = redact("성명: 김민\n김민님, 김민 씨께 안내드립니다. 김민수 과장과 김민지 님도 함께 오세요.")
+
+    assert redaction.text == "성명: [[PII_1]]\n[[PII_1]]님, [[PII_1]] 씨께 안내드립니다. 김민수 과장과 김민지 님도 함께 오세요."
+
+
+def test_repeated_phone_numbers_are_masked_without_a_label():
+    redaction = redact("연락처 010-1234-5678 로 전화 주세요. 문의: 010-1234-5678, 평일만 가능")
+
+    assert redaction.text == "연락처 [[PII_1]] 로 전화 주세요. 문의: [[PII_1]], 평일만 가능"
+    assert redaction.mapping == {"[[PII_1]]": "010-1234-5678"}
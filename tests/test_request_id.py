@@ -0,0 +1,169 @@
+import asyncio
+import time
+import uuid
+
+from fastapi import FastAPI, Request
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+from starlette.middleware.base import BaseHTTPMiddleware
+
+from app.middleware.request_id import RequestIDMiddleware, get_request_id
+from app.utils.logger import current_request_id
+from app.utils.metrics import HTTP_REQUEST_DURATION
+
+SSE_EVENTS = 50
+
+
+def _app(middleware=RequestIDMiddleware) -> FastAPI:
+    app = FastAPI()
+    app.add_middleware(middleware)
+
+    @app.get("/hello")
+    async def hello():
+        return PlainTextResponse("hello")
+
+    @app.get("/items/{item_id}")
+    async def item(item_id: str, request: Request):
+        return {"item": item_id, "state": get_request_id(request), "context": current_request_id.get()}
+
+    @app.get("/sse")
+    async def sse():
+        async def events():
+            for i in range(SSE_EVENTS):
+                yield f"event: translate\ndata: {current_request_id.get()}\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+class BaselineRequestIDMiddleware(BaseHTTPMiddleware):
+    """비교용: 순수 ASGI 로 바꾸기 전의 BaseHTTPMiddleware 구현"""
+
+    async def dispatch(self, request: Request, call_next):
+        request_id = str(uuid.uuid4())
+        request.state.request_id = request_id
+        start_time = time.time()
+        request.state.start_time = start_time
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        response.headers["X-Process-Time"] = str(time.time() - start_time)
+        return response
+
+
+def test_valid_incoming_request_id_is_kept_and_set_for_the_request():
+    client = TestClient(_app())
+
+    response = client.get("/items/42", headers={"X-Request-ID": "trace-abc.123:4"})
+
+    assert response.headers["X-Request-ID"] == "trace-abc.123:4"
+    assert response.json() == {"item": "42", "state": "trace-abc.123:4", "context": "trace-abc.123:4"}
+    assert float(response.headers["X-Process-Time"]) >= 0
+
+
+def test_invalid_or_missing_request_id_is_replaced():
+    client = TestClient(_app())
+
+    for headers in ({"X-Request-ID": "bad id<script>"}, {"X-Request-ID": "x" * 129}, {}):
+        response = client.get("/items/1", headers=headers)
+        request_id = response.headers["X-Request-ID"]
+        assert str(uuid.UUID(request_id)) == request_id
+        assert response.json()["context"] == request_id
+
+
+def test_streaming_response_carries_the_header_and_context():
+    client = TestClient(_app())
+
+    response = client.get("/sse", headers={"X-Request-ID": "stream-1"})
+
+    assert response.headers["X-Request-ID"] == "stream-1"
+    # 스트림 본문을 만드는 동안에도 로그용 request_id 가 유지됨
+    assert response.text.count("data: stream-1\n") == SSE_EVENTS
+
+
+async def _call(app, path: str, headers: list = ()) -> list:
+    """ASGI 앱을 직접 호출하고 보낸 메시지 목록을 반환"""
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "", "query_string": b"",
+        "headers": list(headers), "client": ("127.0.0.1", 1234), "server": ("testserver", 80),
+    }
+    messages = []
+    received = False
+
+    async def receive():
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # 응답이 끝날 때까지 연결 유지 (끊김 감시 task 는 응답 후 취소됨)
+        await asyncio.Event().wait()
+
+    async def send(message):
+        messages.append(message)
+
+    await app(scope, receive, send)
+    return messages
+
+
+def test_context_variable_is_reset_after_the_request():
+    seen = []
+
+    async def inner(scope, receive, send):
+        seen.append(current_request_id.get())
+        await send({"type": "http.response.start", "status": 204, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def run():
+        token = current_request_id.set("outer")
+        try:
+            messages = await _call(RequestIDMiddleware(inner), "/", [(b"x-request-id", b"inner-1")])
+            return messages, current_request_id.get()
+        finally:
+            current_request_id.reset(token)
+
+    messages, after = asyncio.run(run())
+
+    assert seen == ["inner-1"]
+    assert after == "outer"
+    assert (b"x-request-id", b"inner-1") in messages[0]["headers"]
+
+
+def test_duration_is_labelled_by_route_template():
+    client = TestClient(_app())
+    key = ("GET", "/items/{item_id}", "200")
+    before = HTTP_REQUEST_DURATION.samples().get(key, [0])[-1]
+
+    for item_id in ("a", "b", "c"):
+        client.get(f"/items/{item_id}")
+    client.get("/missing")
+
+    samples = HTTP_REQUEST_DURATION.samples()
+    assert samples[key][-1] - before == 3
+    assert not any(labels[1].startswith("/items/") and labels[1] != "/items/{item_id}" for labels in samples)
+    assert ("GET", "unmatched", "404") in samples
+
+
+def _throughput(app, path: str, requests: int) -> float:
+    async def run():
+        started = time.perf_counter()
+        for _ in range(requests):
+            await _call(app, path)
+        return requests / (time.perf_counter() - started)
+
+    return asyncio.run(run())
+
+
+def test_throughput_against_base_http_middleware_benchmark():
+    """hello-world / SSE 요청 처리량: 순수 ASGI 미들웨어 vs BaseHTTPMiddleware"""
+    results = {}
+    for name, middleware in (("BaseHTTPMiddleware", BaselineRequestIDMiddleware), ("pure ASGI", RequestIDMiddleware)):
+        app = _app(middleware)
+        # 첫 호출에서 미들웨어 스택을 만들어 둠
+        _throughput(app, "/hello", 10)
+        results[name] = (_throughput(app, "/hello", 2000), _throughput(app, "/sse", 300))
+
+    for name, (hello, sse) in results.items():
+        print(f"\n{name}: hello {hello:.0f} req/s, SSE ({SSE_EVENTS} events) {sse:.0f} req/s")
+    assert results["pure ASGI"][0] > results["BaseHTTPMiddleware"][0]
+    assert results["pure ASGI"][1] > results["BaseHTTPMiddleware"][1]
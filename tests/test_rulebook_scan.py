@@ -0,0 +1,125 @@
+import random
+import re
+import time
+
+import pytest
+
+from app.utils.rulebook import validate_rulebook
+
+SIZES = (1_000, 100_000, 5_000_000)
+
+SAMPLE = (
+    "성명: 홍길동 주민등록번호 900101-1234567 전화 010-1234-5678 "
+    "이메일 hong@example.com 주소 서울특별시 강남구 역삼동 테헤란로 123 "
+)
+
+
+def _korean_document(size: int, seed: int = 0) -> str:
+    """개인정보가 섞이지 않은 일반 안내문 형태의 한글 문서"""
+    rng = random.Random(seed)
+    words = ["안내", "신청서", "제출", "기한", "보험료", "납부", "주민센터", "방문", "서류", "확인", "하시기", "바랍니다"]
+    parts, length = [], 0
+    while length < size:
+        word = rng.choice(words)
+        parts.append(word)
+        length += len(word) + 1
+    return " ".join(parts)[:size]
+
+
+def _pathological(size: int) -> dict[str, str]:
+    """역추적이 커지기 쉬운 입력 (끝나지 않는 주소/이름 후보, 긴 숫자/이메일 로컬 파트)"""
+    return {
+        "한글 연속": "가" * size,
+        "주소 접미사 반복": ("시 구 동 " * (size // 6))[:size],
+        "이름 라벨 반복": ("성명 " * (size // 3))[:size],
+        "숫자 연속": "1" * size,
+        "이메일 로컬 파트": "a" * size,
+        "공백 연속": "이름" + " " * size,
+    }
+
+
+def _seconds_per_char(text: str) -> float:
+    best = float("inf")
+    for _ in range(3 if len(text) < 1_000_000 else 1):
+        started = time.perf_counter()
+        validate_rulebook(text)
+        best = min(best, time.perf_counter() - started)
+    return best / len(text)
+
+
+# 단일 스캔으로 바꾸기 전(c27ec42) app/utils/rulebook.py 의 패턴 그대로 (결과 비교용)
+LEGACY_PATTERNS = {
+    # 개인 정보
+    "이름": re.compile(r"""
+        (?:성명|이름)   # '성명' 또는 '이름'
+        \s*            # 콜론 앞뒤의 공백 허용
+        [ :：]         # ASCII 콜론 또는 fullwidth 콜론
+        \s*            # 콜론 뒤 공백 허용
+        ([가-힣]{2,4}) # 실제 이름(2~4글자)
+    """, re.VERBOSE),
+    "주민등록번호": re.compile(r"[0-9]{6}-[0-9]{7}"), #외국인 등록 번호도 이와 동일
+    "운전면허번호": re.compile(r"[0-9]{2}-[0-9]{2}-[0-9]{6}-[0-9]{2}"),
+    "건강보험증번호" : re.compile(r"[0-9]{11}"),
+
+    # 계좌 번호는 직접 안써서 보내지 않나 싶음.
+    # 사업자 등록 번호
+    "사업자등록번호" : re.compile(r"[0-9]{3}-[0-9]{2}-[0-9]{5}"),
+    "법인등록번호" : re.compile(r"법인등록번호\s*[:：]?\s*[0-9]{6}-[0-9]{7}"),
+
+    # 연락처
+    "전화번호":  re.compile(r"01[016789]-[0-9]{3,4}-[0-9]{4}"),
+    "이메일": re.compile(r"[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+"),
+    
+    # 집 주소는 정확할 것이라고 생각.
+    "주소": re.compile(r"""
+         (?:주소[:：]?\s*)?                                   
+        (?:(?P<province>[가-힣]+?(?:도|광역시|특별시|시))\s+)?  
+        (?P<city>[가-힣]+?(?:시|군|구))                       
+        \s+
+        (?P<district>[가-힣]+?(?:구|읍|면|동|리))               
+        \s+
+        (?P<street>[가-힣0-9]+?(?:로|길))                     
+        \s*
+        (?P<number>\d+) 
+    """, re.VERBOSE),
+    # "우편번호" : re.compile(r"(?<!\d)[0-9]{5}(?!\d)"),
+}
+
+
+def _legacy_validate(text: str) -> list[str]:
+    """패턴마다 search 하던 기존 방식과 기존 패턴 (결과 비교용)"""
+    return [key for key, regex in LEGACY_PATTERNS.items() if regex.search(text)]
+
+
+FRAGMENTS = [
+    "성명: 홍길동", "이름 ：김철수", "성명 박", "운전면허 11-22-333333-44", "건강보험 12345678901",
+    "사업자 123-45-67890", "법인등록번호 110111-1234567", "전화 011-123-4567", "메일 a.b_c@ex-ample.kr",
+    "주소: 경기도 수원시 팔달구 인계동 효원로 1", "부산광역시 해운대구 우동 센텀로 99", "강남구 역삼동 123",
+    "900101-1234567", "010-1234-567", "@", "안내문을 확인하세요.", "\n", "  ",
+]
+
+
+def test_single_pass_matches_per_pattern_search():
+    documents = [SAMPLE, _korean_document(5_000), _korean_document(2_000) + SAMPLE, "법인등록번호: 110111-1234567"]
+    documents += FRAGMENTS
+    rng = random.Random(0)
+    documents += [" ".join(rng.choices(FRAGMENTS, k=rng.randint(1, 6))) for _ in range(500)]
+    for text in documents:
+        assert validate_rulebook(text) == _legacy_validate(text), text
+
+
+def test_scan_stays_linear_on_korean_documents():
+    timings = {size: _seconds_per_char(_korean_document(size) + SAMPLE) for size in SIZES}
+    for size, per_char in timings.items():
+        print(f"\n{size:>9}자: {per_char * 1e9:.1f} ns/자")
+    # 입력이 5000 배 커져도 글자당 시간은 거의 같아야 함 (제곱이면 수천 배)
+    assert timings[5_000_000] < timings[100_000] * 4
+
+
+@pytest.mark.parametrize("name", list(_pathological(1)))
+def test_scan_stays_linear_on_pathological_inputs(name):
+    small = _pathological(10_000)[name]
+    large = _pathological(200_000)[name]
+    ratio = _seconds_per_char(large) / _seconds_per_char(small)
+    print(f"\n{name}: 20배 입력의 글자당 시간 비율 {ratio:.2f}")
+    assert ratio < 4
@@ -0,0 +1,107 @@
+import asyncio
+
+from app.utils.single_flight import SingleFlight
+from app.utils.sse import coalesce
+from tests.fakes import FakeChatModel, make_service
+
+TEXT = "주민센터 방문 시 신분증을 지참하시기 바랍니다."
+
+
+def test_50_identical_requests_make_one_upstream_call():
+    llm = FakeChatModel(latency=0.1)
+    service = make_service(llm)
+
+    async def run():
+        return await asyncio.gather(*(service.atranslate(TEXT) for _ in range(50)))
+
+    results = asyncio.run(run())
+
+    assert llm.calls == 1
+    assert len(set(results)) == 1
+
+
+def test_50_identical_streams_share_one_upstream_stream():
+    llm = FakeChatModel(latency=0.05, token_delay=0.001)
+    service = make_service(llm)
+
+    async def consume():
+        return "".join([chunk async for chunk in service.stream_translate(TEXT)])
+
+    async def run():
+        return await asyncio.gather(*(consume() for _ in range(50)))
+
+    results = asyncio.run(run())
+
+    assert llm.stream_calls == 1
+    # 모든 구독자가 처음부터 끝까지 같은 청크를 받음
+    assert results == [llm.reply] * 50
+
+
+def test_request_after_last_subscriber_leaves_starts_new_stream():
+    """마지막 구독자가 떠나 취소된 스트림에 새 요청이 붙어 멈추지 않아야 함"""
+    flight = SingleFlight()
+    started = 0
+
+    async def upstream():
+        nonlocal started
+        started += 1
+        for i in range(100):
+            await asyncio.sleep(0.005)
+            yield f"{i} "
+
+    async def run():
+        first = flight.stream("key", upstream)
+        assert await first.__anext__() == "0 "
+        await first.aclose()
+
+        # 취소 완료 콜백이 실행되기 전에 같은 키로 요청
+        second = coalesce(flight.stream("key", upstream), 10, 1024)
+        return "".join([chunk async for chunk in second])
+
+    text = asyncio.run(asyncio.wait_for(run(), 5))
+
+    assert started == 2
+    assert text == "".join(f"{i} " for i in range(100))
+
+
+def test_coalesce_ends_when_source_is_cancelled():
+    """source 가 CancelledError 로 끝나도 소비자가 queue.get() 에서 멈추지 않아야 함"""
+
+    async def source():
+        yield "a"
+        raise asyncio.CancelledError()
+
+    async def run():
+        chunks = []
+        try:
+            async for chunk in coalesce(source(), 10, 1024):
+                chunks.append(chunk)
+        except asyncio.CancelledError:
+            pass
+        return chunks
+
+    assert asyncio.run(asyncio.wait_for(run(), 5)) == ["a"]
+
+
+def test_coalesce_waits_for_source_cleanup_when_consumer_stops():
+    """소비자가 중간에 그만두면 pump task 를 취소하고 source 정리가 끝날 때까지 기다려야 함"""
+    closed = []
+
+    async def source():
+        try:
+            while True:
+                yield "a"
+                await asyncio.sleep(0.01)
+        finally:
+            await asyncio.sleep(0.01)
+            closed.append(True)
+
+    async def run():
+        frames = coalesce(source(), 10, 1024)
+        async for _ in frames:
+            break
+        await frames.aclose()
+        # aclose() 가 반환된 시점에 source 의 finally 가 이미 실행됨
+        return list(closed)
+
+    assert asyncio.run(asyncio.wait_for(run(), 5)) == [True]
@@ -0,0 +1,123 @@
+import asyncio
+import json
+import time
+
+from starlette.requests import Request
+
+from app.config import Global
+from app.routes import easy_translate
+from app.routes.easy_translate import TranslateRequest, easy_translate_streaming
+from app.utils.sse import StreamRegistry
+from tests.fakes import FakeChatModel, make_service
+
+TEXT = "주민센터 방문 시 신분증을 지참하시기 바랍니다."
+TOKENS = [f"토큰{i} " for i in range(100)]
+
+
+class TimedChatModel(FakeChatModel):
+    """토큰별 생성 시각을 기록하는 가짜 LLM"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.produced: dict[str, float] = {}
+
+    async def astream(self, messages, **kwargs):
+        async for chunk in super().astream(messages, **kwargs):
+            if chunk.content:
+                self.produced[chunk.content] = time.perf_counter()
+            yield chunk
+
+
+def _setup(monkeypatch, token_delay: float, interval_ms: int, max_bytes: int) -> TimedChatModel:
+    llm = TimedChatModel(latency=0.0, token_delay=token_delay, tokens=TOKENS)
+    registry = StreamRegistry(max_streams=10, max_events=1000, ttl_seconds=60, grace_seconds=5)
+    service = make_service(llm)
+    monkeypatch.setattr(easy_translate, "get_service", lambda: service)
+    monkeypatch.setattr(easy_translate, "streams", registry)
+    monkeypatch.setattr(Global.env, "SSE_COALESCE_MS", interval_ms)
+    monkeypatch.setattr(Global.env, "SSE_COALESCE_MAX_BYTES", max_bytes)
+    return llm
+
+
+def _stream() -> dict:
+    """스트리밍 번역 1회: 요청 시각, translate 프레임별 (도착 시각, 조각), 전송 바이트 수"""
+
+    async def run():
+        request = Request({"type": "http", "method": "POST", "path": "/easy-translate/streaming", "headers": []})
+        started = time.perf_counter()
+        response = await easy_translate_streaming(TranslateRequest(content=TEXT), request)
+        frames, wire_bytes = [], 0
+        async for frame in response.body_iterator:
+            wire_bytes += len(frame)
+            fields = dict(line.split(": ", 1) for line in frame.decode("utf-8").strip().split("\n"))
+            if fields["event"] == "translate":
+                frames.append((time.perf_counter(), json.loads(fields["data"])["translated_text_chunk"]))
+        return {"started": started, "frames": frames, "bytes": wire_bytes, "finished": time.perf_counter()}
+
+    return asyncio.run(run())
+
+
+def _tokens(chunk: str) -> list[str]:
+    return [token + " " for token in chunk.split(" ") if token]
+
+
+def test_first_token_is_flushed_immediately_and_later_tokens_within_the_window(monkeypatch):
+    interval = 0.1
+    llm = _setup(monkeypatch, token_delay=0.005, interval_ms=int(interval * 1000), max_bytes=1024)
+
+    result = _stream()
+    frames = result["frames"]
+
+    assert "".join(chunk for _, chunk in frames) == "".join(TOKENS)
+    # 첫 조각은 첫 토큰 하나만, 묶음 창을 기다리지 않고 전달
+    first_at, first = frames[0]
+    assert first == TOKENS[0]
+    assert first_at - llm.produced[TOKENS[0]] < interval / 2
+    # 이후 토큰은 생성된 뒤 묶음 창 안에 전달되고, 여러 토큰이 한 프레임으로 합쳐짐
+    for arrived, chunk in frames[1:]:
+        for token in _tokens(chunk):
+            assert arrived - llm.produced[token] < interval + 0.03
+    assert len(frames) < len(TOKENS) / 5
+
+
+def test_burst_is_split_at_max_bytes(monkeypatch):
+    max_bytes = 64
+    _setup(monkeypatch, token_delay=0.0, interval_ms=1000, max_bytes=max_bytes)
+
+    frames = [chunk for _, chunk in _stream()["frames"]]
+
+    largest_token = max(len(token.encode("utf-8")) for token in TOKENS)
+    assert frames[0] == TOKENS[0]
+    # 마지막 프레임을 빼면 크기 한도에 닿는 즉시 내보냄
+    for chunk in frames[1:-1]:
+        assert max_bytes <= len(chunk.encode("utf-8")) < max_bytes + largest_token
+    assert len(frames[-1].encode("utf-8")) < max_bytes + largest_token
+
+
+def test_coalescing_benchmark(monkeypatch):
+    """토큰마다 프레임을 보내는 경우와 비교한 첫 바이트 시간, 초당 프레임 수, 전송 바이트"""
+    results = {}
+    # 한도 1바이트 = 토큰마다 바로 내보냄
+    for name, max_bytes in (("per-token", 1), ("coalesced", Global.env.SSE_COALESCE_MAX_BYTES)):
+        _setup(monkeypatch, token_delay=0.002, interval_ms=50, max_bytes=max_bytes)
+        result = _stream()
+        duration = result["finished"] - result["started"]
+        results[name] = {
+            "ttfb": result["frames"][0][0] - result["started"],
+            "frames": len(result["frames"]),
+            "fps": len(result["frames"]) / duration,
+            "bytes": result["bytes"],
+        }
+        monkeypatch.undo()
+
+    for name, stats in results.items():
+        print(
+            f"\n{name}: TTFB {stats['ttfb'] * 1000:.1f}ms, {stats['frames']} frames "
+            f"({stats['fps']:.0f}/s), {stats['bytes']} bytes on wire"
+        )
+    per_token, coalesced = results["per-token"], results["coalesced"]
+    assert per_token["frames"] == len(TOKENS)
+    assert coalesced["frames"] * 5 < per_token["frames"]
+    assert coalesced["bytes"] < per_token["bytes"] / 2
+    # 묶어도 첫 바이트는 늦어지지 않음
+    assert coalesced["ttfb"] < per_token["ttfb"] + 0.02
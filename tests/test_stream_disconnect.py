@@ -0,0 +1,88 @@
+import asyncio
+
+from app.routes import easy_translate
+from app.utils.sse import StreamRegistry
+from tests.fakes import FakeChatModel, make_service
+
+TOKEN_DELAY = 0.02
+
+
+def _start(monkeypatch, grace_seconds: float, latency: float = 0.0):
+    llm = FakeChatModel(latency=latency, token_delay=TOKEN_DELAY, tokens=[f"{i} " for i in range(500)])
+    service = make_service(llm)
+    monkeypatch.setattr(easy_translate, "get_service", lambda: service)
+    registry = StreamRegistry(max_streams=10, max_events=100, ttl_seconds=60, grace_seconds=grace_seconds)
+    return llm, registry
+
+
+def test_generation_stops_within_one_chunk_of_disconnect(monkeypatch):
+    """클라이언트가 끊기면 LLM 스트림이 다음 토큰 전에 닫혀야 함 (grace 0)"""
+    llm, registry = _start(monkeypatch, grace_seconds=0)
+
+    async def run():
+        stream = registry.start(easy_translate.generate_events("안내문", None, None))
+        frames = stream.subscribe()
+        received = 0
+        async for _ in frames:
+            received += 1
+            if received == 3:
+                break
+        # 연결 끊김 (StreamingResponse 가 body generator 를 닫는 것과 같음)
+        await frames.aclose()
+        emitted_at_disconnect = llm.tokens_emitted
+        await asyncio.wait_for(llm.stream_closed.wait(), 1)
+        await asyncio.sleep(TOKEN_DELAY * 5)
+        return stream, emitted_at_disconnect
+
+    stream, emitted_at_disconnect = asyncio.run(run())
+
+    assert stream.cancelled
+    assert llm.tokens_emitted - emitted_at_disconnect <= 1
+    assert llm.tokens_emitted < len(llm.tokens)
+
+
+def test_disconnect_before_any_event_cancels_without_grace(monkeypatch):
+    """이벤트 id 를 하나도 받지 못한 연결은 이어받을 수 없으므로 grace 와 상관없이 바로 취소"""
+    llm, registry = _start(monkeypatch, grace_seconds=30, latency=0.2)
+
+    async def run():
+        stream = registry.start(easy_translate.generate_events("안내문", None, None))
+
+        async def consume():
+            async for _ in stream.subscribe():
+                pass
+
+        # 첫 이벤트를 기다리는 중에 연결이 끊겨 응답 task 가 취소됨
+        consumer = asyncio.create_task(consume())
+        await asyncio.sleep(0.05)
+        consumer.cancel()
+        await asyncio.gather(consumer, return_exceptions=True)
+        await asyncio.wait_for(llm.stream_closed.wait(), 1)
+        return stream
+
+    stream = asyncio.run(run())
+
+    assert stream.cancelled
+    assert llm.tokens_emitted == 0
+
+
+def test_disconnect_after_delivery_keeps_generating_during_grace(monkeypatch):
+    """이벤트 id 를 받은 연결이 끊기면 grace 동안은 생성을 계속해 재연결을 기다림"""
+    llm, registry = _start(monkeypatch, grace_seconds=30)
+
+    async def run():
+        stream = registry.start(easy_translate.generate_events("안내문", None, None))
+        frames = stream.subscribe()
+        async for _ in frames:
+            break
+        await frames.aclose()
+        emitted_at_disconnect = llm.tokens_emitted
+        await asyncio.sleep(TOKEN_DELAY * 10)
+        running = not stream.done
+        await registry.aclose()
+        return stream, running, emitted_at_disconnect
+
+    stream, running, emitted_at_disconnect = asyncio.run(run())
+
+    assert running
+    assert llm.tokens_emitted > emitted_at_disconnect + 3
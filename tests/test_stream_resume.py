@@ -0,0 +1,177 @@
+import asyncio
+import json
+import time
+
+from starlette.requests import Request
+
+from app.routes import easy_translate
+from app.routes.easy_translate import TranslateRequest, easy_translate_streaming
+from app.utils.sse import ResumableStream, StreamGap, StreamRegistry
+from tests.fakes import FakeChatModel, make_service
+
+TEXT = "주민센터 방문 시 신분증을 지참하시기 바랍니다."
+TOKENS = [f"{i} " for i in range(60)]
+
+
+def _setup(monkeypatch, max_events: int = 100):
+    llm = FakeChatModel(latency=0.0, token_delay=0.01, tokens=TOKENS)
+    service = make_service(llm)
+    registry = StreamRegistry(max_streams=10, max_events=max_events, ttl_seconds=60, grace_seconds=5)
+    monkeypatch.setattr(easy_translate, "get_service", lambda: service)
+    monkeypatch.setattr(easy_translate, "streams", registry)
+    return llm, registry
+
+
+async def _connect(last_event_id: str = None):
+    headers = [(b"last-event-id", last_event_id.encode("ascii"))] if last_event_id else []
+    request = Request({"type": "http", "method": "POST", "path": "/easy-translate/streaming", "headers": headers})
+    response = await easy_translate_streaming(TranslateRequest(content=TEXT), request)
+    return response.headers["x-stream-id"], response.body_iterator
+
+
+def _parse(frame: bytes) -> tuple[str, int, str, dict]:
+    """(stream_id, seq, event, payload)"""
+    fields = dict(line.split(": ", 1) for line in frame.decode("utf-8").strip().split("\n"))
+    stream_id, _, seq = fields["id"].partition(":")
+    return stream_id, int(seq), fields["event"], json.loads(fields["data"])
+
+
+async def _read(body, count: int = None) -> list[tuple[str, int, str, dict]]:
+    frames = []
+    async for frame in body:
+        frames.append(_parse(frame))
+        if count is not None and len(frames) == count:
+            break
+    # 연결 끊김 (StreamingResponse 가 body iterator 를 닫는 것과 같음)
+    await body.aclose()
+    return frames
+
+
+def _text(frames) -> str:
+    return "".join(payload["translated_text_chunk"] for _, _, event, payload in frames if event == "translate")
+
+
+def test_reconnect_mid_generation_follows_it_live_without_new_llm_call(monkeypatch):
+    llm, registry = _setup(monkeypatch)
+
+    async def run():
+        stream_id, body = await _connect()
+        first = await _read(body, count=3)
+        await asyncio.sleep(0.05)
+
+        seq = first[-1][1]
+        resumed_id, body = await _connect(f"{stream_id}:{seq}")
+        stream = registry._streams[stream_id]
+        running_at_reconnect = not stream.done
+        second = await _read(body)
+        await registry.aclose()
+        return stream_id, resumed_id, first, second, running_at_reconnect
+
+    stream_id, resumed_id, first, second, running_at_reconnect = asyncio.run(run())
+
+    assert resumed_id == stream_id
+    assert running_at_reconnect
+    assert llm.stream_calls == 1
+    # 빠짐도 중복도 없이 이어짐
+    seqs = [seq for _, seq, _, _ in first + second]
+    assert seqs == list(range(1, len(seqs) + 1))
+    assert second[-1][2] == "done"
+    assert _text(first + second) == "".join(TOKENS)
+    assert second[-1][3]["translated_text"] == "".join(TOKENS)
+
+
+def test_reconnect_after_completion_replays_from_next_seq(monkeypatch):
+    llm, registry = _setup(monkeypatch)
+
+    async def run():
+        stream_id, body = await _connect()
+        full = await _read(body)
+        _, replayed = await _connect(f"{stream_id}:2")
+        return stream_id, full, await _read(replayed)
+
+    stream_id, full, replayed = asyncio.run(run())
+
+    assert llm.stream_calls == 1
+    assert full[-1][2] == "done"
+    assert replayed == full[2:]
+    assert all(frame[0] == stream_id for frame in replayed)
+
+
+def test_unknown_or_evicted_event_id_starts_fresh_stream(monkeypatch):
+    # 이벤트 4개만 보관 → 완료 후 앞쪽 번호는 버퍼에서 밀려남
+    llm, registry = _setup(monkeypatch, max_events=4)
+
+    async def run():
+        stream_id, body = await _connect()
+        full = await _read(body)
+        assert len(full) > 5
+
+        results = []
+        for last_event_id in (f"{stream_id}:1", "unknown-stream:3", "not-an-event-id"):
+            new_id, body = await _connect(last_event_id)
+            results.append((new_id, await _read(body)))
+        return stream_id, results
+
+    stream_id, results = asyncio.run(run())
+
+    for new_id, frames in results:
+        assert new_id != stream_id
+        assert frames[0][1] == 1
+        assert frames[-1][2] == "done"
+        assert frames[-1][3]["translated_text"] == "".join(TOKENS)
+    # 새 스트림은 캐시된 번역을 재생 (LLM 재호출 없음)
+    assert llm.stream_calls == 1
+    assert registry.resumed == 0
+
+
+def test_slow_subscriber_gets_stream_gap_when_buffer_moves_past_it():
+    async def run():
+        stream = ResumableStream("s", max_events=3)
+
+        async def source():
+            for i in range(10):
+                yield "translate", {"translated_text_chunk": str(i)}
+
+        await stream.run(source())
+        frames = stream.subscribe(after=2)
+        try:
+            await frames.__anext__()
+        finally:
+            await frames.aclose()
+
+    try:
+        asyncio.run(run())
+    except StreamGap as e:
+        assert str(e) == "s:3"
+    else:
+        raise AssertionError("StreamGap 이 발생해야 합니다")
+
+
+def _follow_live(count: int) -> float:
+    """이벤트가 하나씩 추가될 때마다 깨어나는 구독자가 count 개를 받는 데 걸린 시간"""
+
+    async def run():
+        stream = ResumableStream("s", max_events=count)
+
+        async def source():
+            for _ in range(count):
+                yield "translate", {"translated_text_chunk": "가"}
+                await asyncio.sleep(0)
+
+        task = asyncio.create_task(stream.run(source()))
+        start = time.perf_counter()
+        received = sum([1 async for _ in stream.subscribe()])
+        elapsed = time.perf_counter() - start
+        await task
+        assert received == count
+        return elapsed
+
+    return asyncio.run(run())
+
+
+def test_live_subscriber_cost_is_linear_in_events():
+    """깨어날 때마다 버퍼 전체를 다시 훑으면 이벤트 수의 제곱에 비례해 느려짐"""
+    small, large = _follow_live(5000), _follow_live(20000)
+    print(f"\n5k events: {small * 1000:.1f}ms, 20k events: {large * 1000:.1f}ms")
+    # 선형이면 약 4배, 제곱이면 약 16배
+    assert large < small * 8